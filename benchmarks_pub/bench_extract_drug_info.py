@@ -0,0 +1,119 @@
+"""
+Micro-benchmark of the per-drug extraction of DrugBank records.
+
+Compares the compiled, declarative `DrugFieldExtractor` used by `DrugBank2Neo4j.extract_drug_info`
+with the previous hand-written implementation (kept below as `legacy_extract_drug_info`) on the
+top-level drug elements of a DrugBank XML file, and checks that both produce identical records.
+
+Example
+-------
+    $ python benchmarks_pub/bench_extract_drug_info.py drugbank_full_dataset.xml --drugs 2000
+"""
+
+import os
+import sys
+import argparse
+import timeit
+from lxml import etree
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.db_entry.drugbank_fields import DRUG_FIELD_SPEC, DrugFieldExtractor
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+def legacy_extract_drug_info(drug_elem, namespace=NAMESPACE):
+    """
+    The original implementation of `DrugBank2Neo4j.extract_drug_info`, kept as the baseline.
+    """
+    def get_text(element, default=''):
+        return element.text if element is not None else default
+
+    go_classifiers_info = []
+    for go in drug_elem.findall('.//{http://www.drugbank.ca}go-classifier'):
+        go_classifiers_info.append({
+            'Category': get_text(go.find('db:category', namespaces=namespace)),
+            'Description': get_text(go.find('db:description', namespaces=namespace))
+        })
+
+    classification_elem = drug_elem.find('db:classification', namespaces=namespace)
+    classification_info = {
+        'Direct Parent': get_text(classification_elem.find('db:direct-parent', namespaces=namespace)),
+        'Kingdom': get_text(classification_elem.find('db:kingdom', namespaces=namespace)),
+        'Superclass': get_text(classification_elem.find('db:superclass', namespaces=namespace)),
+        'Class': get_text(classification_elem.find('db:class', namespaces=namespace)),
+    } if classification_elem is not None else {}
+
+    return {
+        'DrugBank ID': get_text(drug_elem.find('db:drugbank-id', namespaces=namespace)),
+        'Name': get_text(drug_elem.find('db:name', namespaces=namespace)),
+        'Description': get_text(drug_elem.find('db:description', namespaces=namespace)),
+        'GO Classifiers': go_classifiers_info,
+        'Simple Description': get_text(drug_elem.find('db:simple-description', namespaces=namespace)),
+        'Clinical Description': get_text(drug_elem.find('db:clinical-description', namespaces=namespace)),
+        'Therapeutically Significant': get_text(drug_elem.find('db:therapeutically-significant', namespaces=namespace)),
+        'Affected Organisms': [org.text for org in drug_elem.findall('db:affected-organisms/db:affected-organism', namespaces=namespace)],
+        'Indication': get_text(drug_elem.find('db:indication', namespaces=namespace)),
+        'Pharmacodynamics': get_text(drug_elem.find('db:pharmacodynamics', namespaces=namespace)),
+        'Mechanism of Action': get_text(drug_elem.find('db:mechanism-of-action', namespaces=namespace)),
+        'Direct Parent': classification_info.get('Direct Parent', ''),
+        'Kingdom': classification_info.get('Kingdom', ''),
+        'Superclass': classification_info.get('Superclass', ''),
+        'Class': classification_info.get('Class', ''),
+    }
+
+
+def load_drug_elements(xml_path, max_drugs):
+    """
+    Loads up to `max_drugs` top-level drug elements (with a drugbank-id) into memory.
+    """
+    drug_tag = '{http://www.drugbank.ca}drug'
+    drugs = []
+    for _, elem in etree.iterparse(xml_path, events=('end',), tag=drug_tag):
+        if elem.getparent() is not None and elem.getparent().getparent() is None:
+            drugs.append(elem)
+            if len(drugs) >= max_drugs:
+                break
+    return drugs
+
+
+def time_per_drug(extract, drugs, repeat):
+    """
+    Returns the best per-drug extraction time in microseconds over `repeat` runs.
+    """
+    def run():
+        for drug in drugs:
+            extract(drug)
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(drugs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('xml_path', help='Path to a DrugBank XML file')
+    parser.add_argument('--drugs', type=int, default=1000, help='Number of drug elements to benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timing runs, the best is reported')
+    args = parser.parse_args()
+
+    drugs = load_drug_elements(args.xml_path, args.drugs)
+    if not drugs:
+        sys.exit(f"No drug elements found in {args.xml_path}")
+    extractor = DrugFieldExtractor(DRUG_FIELD_SPEC, NAMESPACE)
+
+    mismatches = sum(legacy_extract_drug_info(drug) != extractor(drug) for drug in drugs)
+    legacy_us = time_per_drug(legacy_extract_drug_info, drugs, args.repeat)
+    compiled_us = time_per_drug(extractor, drugs, args.repeat)
+
+    print(f"Drugs benchmarked:        {len(drugs)}")
+    print(f"Legacy extract_drug_info: {legacy_us:8.2f} us/drug")
+    print(f"Compiled field extractor: {compiled_us:8.2f} us/drug")
+    print(f"Speed-up:                 {legacy_us / compiled_us:8.2f}x")
+    print(f"Records differing:        {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""
+Throughput benchmark suite for the DrugBank and ARUK-UCL ingest hot paths.
+
+Generates synthetic fixtures (see `synthetic_fixtures.py`) and times each stage in a fresh
+process, reporting records/sec and the peak resident set size of that stage:
+
+    parse_drugbank_xml           sequential iterparse + extraction of the whole XML
+    parse_drugbank_xml_parallel  byte-range sharded parse in worker processes
+    extract_drug_info            extraction only, on drug elements already in memory
+    arukucl_ingest               Neo4jConnectionExtended.add_biological_process
+    arukucl_ingest_aggregated    Neo4jConnectionExtended.add_biological_process_aggregated
+    arukucl_ingest_nodes         Neo4jConnectionExtended.add_biological_process_annotations
+    drug_write_per_drug          one transaction per drug (DrugBank2Neo4j.add_drug_to_neo4j)
+    drug_write_batched           UNWIND batches (DrugBank2Neo4j.write_drugs_in_batches)
+
+Without `--neo4j` the write stages run against a local stand-in session that executes no
+Cypher, which measures the client-side cost of the write paths. With `--neo4j` they write
+to the database configured in .env - only use this against a disposable database.
+
+`--baseline` compares the results with a previous `--output` file and exits with status 1
+if any stage lost more than `--tolerance` of its throughput.
+
+Example
+-------
+    $ python benchmarks_pub/bench_ingest.py --drugs 2000 --output bench.json
+    $ python benchmarks_pub/bench_ingest.py --drugs 2000 --baseline bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml, write_arukucl_tsv
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+class StandInRecord(dict):
+    """
+    A result record that returns None for every key it does not hold.
+    """
+    def __missing__(self, key):
+        return None
+
+
+class StandInCounters:
+    def __init__(self, nodes_created=0, properties_set=0):
+        self.nodes_created = nodes_created
+        self.relationships_created = 0
+        self.properties_set = properties_set
+        self.contains_updates = bool(nodes_created or properties_set)
+
+
+class StandInSummary:
+    def __init__(self, counters):
+        self.counters = counters
+        self.result_available_after = 0
+        self.result_consumed_after = 0
+
+
+class StandInResult:
+    def __init__(self, parameters):
+        rows = next((value for value in parameters.values() if isinstance(value, list)), None)
+        created = len(rows) if rows is not None else 1
+        self._summary = StandInSummary(StandInCounters(nodes_created=created, properties_set=created))
+
+    def consume(self):
+        return self._summary
+
+    def single(self):
+        return StandInRecord()
+
+    def __iter__(self):
+        return iter(())
+
+
+class StandInTransaction:
+    """
+    Accepts Cypher statements like a Neo4j transaction without executing them.
+    """
+    def __init__(self):
+        self.statements = 0
+
+    def run(self, query, parameters=None, **kwargs):
+        self.statements += 1
+        return StandInResult({**(parameters or {}), **kwargs})
+
+
+class StandInSession:
+    """
+    A stand-in for `neo4j.Session` supporting the calls made by the ingest scripts.
+    """
+    def __init__(self):
+        self.transactions = 0
+
+    def execute_write(self, transaction_function, *args, **kwargs):
+        self.transactions += 1
+        return transaction_function(StandInTransaction(), *args, **kwargs)
+
+    execute_read = execute_write
+
+    def run(self, query, parameters=None, **kwargs):
+        return StandInTransaction().run(query, parameters, **kwargs)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class StandInDriver:
+    def session(self, **kwargs):
+        return StandInSession()
+
+    def close(self):
+        pass
+
+
+def _open_session(use_neo4j):
+    """
+    Return (session, closer) for the configured Neo4j database or the local stand-in.
+    """
+    if not use_neo4j:
+        return StandInSession(), lambda: None
+    from src_pub.utils.conn_neo4j import Neo4jConnection
+    conn = Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password"))
+    session = conn.driver.session()
+
+    def close():
+        session.close()
+        conn.close()
+    return session, close
+
+
+def _make_parser(xml_path):
+    from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+    return DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False)
+
+
+def stage_parse_drugbank_xml(xml_path, tsv_path, options):
+    return len(_make_parser(xml_path).parse_drugbank_xml())
+
+
+def stage_parse_drugbank_xml_parallel(xml_path, tsv_path, options):
+    return len(_make_parser(xml_path).parse_drugbank_xml_parallel(max_workers=options['workers']))
+
+
+def stage_extract_drug_info(xml_path, tsv_path, options):
+    from lxml import etree
+    parser = _make_parser(xml_path)
+    drugs = [elem for elem in etree.parse(xml_path).getroot() if elem.tag == '{http://www.drugbank.ca}drug']
+    start = time.perf_counter()
+    for drug in drugs:
+        parser.extract_drug_info(drug)
+    # Only the extraction is timed, loading the document is excluded
+    return len(drugs), time.perf_counter() - start
+
+
+def stage_arukucl_ingest(xml_path, tsv_path, options, mode='rows'):
+    import pandas as pd
+    from src_pub.db_entry.add_arukuclprocess2neo4j import Neo4jConnectionExtended
+    data = pd.read_csv(tsv_path, sep='\t')
+    data = data[data['GO ASPECT'] == 'P']
+    if options['neo4j']:
+        conn = Neo4jConnectionExtended(os.getenv("uri"), os.getenv("username"), os.getenv("password"))
+    else:
+        conn = Neo4jConnectionExtended.__new__(Neo4jConnectionExtended)
+        conn.driver = StandInDriver()
+    start = time.perf_counter()
+    try:
+        if mode == 'nodes':
+            conn.add_biological_process_annotations(data, batch_size=options['batch_size'])
+        elif mode == 'aggregated':
+            conn.add_biological_process_aggregated(data, batch_size=options['batch_size'])
+        else:
+            conn.add_biological_process(data)
+    finally:
+        conn.close()
+    return len(data), time.perf_counter() - start
+
+
+def stage_arukucl_ingest_aggregated(xml_path, tsv_path, options):
+    return stage_arukucl_ingest(xml_path, tsv_path, options, mode='aggregated')
+
+
+def stage_arukucl_ingest_nodes(xml_path, tsv_path, options):
+    return stage_arukucl_ingest(xml_path, tsv_path, options, mode='nodes')
+
+
+def stage_drug_write_per_drug(xml_path, tsv_path, options):
+    parser = _make_parser(xml_path)
+    drugs = parser.parse_drugbank_xml()
+    session, close = _open_session(options['neo4j'])
+    start = time.perf_counter()
+    try:
+        for drug in drugs:
+            session.execute_write(parser.add_drug_to_neo4j, drug)
+    finally:
+        close()
+    return len(drugs), time.perf_counter() - start
+
+
+def stage_drug_write_batched(xml_path, tsv_path, options):
+    parser = _make_parser(xml_path)
+    drugs = parser.parse_drugbank_xml()
+    session, close = _open_session(options['neo4j'])
+    start = time.perf_counter()
+    try:
+        parser.write_drugs_in_batches(session, drugs, batch_size=options['batch_size'])
+    finally:
+        close()
+    return len(drugs), time.perf_counter() - start
+
+
+STAGES = {
+    'parse_drugbank_xml': stage_parse_drugbank_xml,
+    'parse_drugbank_xml_parallel': stage_parse_drugbank_xml_parallel,
+    'extract_drug_info': stage_extract_drug_info,
+    'arukucl_ingest': stage_arukucl_ingest,
+    'arukucl_ingest_aggregated': stage_arukucl_ingest_aggregated,
+    'arukucl_ingest_nodes': stage_arukucl_ingest_nodes,
+    'drug_write_per_drug': stage_drug_write_per_drug,
+    'drug_write_batched': stage_drug_write_batched,
+}
+
+
+def _run_stage(name, xml_path, tsv_path, options):
+    """
+    Run one stage and return (records, seconds, peak RSS in MiB). Runs in a fresh process.
+    """
+    import logging
+    logging.disable(logging.CRITICAL)  # Per-record logging would dominate the timings
+
+    start = time.perf_counter()
+    outcome = STAGES[name](xml_path, tsv_path, options)
+    elapsed = time.perf_counter() - start
+    records, seconds = outcome if isinstance(outcome, tuple) else (outcome, elapsed)
+    peak_rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+    return records, seconds, peak_rss_mib
+
+
+def run_benchmarks(xml_path, tsv_path, stages, options):
+    """
+    Run the given stages, each in its own spawned process so that peak RSS is per stage.
+
+    Returns
+    -------
+    dict
+        Maps each stage name to its 'records', 'seconds', 'records_per_sec' and 'peak_rss_mib'.
+    """
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for name in stages:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            records, seconds, peak_rss_mib = executor.submit(_run_stage, name, xml_path, tsv_path, options).result()
+        results[name] = {
+            'records': records,
+            'seconds': round(seconds, 4),
+            'records_per_sec': round(records / seconds, 1) if seconds > 0 else float('inf'),
+            'peak_rss_mib': round(peak_rss_mib, 1),
+        }
+        print(f"{name:<30} {records:>8} records {seconds:>9.3f} s {results[name]['records_per_sec']:>12.1f} rec/s "
+              f"{peak_rss_mib:>9.1f} MiB peak RSS")
+    return results
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Return the stages whose throughput dropped by more than `tolerance` (a fraction) versus the baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous and result['records_per_sec'] < previous['records_per_sec'] * (1 - tolerance):
+            regressions.append((name, previous['records_per_sec'], result['records_per_sec']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--drugs', type=int, default=2000, help='Number of synthetic drugs')
+    parser.add_argument('--annotations', type=int, default=10000, help='Number of synthetic ARUK-UCL annotations')
+    parser.add_argument('--go-per-polypeptide', type=int, default=5, help='GO classifier density')
+    parser.add_argument('--text-length', type=int, default=400, help='Length of the long text fields')
+    parser.add_argument('--xml', help='Benchmark this DrugBank XML instead of a synthetic one')
+    parser.add_argument('--tsv', help='Benchmark this ARUK-UCL TSV instead of a synthetic one')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Workers of the parallel parse')
+    parser.add_argument('--batch-size', type=int, default=500, help='Batch size of the batched drug and GO term writes')
+    parser.add_argument('--neo4j', action='store_true', help='Write to the Neo4j database configured in .env')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare with the JSON results of an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed throughput loss versus the baseline')
+    args = parser.parse_args()
+
+    if args.neo4j:
+        from dotenv import load_dotenv
+        load_dotenv()
+
+    options = {'workers': args.workers, 'batch_size': args.batch_size, 'neo4j': args.neo4j}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        xml_path = args.xml or write_drugbank_xml(
+            os.path.join(tmp_dir, 'drugbank_synthetic.xml'), drug_count=args.drugs,
+            go_per_polypeptide=args.go_per_polypeptide, text_length=args.text_length,
+        )
+        tsv_path = args.tsv or write_arukucl_tsv(os.path.join(tmp_dir, 'ARUK-UCL-GO-terms.tsv'), annotation_count=args.annotations)
+        results = run_benchmarks(xml_path, tsv_path, args.stages, options)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.1f} -> {after:.1f} records/sec")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""
+Synthetic DrugBank XML and ARUK-UCL TSV fixtures for benchmarks and tests.
+
+The licensed DrugBank release cannot be shared, so this module writes files that follow its
+schema closely enough to exercise every ingest hot path: top-level drugs with classification,
+affected organisms and free-text fields, pathway drugs nested inside drugs, and
+targets/enzymes/carriers/transporters whose polypeptides carry GO classifiers. The synthetic
+ARUK-UCL annotations use the same GO term pool, so drugs link to biological processes.
+
+All output is deterministic for a given seed.
+
+Example
+-------
+    $ python benchmarks_pub/synthetic_fixtures.py --drugs 15000 --output-dir datasets/synthetic
+"""
+
+import os
+import random
+import argparse
+from xml.sax.saxutils import escape, quoteattr
+
+DRUGBANK_NAMESPACE = 'http://www.drugbank.ca'
+
+ARUKUCL_COLUMNS = [
+    'GENE PRODUCT DB', 'GENE PRODUCT ID', 'SYMBOL', 'QUALIFIER', 'GO TERM', 'GO NAME', 'ECO ID',
+    'GO EVIDENCE CODE', 'REFERENCE', 'WITH/FROM', 'TAXON ID', 'ASSIGNED BY', 'ANNOTATION EXTENSION', 'GO ASPECT',
+]
+
+GO_CATEGORIES = {'process': 'P', 'function': 'F', 'component': 'C'}
+EVIDENCE_CODES = [('IDA', 'ECO:0000314'), ('IMP', 'ECO:0000315'), ('IBA', 'ECO:0000318'), ('TAS', 'ECO:0000304')]
+PROTEIN_KINDS = [('targets', 'target'), ('enzymes', 'enzyme'), ('carriers', 'carrier'), ('transporters', 'transporter')]
+WORDS = (
+    'amyloid tau microglia synaptic neuronal receptor kinase inhibitor agonist antagonist plasma '
+    'cholinergic oxidative mitochondrial inflammatory pathway signalling clearance cortical dose '
+    'hepatic renal metabolism enzyme binding affinity cellular membrane transport regulation'
+).split()
+
+
+def go_term_pool(size):
+    """
+    Return a list of (GO ID, GO name, category) tuples shared by the XML and the TSV fixtures.
+    """
+    categories = list(GO_CATEGORIES)
+    return [
+        (f"GO:{1000000 + index:07d}", f"synthetic {categories[index % 3]} {index}", categories[index % 3])
+        for index in range(size)
+    ]
+
+
+def _text(rng, length):
+    """
+    Return pseudo-random prose of roughly `length` characters.
+    """
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words).capitalize() + '.'
+
+
+def _polypeptide(rng, protein_index, go_terms, go_per_polypeptide, text_length):
+    """
+    Return the XML of one polypeptide with its GO classifiers.
+    """
+    classifiers = ''.join(
+        f"<go-classifier><category>{category}</category><description>{escape(name)}</description></go-classifier>"
+        for _, name, category in rng.sample(go_terms, min(go_per_polypeptide, len(go_terms)))
+    )
+    uniprot_id = f"Q{protein_index:05d}"
+    return (
+        f'<polypeptide id="{uniprot_id}" source="Swiss-Prot">'
+        f"<name>Synthetic protein {protein_index}</name>"
+        f"<general-function>{escape(_text(rng, text_length // 4))}</general-function>"
+        f"<specific-function>{escape(_text(rng, text_length // 2))}</specific-function>"
+        f"<gene-name>SYN{protein_index}</gene-name>"
+        f"<cellular-location>Cell membrane</cellular-location>"
+        f'<organism ncbi-taxonomy-id="9606">Humans</organism>'
+        f"<go-classifiers>{classifiers}</go-classifiers>"
+        f"</polypeptide>"
+    )
+
+
+def _drug(rng, index, drug_count, go_terms, go_per_polypeptide, proteins_per_drug, text_length, protein_count):
+    """
+    Return the XML of one top-level drug element.
+    """
+    drugbank_id = f"DB{index + 1:05d}"
+    proteins = []
+    for kind_index in range(proteins_per_drug):
+        group, element = PROTEIN_KINDS[kind_index % len(PROTEIN_KINDS)]
+        protein_index = rng.randrange(protein_count)
+        proteins.append((group, element, protein_index))
+
+    protein_xml = ''
+    for group, element in PROTEIN_KINDS:
+        members = [p for p in proteins if p[0] == group]
+        items = ''.join(
+            f'<{element} position="{position + 1}"><id>BE{protein_index:07d}</id>'
+            f"<name>Synthetic protein {protein_index}</name><organism>Humans</organism>"
+            f"<actions><action>{rng.choice(['inhibitor', 'agonist', 'substrate'])}</action></actions>"
+            f"<known-action>yes</known-action>"
+            f"{_polypeptide(rng, protein_index, go_terms, go_per_polypeptide, text_length)}</{element}>"
+            for position, (_, _, protein_index) in enumerate(members)
+        )
+        protein_xml += f"<{group}>{items}</{group}>" if items else f"<{group}/>"
+
+    pathway_drugs = ''.join(
+        f"<drug><drugbank-id>DB{other + 1:05d}</drugbank-id><name>Synthetic drug {other + 1}</name></drug>"
+        for other in rng.sample(range(drug_count), min(2, drug_count))
+    )
+    organisms = '<affected-organism>Humans and other mammals</affected-organism>' if rng.random() < 0.8 else ''
+
+    return (
+        f'<drug type="{rng.choice(["small molecule", "biotech"])}" created="2005-06-13" updated="2024-01-03">'
+        f'<drugbank-id primary="true">{drugbank_id}</drugbank-id>'
+        f"<drugbank-id>APRD{index:05d}</drugbank-id>"
+        f"<name>Synthetic drug {index + 1}</name>"
+        f"<description>{escape(_text(rng, text_length))}</description>"
+        f"<simple-description>{escape(_text(rng, text_length // 4))}</simple-description>"
+        f"<clinical-description>{escape(_text(rng, text_length // 2))}</clinical-description>"
+        f"<therapeutically-significant>{rng.choice(['true', 'false'])}</therapeutically-significant>"
+        f"<cas-number>{index:06d}-00-0</cas-number>"
+        f"<groups><group>approved</group></groups>"
+        f"<indication>{escape(_text(rng, text_length))}</indication>"
+        f"<pharmacodynamics>{escape(_text(rng, text_length))}</pharmacodynamics>"
+        f"<mechanism-of-action>{escape(_text(rng, text_length))}</mechanism-of-action>"
+        f"<toxicity>{escape(_text(rng, text_length // 2))}</toxicity>"
+        f"<classification><description/><direct-parent>Synthetic parent {index % 50}</direct-parent>"
+        f"<kingdom>Organic compounds</kingdom><superclass>Synthetic superclass {index % 10}</superclass>"
+        f"<class>Synthetic class {index % 20}</class><subclass/></classification>"
+        f"<synonyms><synonym language=\"english\" coder=\"\">Synonym {index}</synonym></synonyms>"
+        f"<categories><category><category>Synthetic category {index % 30}</category><mesh-id>D{index:06d}</mesh-id></category></categories>"
+        f"<affected-organisms>{organisms}</affected-organisms>"
+        f"<pathways><pathway><smpdb-id>SMP{index:07d}</smpdb-id><name>Synthetic pathway {index}</name>"
+        f"<category>drug_action</category><drugs>{pathway_drugs}</drugs><enzymes/></pathway></pathways>"
+        f"<drug-interactions><drug-interaction><drugbank-id>DB{(index + 1) % drug_count + 1:05d}</drugbank-id>"
+        f"<name>Synthetic drug {(index + 1) % drug_count + 1}</name><description>May interact.</description></drug-interaction></drug-interactions>"
+        f"{protein_xml}"
+        f"</drug>\n"
+    )
+
+
+def write_drugbank_xml(path, drug_count=1000, go_term_count=500, go_per_polypeptide=5, proteins_per_drug=4,
+                       text_length=400, seed=0):
+    """
+    Write a synthetic DrugBank XML file.
+
+    Parameters
+    ----------
+    path : str
+        The output path.
+    drug_count : int
+        Number of top-level drugs.
+    go_term_count : int
+        Size of the GO term pool the classifiers are drawn from.
+    go_per_polypeptide : int
+        GO classifiers per polypeptide, i.e. the GO classifier density.
+    proteins_per_drug : int
+        Polypeptides per drug, spread over targets, enzymes, carriers and transporters.
+    text_length : int
+        Approximate length in characters of the long free-text fields.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    str
+        The output path.
+    """
+    rng = random.Random(seed)
+    go_terms = go_term_pool(go_term_count)
+    protein_count = max(drug_count // 2, 1)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(
+            f'<drugbank xmlns={quoteattr(DRUGBANK_NAMESPACE)} '
+            f'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            f'xsi:schemaLocation="http://www.drugbank.ca http://www.drugbank.ca/docs/drugbank.xsd" '
+            f'version="5.1" exported-on="2024-01-03">\n'
+        )
+        for index in range(drug_count):
+            f.write(_drug(rng, index, drug_count, go_terms, go_per_polypeptide, proteins_per_drug, text_length, protein_count))
+        f.write('</drugbank>\n')
+    return path
+
+
+def write_arukucl_tsv(path, annotation_count=5000, go_term_count=500, process_only=False, seed=0):
+    """
+    Write a synthetic ARUK-UCL GO annotation TSV file.
+
+    Parameters
+    ----------
+    path : str
+        The output path.
+    annotation_count : int
+        Number of annotation rows.
+    go_term_count : int
+        Size of the GO term pool, use the same value as for `write_drugbank_xml`.
+    process_only : bool
+        Only write biological process annotations ('GO ASPECT' == 'P'), like the filtered TSV.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    str
+        The output path.
+    """
+    rng = random.Random(seed)
+    go_terms = go_term_pool(go_term_count)
+    if process_only:
+        go_terms = [term for term in go_terms if term[2] == 'process']
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\t'.join(ARUKUCL_COLUMNS) + '\n')
+        for index in range(annotation_count):
+            go_id, go_name, category = rng.choice(go_terms)
+            evidence, eco = rng.choice(EVIDENCE_CODES)
+            gene = rng.randrange(max(annotation_count // 5, 1))
+            row = [
+                'UniProtKB', f"P{gene:05d}", f"GENE{gene}", rng.choice(['involved_in', 'acts_upstream_of']),
+                go_id, go_name, eco, evidence, f"PMID:{10000000 + index}", '', '9606', 'ARUK-UCL', '',
+                GO_CATEGORIES[category],
+            ]
+            f.write('\t'.join(row) + '\n')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output-dir', default='datasets/synthetic')
+    parser.add_argument('--drugs', type=int, default=1000)
+    parser.add_argument('--go-terms', type=int, default=500)
+    parser.add_argument('--go-per-polypeptide', type=int, default=5)
+    parser.add_argument('--proteins-per-drug', type=int, default=4)
+    parser.add_argument('--text-length', type=int, default=400)
+    parser.add_argument('--annotations', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    xml_path = write_drugbank_xml(
+        os.path.join(args.output_dir, 'drugbank_synthetic.xml'), drug_count=args.drugs, go_term_count=args.go_terms,
+        go_per_polypeptide=args.go_per_polypeptide, proteins_per_drug=args.proteins_per_drug,
+        text_length=args.text_length, seed=args.seed,
+    )
+    tsv_path = write_arukucl_tsv(
+        os.path.join(args.output_dir, 'ARUK-UCL-GO-terms.tsv'), annotation_count=args.annotations,
+        go_term_count=args.go_terms, seed=args.seed,
+    )
+    print(f"Wrote {xml_path} and {tsv_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,15 +4,15 @@ import os
 import sys
 import json
 import logging
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import tiktoken
 
 # Add the project root to sys.path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 sys.path.insert(0, project_root)
 
-from utils.logging_config import setup_logging
+from src_pub.utils.logging_config import setup_logging
+from src_pub.utils.conn_neo4j import get_driver
 
 # Load environment variables from .env file
 load_dotenv()
@@ -70,7 +70,7 @@ def calculate_token_length(prompt):
 
 def get_all_drugs(uri, user, password):
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
+        driver = get_driver(uri, user, password)
         logger.info("Database connection established successfully.")
 
         with driver.session() as session:
@@ -81,9 +81,6 @@ def get_all_drugs(uri, user, password):
     except Exception as e:
         logger.critical(f"Failed to establish database connection or retrieve drug IDs: {str(e)}")
         return []
-    finally:
-        if 'driver' in locals():
-            driver.close()
 
 def generate_prompt(drug_info, neighbors_info):
     prompt = intro
@@ -100,8 +97,8 @@ def generate_prompt(drug_info, neighbors_info):
 
 def get_drug_and_neighbors_info(uri, user, password, drugbank_id, skipped_counter):
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-        logger.info("Database connection established successfully.")
+        # Shared driver, the connection pool is reused across all drugs
+        driver = get_driver(uri, user, password)
 
         with driver.session() as session:
             logger.info(f"Retrieving information for Drug node with drugbankId: {drugbank_id}")
@@ -182,9 +179,6 @@ def get_drug_and_neighbors_info(uri, user, password, drugbank_id, skipped_counte
 
     except Exception as e:
         logger.critical(f"Failed to establish database connection or retrieve information: {str(e)}")
-    finally:
-        if 'driver' in locals():
-            driver.close()
     return skipped_counter
 
 # Connection details
@@ -2,75 +2,71 @@ import os
 import sys
 import json
 import logging
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Add the project root to sys.path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
+from src_pub.utils.conn_neo4j import get_driver
+from src_pub.utils.batch_writer import BatchWriter
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-def update_drug_node(session, drugbank_id, response_json, token_length, index):
-    try:
-        logger.debug(f"response_json type: {type(response_json)}")
-        logger.debug(f"response_json content: {response_json}")
-
-        if isinstance(response_json, str):
-            logger.error("response_json is still a string, skipping update.")
-            return
-
-        reason_rating = response_json.get('reason_rating', '')
-        rating = response_json.get('rating', 0.0)
-
-        # Create property names with suffix based on directory index
-        reason_rating_property = f"reason_rating_{index}"
-        rating_property = f"rating_{index}"
-        rating_token_length_property = f"rating_token_length_{index}"
-
-        session.run(f"""
-            MATCH (d:Drug {{drugbankId: $drugbank_id}})
-            SET d.{reason_rating_property} = $reason_rating,
-                d.{rating_property} = $rating,
-                d.{rating_token_length_property} = $token_length
-            RETURN d
-        """, drugbank_id=drugbank_id, reason_rating=reason_rating, rating=rating, token_length=token_length)
-
-        # Verify the update
-        result = session.run(f"""
-            MATCH (d:Drug {{drugbankId: $drugbank_id}})
-            RETURN d.{reason_rating_property} AS reason_rating, d.{rating_property} AS rating, d.{rating_token_length_property} AS rating_token_length
-        """, drugbank_id=drugbank_id)
-
-        record = result.single()
-        if record:
-            logger.info(f"Updated Drug node with drugbankId: {drugbank_id}")
-            logger.info(f"{reason_rating_property}: {record['reason_rating']}")
-            logger.info(f"{rating_property}: {record['rating']}")
-            logger.info(f"{rating_token_length_property}: {record['rating_token_length']}")
-        else:
-            logger.error(f"Failed to update Drug node with drugbankId: {drugbank_id}")
-
-    except Exception as e:
-        logger.error(f"An error occurred while updating the drug node: {str(e)}")
+RATING_BATCH_SIZE = 500  # Ratings per UNWIND transaction
+
+def rating_update_query(index):
+    """
+    Return the UNWIND query storing the ratings of one run (directory) on the Drug nodes.
+    """
+    # Create property names with suffix based on directory index
+    reason_rating_property = f"reason_rating_{index}"
+    rating_property = f"rating_{index}"
+    rating_token_length_property = f"rating_token_length_{index}"
+    return f"""
+        UNWIND $rows AS row
+        MATCH (d:Drug {{drugbankId: row.drugbank_id}})
+        SET d.{reason_rating_property} = row.reason_rating,
+            d.{rating_property} = row.rating,
+            d.{rating_token_length_property} = row.token_length
+    """
+
+def rating_row(drugbank_id, response_json, token_length):
+    """
+    Return the parameter map of one rating, or None if the response is not a JSON object.
+    """
+    logger.debug(f"response_json type: {type(response_json)}")
+    logger.debug(f"response_json content: {response_json}")
+
+    if isinstance(response_json, str):
+        logger.error("response_json is still a string, skipping update.")
+        return None
+
+    return {
+        'drugbank_id': drugbank_id,
+        'reason_rating': response_json.get('reason_rating', ''),
+        'rating': response_json.get('rating', 0.0),
+        'token_length': token_length,
+    }
 
 def process_json_files(directories, uri, user, password):
     failed_updates = 0
     total_files = 0
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
+        driver = get_driver(uri, user, password)
         logger.info("Database connection established successfully.")
 
         for index, directory in enumerate(directories):
             json_files = [f for f in os.listdir(directory) if f.endswith('.json')]
             total_files += len(json_files)
+            writer = BatchWriter(driver, rating_update_query(index), batch_size=RATING_BATCH_SIZE,
+                                 name=f"Rating writer {index}")
             for json_file in json_files:
                 try:
                     file_path = os.path.join(directory, json_file)
@@ -111,20 +107,28 @@ def process_json_files(directories, uri, user, password):
                     # Extract drugbank_id from filename and handle special characters
                     drugbank_id = json_file.split('_')[-1].replace('.json', '')
                     
-                    # Call update_drug_node for each JSON file
-                    with driver.session() as session:
-                        # Calculate token length (assuming response_data is the prompt for token length)
-                        token_length = len(response_data)
-                        update_drug_node(session, drugbank_id, response_json, token_length, index)
+                    # Calculate token length (assuming response_data is the prompt for token length)
+                    token_length = len(response_data)
+                    row = rating_row(drugbank_id, response_json, token_length)
+                    if row is None:
+                        failed_updates += 1
+                        continue
+                    writer.add(row)
                 except Exception as e:
                     logger.error(f"Failed to process file {file_path}: {str(e)}")
                     failed_updates += 1
+
+            totals = writer.close()
+            # Every matched Drug node gets three properties, rows without a Drug node set none
+            updated = totals.get('properties_set', 0) // 3
+            if updated < totals['rows']:
+                logger.error(f"No Drug node found for {totals['rows'] - updated} ratings in {directory}")
+                failed_updates += totals['rows'] - updated
+            logger.info(f"Updated {updated} Drug nodes with the ratings in {directory}")
     
     except Exception as e:
         logger.critical(f"Failed to process JSON files or update the database: {str(e)}")
     finally:
-        if 'driver' in locals():
-            driver.close()
         logger.info(f"Processed {total_files} JSON files.")
         logger.info(f"Failed to update {failed_updates} JSON files.")
 
@@ -4,7 +4,6 @@ import subprocess
 import json
 import urllib.parse
 import logging
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import os
 import sys
@@ -16,6 +15,8 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
+from src_pub.utils.conn_neo4j import get_driver
+
 # Set up logging
 log_filename = "script.log"
 logging.basicConfig(level=logging.INFO,
@@ -72,7 +73,7 @@ def save_to_file(data, filename):
     logging.info(f"Results saved to {filename}")
 
 def get_drug_names_from_neo4j(uri, user, password):
-    driver = GraphDatabase.driver(uri, auth=(user, password))
+    driver = get_driver(uri, user, password)
     query = "MATCH (n:Drug) RETURN n.name AS name"
     drug_names = []
 
@@ -81,7 +82,6 @@ def get_drug_names_from_neo4j(uri, user, password):
         for record in result:
             drug_names.append(record["name"])
 
-    driver.close()
     return drug_names
 
 def sanitize_filename(name):
@@ -4,8 +4,9 @@ This script processes the ARUK-UCL-GO-terms.tsv file to filter for biological pr
 The script performs the following steps:
 
     1. Reads the ARUK-UCL-GO-terms.tsv file (as it can be downloaded from the GeneOntology Website)
+       in chunks, so full annotation files do not need to fit in memory.
     2. Filters the dataset for entries where the 'GO ASPECT' column is 'P' (biological processes).
-    3. Saves the filtered data to a new TSV file in datasets.
+    3. Saves the filtered data to a new TSV file in datasets, appending chunk by chunk.
 
 
 Environment Variables
@@ -16,6 +17,9 @@ input_path_arukucl : str, optional
 output_path_arukucl : str
     The path to the output TSV file. Defaults to 'datasets/bioprocess_ARUK-UCL-GO-terms.tsv'.
 
+The filtered TSV is only needed as an artifact: `add_arukucl_to_neo4j_db` filters the input file
+itself while streaming it into Neo4j (see `filter_and_add_arukucl`).
+
 Functions
 ---------
 filter_for_biological_processes()
@@ -37,7 +41,6 @@ To run the script, simply execute it as a standalone program:
 
 import sys
 import os
-import pandas as pd
 import os
 import logging
 
@@ -47,6 +50,7 @@ sys.path.insert(0, project_root)
 
 
 from src_pub.utils.logging_config import setup_logging
+from src_pub.dataset_prep.go_annotation_reader import iter_annotation_chunks, write_annotation_chunks
 from dotenv import load_dotenv
 
 
@@ -66,7 +70,7 @@ logger = logging.getLogger(__name__)
 # Recheck relative paths here
 
 input_path_arukucl = os.getenv('input_path_arukucl', 'datasets/ARUK-UCL-GO-terms.tsv')
-output_path_arukucl = 'datasets/bioprocess_ARUK-UCL-GO-terms.tsv'
+output_path_arukucl = os.getenv('output_path_arukucl', 'datasets/bioprocess_ARUK-UCL-GO-terms.tsv')
 
 
 # Add immunological processes to Neo4j database based on ARUK-UCL data
@@ -78,19 +82,10 @@ def filter_for_biological_processes():
     Function that filters the ARUK-UCL-GO-terms.tsv file for biological processes.
     '''
     try:
-        logger.info('Reading TSV from datasets/ARUK-UCL-GO-terms.tsv')
-        file_path = 'datasets/ARUK-UCL-GO-terms.tsv'
-        data = pd.read_csv(file_path, sep='\t')
-        logger.info('Loaded data from %s', file_path)
-
-        logger.info('Filtering dataset for biological processes appearing as P in %s', file_path)
-        filtered_data = data[data['GO ASPECT'] == 'P']
-        logger.info('Filtered data for biological processes')
-
-        output_path = 'datasets/bioprocess_ARUK-UCL-GO-terms.tsv'
-        logger.info('Attempting to save filtered data to %s', output_path)
-        filtered_data.to_csv(output_path, sep='\t', index=False)
-        logger.info('Filtered data saved to %s', output_path)
+        logger.info('Streaming TSV from %s, filtering for biological processes appearing as P', input_path_arukucl)
+        chunks = iter_annotation_chunks(input_path_arukucl, aspects=['P'])
+        rows_written = sum(len(chunk) for chunk in write_annotation_chunks(chunks, output_path_arukucl))
+        logger.info('Filtered data saved to %s (%d biological process annotations)', output_path_arukucl, rows_written)
     except Exception as e:
         logger.critical(f'An error occurred: {e}')
 
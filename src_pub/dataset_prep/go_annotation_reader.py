@@ -0,0 +1,341 @@
+"""
+This module streams GO annotation files in chunks, so that full annotation files never have to fit in memory.
+
+Two formats are supported and both are returned with the column names of the ARUK-UCL TSV
+export (`ARUKUCL_COLUMNS`), so every chunk can be passed to the same ingest functions:
+
+    'tsv'  The tab-separated QuickGO export that ARUK-UCL-GO-terms.tsv is downloaded as.
+    'gaf'  GO Annotation File 2.x, e.g. goa_human.gaf.gz from the GOA project. The '!' header
+           lines are skipped. GAF has no GO names or ECO IDs; 'GO NAME' is filled from the
+           optional `go_names` mapping (falling back to the GO ID) and 'ECO ID' is left empty.
+
+GPAD files are not supported: they carry neither the GO aspect nor the gene symbol.
+
+Gzip-compressed files ('.gz') are decompressed on the fly. Only the requested columns are
+parsed, and the low-cardinality columns are returned as categoricals. If pyarrow is installed
+its streaming CSV reader is used, otherwise the chunked pandas C parser.
+
+Functions:
+    detect_annotation_format(path): Guess whether a file is a GAF or a QuickGO TSV.
+    filter_annotations(chunk, ...): Keep the annotations matching aspect, evidence code and taxon predicates.
+    iter_annotation_chunks(path, ...): Yield the (filtered) annotations as DataFrame chunks.
+    write_annotation_chunks(chunks, output_path): Write chunks to a TSV while passing them on.
+
+Example usage:
+    from src_pub.dataset_prep.go_annotation_reader import iter_annotation_chunks
+
+    for chunk in iter_annotation_chunks('datasets/goa_human.gaf.gz', aspects=['P']):
+        neo4j_conn.add_biological_process_annotations(chunk)
+"""
+
+import os
+import gzip
+import logging
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow only speeds up reading, pandas is used without it
+    pa = None
+    pa_csv = None
+
+DEFAULT_CHUNKSIZE = 200_000  # Annotation rows per chunk
+PYARROW_BLOCK_BYTES = 16 * 1024 * 1024  # Bytes per block of the pyarrow streaming reader, roughly 100k GAF rows
+
+ARUKUCL_COLUMNS = [
+    'GENE PRODUCT DB', 'GENE PRODUCT ID', 'SYMBOL', 'QUALIFIER', 'GO TERM', 'GO NAME', 'ECO ID',
+    'GO EVIDENCE CODE', 'REFERENCE', 'WITH/FROM', 'TAXON ID', 'ASSIGNED BY', 'ANNOTATION EXTENSION', 'GO ASPECT',
+]
+
+# GAF 2.x columns in file order, mapped onto the ARUK-UCL column names (None = not used)
+GAF_COLUMNS = [
+    ('DB', 'GENE PRODUCT DB'),
+    ('DB Object ID', 'GENE PRODUCT ID'),
+    ('DB Object Symbol', 'SYMBOL'),
+    ('Qualifier', 'QUALIFIER'),
+    ('GO ID', 'GO TERM'),
+    ('DB:Reference', 'REFERENCE'),
+    ('Evidence Code', 'GO EVIDENCE CODE'),
+    ('With or From', 'WITH/FROM'),
+    ('Aspect', 'GO ASPECT'),
+    ('DB Object Name', None),
+    ('DB Object Synonym', None),
+    ('DB Object Type', None),
+    ('Taxon', 'TAXON ID'),
+    ('Date', None),
+    ('Assigned By', 'ASSIGNED BY'),
+    ('Annotation Extension', 'ANNOTATION EXTENSION'),
+    ('Gene Product Form ID', None),
+]
+
+# Columns with few distinct values, stored as categoricals
+CATEGORICAL_COLUMNS = ('GENE PRODUCT DB', 'QUALIFIER', 'GO EVIDENCE CODE', 'TAXON ID', 'ASSIGNED BY', 'GO ASPECT')
+
+ANNOTATION_FORMATS = ('tsv', 'gaf')
+
+
+def _open_text(path):
+    """
+    Open a plain or gzip-compressed text file for reading.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _count_header_lines(path):
+    """
+    Count the leading '!' comment lines of a GAF file.
+    """
+    count = 0
+    with _open_text(path) as f:
+        for line in f:
+            if not line.startswith('!'):
+                break
+            count += 1
+    return count
+
+
+def detect_annotation_format(path):
+    """
+    Guess the format of a GO annotation file from its name and its first line.
+
+    Parameters
+    ----------
+    path : str
+        The path to the annotation file, optionally gzip-compressed.
+
+    Returns
+    -------
+    str
+        'gaf' or 'tsv'.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.gaf'):
+        return 'gaf'
+    with _open_text(path) as f:
+        first_line = f.readline()
+    return 'gaf' if first_line.startswith('!') else 'tsv'
+
+
+def _source_columns(path, file_format, columns, required):
+    """
+    Return the names of all file columns and a mapping of the parsed file columns to their ARUK-UCL names.
+
+    Missing TSV columns raise a ValueError if they are `required`, the others are skipped with a warning.
+    """
+    if file_format == 'tsv':
+        with _open_text(path) as f:
+            file_names = f.readline().rstrip('\r\n').split('\t')
+        missing = [col for col in columns if col not in file_names]
+        missing_required = [col for col in missing if col in required]
+        if missing_required:
+            raise ValueError(f"{path} is missing the columns: {', '.join(missing_required)}")
+        if missing:
+            logging.warning(f"{path} is missing the columns: {', '.join(missing)}")
+        return file_names, {col: col for col in columns if col in file_names}
+    file_names = [gaf_name for gaf_name, _ in GAF_COLUMNS]
+    renames = {gaf_name: col for gaf_name, col in GAF_COLUMNS if col in columns}
+    return file_names, renames
+
+
+def _derive_columns(chunk, file_format, columns, go_names):
+    """
+    Fill the ARUK-UCL columns that a GAF file does not hold as such.
+    """
+    if file_format == 'gaf':
+        if 'TAXON ID' in chunk:
+            # 'taxon:9606' or 'taxon:9606|taxon:1280' for interactions, keep the annotated organism
+            chunk['TAXON ID'] = chunk['TAXON ID'].str.split('|').str[0].str.replace('taxon:', '', regex=False)
+        if 'GO NAME' in columns:
+            names = chunk['GO TERM'].map(go_names) if go_names else None
+            chunk['GO NAME'] = chunk['GO TERM'] if names is None else names.fillna(chunk['GO TERM'])
+        if 'ECO ID' in columns:
+            chunk['ECO ID'] = None
+    return chunk
+
+
+def _select_columns(chunk, columns):
+    """
+    Bring a chunk into the requested column order and convert the low-cardinality columns to categoricals.
+    """
+    chunk = chunk[columns].reset_index(drop=True)
+    for col in CATEGORICAL_COLUMNS:
+        if col in chunk and not isinstance(chunk[col].dtype, pd.CategoricalDtype):
+            chunk[col] = chunk[col].astype('category')
+    return chunk
+
+
+def filter_annotations(chunk, aspects=None, evidence_codes=None, taxa=None):
+    """
+    Keep the annotations of a chunk that match all given predicates.
+
+    Parameters
+    ----------
+    chunk : pd.DataFrame
+        Annotations in the ARUK-UCL layout.
+    aspects : iterable, optional
+        Allowed 'GO ASPECT' values, e.g. ['P'] for biological processes.
+    evidence_codes : iterable, optional
+        Allowed 'GO EVIDENCE CODE' values, e.g. ['IDA', 'IMP'] for experimental evidence only.
+    taxa : iterable, optional
+        Allowed NCBI taxon IDs in 'TAXON ID', e.g. [9606] for human annotations.
+
+    Returns
+    -------
+    pd.DataFrame
+        The matching annotations. A predicate that is None does not filter.
+    """
+    mask = pd.Series(True, index=chunk.index)
+    for col, allowed in (('GO ASPECT', aspects), ('GO EVIDENCE CODE', evidence_codes), ('TAXON ID', taxa)):
+        if allowed is not None:
+            mask &= chunk[col].astype(str).isin({str(value) for value in allowed})
+    return chunk[mask]
+
+
+def _iter_raw_chunks_pyarrow(path, file_names, renames, skip_rows, chunksize):
+    """
+    Yield chunks with the pyarrow streaming CSV reader, which decompresses '.gz' files itself.
+    """
+    read_options = pa_csv.ReadOptions(
+        column_names=file_names, skip_rows=skip_rows, block_size=PYARROW_BLOCK_BYTES,
+    )
+    parse_options = pa_csv.ParseOptions(delimiter='\t', quote_char=False)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=list(renames),
+        column_types={name: pa.string() for name in renames},
+        strings_can_be_null=True,
+    )
+    reader = pa_csv.open_csv(path, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+    pending = []
+    pending_rows = 0
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunksize:
+            yield pa.Table.from_batches(pending).to_pandas().rename(columns=renames)
+            pending, pending_rows = [], 0
+    if pending_rows:
+        yield pa.Table.from_batches(pending).to_pandas().rename(columns=renames)
+
+
+def _iter_raw_chunks_pandas(path, file_names, renames, skip_rows, chunksize):
+    """
+    Yield chunks with the chunked pandas C parser.
+    """
+    reader = pd.read_csv(
+        path, sep='\t', names=file_names, header=None, skiprows=skip_rows, usecols=list(renames),
+        dtype={name: 'category' if renames[name] in CATEGORICAL_COLUMNS else str for name in renames},
+        quoting=3, chunksize=chunksize, compression='infer',
+    )
+    for chunk in reader:
+        yield chunk.rename(columns=renames)
+
+
+def iter_annotation_chunks(path, file_format=None, columns=None, aspects=None, evidence_codes=None, taxa=None,
+                           chunksize=DEFAULT_CHUNKSIZE, go_names=None, use_pyarrow=None):
+    """
+    Yield the annotations of a GO annotation file as DataFrame chunks in the ARUK-UCL layout.
+
+    Parameters
+    ----------
+    path : str
+        The path to a QuickGO TSV or GAF file, optionally gzip-compressed.
+    file_format : str, optional
+        'tsv' or 'gaf'. Detected with `detect_annotation_format` if not given.
+    columns : list, optional
+        The ARUK-UCL columns to return, a ValueError is raised if the file lacks one of them.
+        Defaults to the columns of `ARUKUCL_COLUMNS` the file has; fewer columns parse faster.
+    aspects, evidence_codes, taxa : iterable, optional
+        Only keep the annotations matching these predicates, see `filter_annotations`.
+    chunksize : int
+        The approximate number of annotation rows read per chunk.
+    go_names : dict, optional
+        GO ID -> GO name, used to fill 'GO NAME' for GAF files.
+    use_pyarrow : bool, optional
+        Use the pyarrow streaming reader. Defaults to True if pyarrow is installed.
+
+    Yields
+    ------
+    pd.DataFrame
+        The annotations of one chunk, with the low-cardinality columns as categoricals. Chunks
+        left empty by the predicates are skipped.
+    """
+    file_format = file_format or detect_annotation_format(path)
+    if file_format not in ANNOTATION_FORMATS:
+        raise ValueError(f"Unknown annotation format '{file_format}', expected one of {', '.join(ANNOTATION_FORMATS)}")
+    explicit_columns = bool(columns)
+    columns = list(columns or ARUKUCL_COLUMNS)
+    unknown = [col for col in columns if col not in ARUKUCL_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown annotation columns: {', '.join(unknown)}")
+    if use_pyarrow is None:
+        use_pyarrow = pa_csv is not None
+    elif use_pyarrow and pa_csv is None:
+        raise ImportError("The pyarrow reader requires pyarrow. Install it with 'pip install pyarrow'.")
+
+    # GO TERM is needed to derive GO NAME for GAF files, the predicate columns to filter
+    parsed = list(columns)
+    needed = [
+        col for col, predicate in (('GO ASPECT', aspects), ('GO EVIDENCE CODE', evidence_codes), ('TAXON ID', taxa))
+        if predicate is not None
+    ]
+    if file_format == 'gaf' and 'GO NAME' in columns:
+        needed.append('GO TERM')
+    parsed += [col for col in needed if col not in parsed]
+
+    required = parsed if explicit_columns else needed
+    file_names, renames = _source_columns(path, file_format, parsed, required)
+    if file_format == 'tsv':
+        columns = [col for col in columns if col in renames]
+    skip_rows = _count_header_lines(path) if file_format == 'gaf' else 1
+    if file_format == 'gaf' and 'GO NAME' in columns and not go_names:
+        logging.warning(f"{path} has no GO names and no mapping was given, 'GO NAME' is set to the GO ID")
+
+    iter_raw_chunks = _iter_raw_chunks_pyarrow if use_pyarrow else _iter_raw_chunks_pandas
+    rows_read = 0
+    rows_kept = 0
+    for chunk in iter_raw_chunks(path, file_names, renames, skip_rows, chunksize):
+        rows_read += len(chunk)
+        chunk = filter_annotations(
+            _derive_columns(chunk, file_format, columns, go_names),
+            aspects=aspects, evidence_codes=evidence_codes, taxa=taxa,
+        )
+        if chunk.empty:
+            continue
+        rows_kept += len(chunk)
+        yield _select_columns(chunk, columns)
+    logging.info(f"Read {rows_read} annotations from {path}, kept {rows_kept}")
+
+
+def write_annotation_chunks(chunks, output_path):
+    """
+    Pass annotation chunks through unchanged while writing them to a TSV file.
+
+    The file is written chunk by chunk as the chunks are consumed, in the layout of the
+    ARUK-UCL TSV, so it can be read again with `iter_annotation_chunks` or `pd.read_csv`.
+
+    Parameters
+    ----------
+    chunks : iterable
+        DataFrames in the ARUK-UCL layout.
+    output_path : str
+        The path of the TSV file, overwritten if it exists.
+
+    Yields
+    ------
+    pd.DataFrame
+        The input chunks.
+    """
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    rows_written = 0
+    header_written = False
+    for chunk in chunks:
+        chunk.to_csv(output_path, sep='\t', index=False, mode='a' if header_written else 'w', header=not header_written)
+        header_written = True
+        rows_written += len(chunk)
+        yield chunk
+    if not header_written:
+        pd.DataFrame(columns=ARUKUCL_COLUMNS).to_csv(output_path, sep='\t', index=False)
+    logging.info(f"Wrote {rows_written} annotations to {output_path}")
@@ -3,6 +3,9 @@ This module provides functionality to add biological processes selected by ARUK-
 
 Functions:
     setup_environment(): Load environment variables and configure logging.
+    aggregate_biological_processes(data): Aggregate the annotations into one property set per GO term.
+    build_annotation_rows(data): Deduplicate the annotations into GeneProduct/annotation rows.
+    filter_and_add_arukucl(neo4j_conn, input_path, ...): Filter the annotations while streaming them into Neo4j.
     add_arukucl_to_neo4j_db(): Function to load data and add biological processes to Neo4j.
 
 Classes:
@@ -17,7 +20,6 @@ import sys
 import pandas as pd
 import logging
 from dotenv import load_dotenv
-import pandas as pd
 
 # Add the project root to sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -26,15 +28,194 @@ sys.path.insert(0, project_root)
 from src_pub.utils.logging_config import setup_logging
 from src_pub.utils.conn_neo4j import Neo4jConnection
 from src_pub.utils.uuid_util import generate_uuid
-
-TSV_FILE_PATH = os.getenv('BIOPROCESS_ARUK_UCL_GO_TERMS_TSV', 'datasets/ARUK-UCL-GO-terms.tsv') # 'datasets/ARUK-UCL-GO-terms.tsv' default if it fails
+from src_pub.utils.batch_writer import BatchWriter
+from src_pub.dataset_prep.go_annotation_reader import iter_annotation_chunks, write_annotation_chunks
+
+# Mapping of ARUK-UCL column names to BiologicalProcess property names
+BIOLOGICAL_PROCESS_PROPERTY_MAPPING = {
+    'GENE PRODUCT DB': 'geneProductDb',
+    'GENE PRODUCT ID': 'geneProductId',
+    'SYMBOL': 'symbol',  # this property needs renaming - but first we need to find out what it actually means
+    'QUALIFIER': 'qualifier',
+    'GO TERM': 'goTerm',
+    'GO NAME': 'goName',
+    'ECO ID': 'ecoId',
+    'GO EVIDENCE CODE': 'goEvidenceCode',
+    'REFERENCE': 'reference',
+    'WITH/FROM': 'withFrom',
+    'TAXON ID': 'taxonId',
+    'ASSIGNED BY': 'assignedBy',
+    'ANNOTATION EXTENSION': 'annotationExtension',
+    'GO ASPECT': 'goAspect',
+}
+
+# Properties that are the same for all annotations of a GO term, all others are joined with ', '
+BIOLOGICAL_PROCESS_KEY_COLUMNS = ('GO TERM', 'GO NAME')
+
+# Annotation model: (:GeneProduct)-[:ANNOTATED_TO]->(:BiologicalProcess), one relationship per distinct annotation
+BIOLOGICAL_PROCESS_NODE_COLUMNS = ('GO TERM', 'GO NAME', 'GO ASPECT')
+GENE_PRODUCT_PROPERTY_MAPPING = {
+    'GENE PRODUCT DB': 'geneProductDb',
+    'GENE PRODUCT ID': 'geneProductId',
+    'SYMBOL': 'symbol',
+    'TAXON ID': 'taxonId',
+}
+ANNOTATION_PROPERTY_MAPPING = {
+    'QUALIFIER': 'qualifier',
+    'ECO ID': 'ecoId',
+    'GO EVIDENCE CODE': 'goEvidenceCode',
+    'REFERENCE': 'reference',
+    'WITH/FROM': 'withFrom',
+    'ASSIGNED BY': 'assignedBy',
+    'ANNOTATION EXTENSION': 'annotationExtension',
+}
+
+ANNOTATION_STORAGE_MODES = ('rows', 'aggregated', 'nodes')
+
+DEFAULT_PROCESS_BATCH_SIZE = 1000  # GO terms per UNWIND transaction
+
+TSV_FILE_PATH = os.getenv('input_path_arukucl', 'datasets/ARUK-UCL-GO-terms.tsv') # 'datasets/ARUK-UCL-GO-terms.tsv' default if it fails
 
 # Load environment variables & configure logging
 def setup_environment():
     """
     Load environment variables and configure logging.
     """
-    
+    load_dotenv()
+
+
+def _property_value(value):
+    """
+    Convert a DataFrame value into a Neo4j property value: missing values become None, numpy
+    scalars Python values and integral floats (e.g. a taxon ID in a column with gaps) integers.
+    """
+    if pd.isna(value):
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _join_values(values):
+    """
+    Join the values of one property over the annotations of a GO term.
+
+    A single value keeps its type; several values are joined with ', ' in file order, skipping
+    missing ones. None if all values are missing.
+    """
+    values = [value for value in (_property_value(value) for value in values) if value is not None]
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return ', '.join(str(value) for value in values)
+
+
+def aggregate_biological_processes(data):
+    """
+    Aggregate the ARUK-UCL annotations into one BiologicalProcess property set per GO term.
+
+    The values of all annotations of a GO term are joined with ', ' in file order, like
+    `Neo4jConnectionExtended.add_biological_process` appends them one row at a time. Unlike that
+    path, missing values are skipped instead of being stored as NaN, a GO term with a single
+    annotation keeps the original types (e.g. an integer taxonId), and a property without any
+    value is None, i.e. not set.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        DataFrame containing biological process data, as read from the filtered ARUK-UCL TSV.
+
+    Returns
+    -------
+    list
+        One property dictionary per GO term, in order of first appearance.
+    """
+    columns = [col for col in BIOLOGICAL_PROCESS_PROPERTY_MAPPING if col in data.columns]
+    missing = set(BIOLOGICAL_PROCESS_PROPERTY_MAPPING) - set(columns)
+    if missing:
+        logging.warning(f"Missing columns in the ARUK-UCL data: {', '.join(sorted(missing))}")
+    if any(col not in columns for col in BIOLOGICAL_PROCESS_KEY_COLUMNS):
+        raise ValueError("The ARUK-UCL data needs the columns 'GO TERM' and 'GO NAME'")
+
+    values = data[columns].astype(object)
+    joined_columns = [col for col in columns if col not in BIOLOGICAL_PROCESS_KEY_COLUMNS]
+    first = values.groupby('GO TERM', sort=False)['GO NAME'].first()
+    joined = values.groupby('GO TERM', sort=False)[joined_columns].agg(_join_values)
+
+    processes = []
+    for go_term, go_name in first.items():
+        process = {'label': go_name}
+        for col in columns:
+            prop = BIOLOGICAL_PROCESS_PROPERTY_MAPPING[col]
+            if col == 'GO TERM':
+                process[prop] = go_term
+            elif col == 'GO NAME':
+                process[prop] = go_name
+            else:
+                # pandas turns the None of a group without values back into NaN
+                process[prop] = _property_value(joined.at[go_term, col])
+        processes.append(process)
+    return processes
+
+
+def build_annotation_rows(data):
+    """
+    Split the ARUK-UCL annotations into BiologicalProcess, GeneProduct and annotation rows.
+
+    Identical annotation rows are dropped, so every distinct annotation becomes exactly one
+    ANNOTATED_TO relationship. Missing values are stored as empty strings, which keeps the
+    relationship properties usable as MERGE keys.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        DataFrame containing biological process data, as read from the filtered ARUK-UCL TSV.
+
+    Returns
+    -------
+    dict
+        'processes': one property dictionary per GO term,
+        'gene_products': one property dictionary per gene product ID,
+        'annotations': one dictionary per distinct annotation with 'goTerm', 'geneProductId'
+        and the annotation 'properties', which always hold every `ANNOTATION_PROPERTY_MAPPING` key.
+        All lists keep the order of first appearance.
+    """
+    required = ('GO TERM', 'GO NAME', 'GENE PRODUCT ID')
+    if any(col not in data.columns for col in required):
+        raise ValueError("The ARUK-UCL data needs the columns 'GO TERM', 'GO NAME' and 'GENE PRODUCT ID'")
+    columns = [col for col in BIOLOGICAL_PROCESS_PROPERTY_MAPPING if col in data.columns]
+    missing = set(BIOLOGICAL_PROCESS_PROPERTY_MAPPING) - set(columns)
+    if missing:
+        logging.warning(f"Missing columns in the ARUK-UCL data: {', '.join(sorted(missing))}")
+
+    text = data[columns].astype(object).where(data[columns].notna(), '').astype(str).drop_duplicates()
+
+    process_columns = [col for col in BIOLOGICAL_PROCESS_NODE_COLUMNS if col in columns]
+    processes = [
+        {'label': row['GO NAME'], **{BIOLOGICAL_PROCESS_PROPERTY_MAPPING[col]: row[col] for col in process_columns}}
+        for row in text.drop_duplicates('GO TERM')[process_columns].to_dict('records')
+    ]
+
+    gene_product_columns = [col for col in GENE_PRODUCT_PROPERTY_MAPPING if col in columns]
+    gene_products = [
+        {GENE_PRODUCT_PROPERTY_MAPPING[col]: row[col] for col in gene_product_columns}
+        for row in text.drop_duplicates('GENE PRODUCT ID')[gene_product_columns].to_dict('records')
+    ]
+
+    annotation_columns = [col for col in ANNOTATION_PROPERTY_MAPPING if col in columns]
+    annotations = [
+        {
+            'goTerm': row['GO TERM'],
+            'geneProductId': row['GENE PRODUCT ID'],
+            'properties': {prop: row.get(col, '') for col, prop in ANNOTATION_PROPERTY_MAPPING.items()},
+        }
+        for row in text[['GO TERM', 'GENE PRODUCT ID'] + annotation_columns].drop_duplicates().to_dict('records')
+    ]
+    return {'processes': processes, 'gene_products': gene_products, 'annotations': annotations}
+
 
 class Neo4jConnectionExtended(Neo4jConnection):
     """
@@ -43,7 +224,13 @@ class Neo4jConnectionExtended(Neo4jConnection):
     Methods
     -------
     add_biological_process(data: pd.DataFrame):
-        Adds biological processes to the Neo4j database.
+        Adds biological processes to the Neo4j database, one transaction per annotation.
+    add_biological_process_aggregated(data: pd.DataFrame, batch_size: int):
+        Adds biological processes to the Neo4j database, one UNWIND per batch of GO terms.
+    add_biological_process_annotations(data: pd.DataFrame, batch_size: int):
+        Adds biological processes with their annotations as GeneProduct nodes and relationships.
+    add_biological_process_chunks(chunks: iterable, mode: str):
+        Adds biological processes from a stream of annotation chunks.
     
     TO DO:
     - Rename this class since its name is ambigous and not descriptive
@@ -72,6 +259,238 @@ class Neo4jConnectionExtended(Neo4jConnection):
                     nodes_merged += 1
             logging.info(f"Finished adding biological processes to Neo4j. Nodes not created: {nodes_not_created}, Nodes merged: {nodes_merged}")
 
+    def add_biological_process_aggregated(self, data, batch_size=DEFAULT_PROCESS_BATCH_SIZE):
+        """
+        Add biological processes to the Neo4j database with one write per batch of GO terms.
+
+        The annotations are grouped by GO term in pandas first (see `aggregate_biological_processes`),
+        so every BiologicalProcess node is merged once instead of once per annotation. The resulting
+        nodes hold the same joined values as with `add_biological_process`, except for missing values,
+        see `aggregate_biological_processes`.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame containing biological process data.
+        batch_size : int
+            The maximum number of GO terms per UNWIND transaction.
+
+        Returns
+        -------
+        dict
+            The number of 'annotations', 'processes', 'created' and 'merged' nodes.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+        logging.info("Starting to add aggregated biological processes to Neo4j.")
+        processes = aggregate_biological_processes(data)
+        with BatchWriter(self.driver, work=self._merge_biological_process_batch, batch_size=batch_size,
+                         name='BiologicalProcess writer') as writer:
+            writer.write(processes)
+        created = writer.totals.get('written', 0)
+
+        totals = {'annotations': len(data), 'processes': len(processes), 'created': created, 'merged': len(processes) - created}
+        logging.info(
+            f"Finished adding {totals['annotations']} annotations as {totals['processes']} biological processes. "
+            f"Nodes created: {totals['created']}, Nodes merged: {totals['merged']}"
+        )
+        return totals
+
+    @staticmethod
+    def _merge_biological_process_batch(tx, processes):
+        """
+        Create or update a batch of aggregated biological process nodes with a single UNWIND query.
+
+        New nodes get all properties of the batch row. On existing nodes the aggregated values are
+        appended with ', ', like `_create_or_update_biological_process` does for every single row;
+        a missing (None) value leaves the stored value unchanged.
+
+        Parameters
+        ----------
+        tx : neo4j.Transaction
+            The transaction context to run the query.
+        processes : list
+            Property dictionaries as returned by `aggregate_biological_processes`.
+
+        Returns
+        -------
+        int
+            The number of created nodes.
+        """
+        rows = [{'goTerm': process['goTerm'], 'attributes': {**process, 'uuid': generate_uuid()}} for process in processes]
+        appended = [
+            prop for col, prop in BIOLOGICAL_PROCESS_PROPERTY_MAPPING.items()
+            if col not in BIOLOGICAL_PROCESS_KEY_COLUMNS
+        ]
+        on_match = ', '.join(
+            f"b.{prop} = CASE WHEN b.{prop} IS NULL THEN row.attributes.{prop} "
+            f"WHEN row.attributes.{prop} IS NULL THEN b.{prop} "
+            f"ELSE b.{prop} + ', ' + row.attributes.{prop} END"
+            for prop in appended
+        )
+        merge_query = (
+            "UNWIND $rows AS row "
+            "MERGE (b:BiologicalProcess {goTerm: row.goTerm}) "
+            "ON CREATE SET b += row.attributes "
+            f"ON MATCH SET {on_match}"
+        )
+        result = tx.run(merge_query, rows=rows)
+        return result.consume().counters.nodes_created
+
+    def add_biological_process_annotations(self, data, batch_size=DEFAULT_PROCESS_BATCH_SIZE):
+        """
+        Add biological processes with their annotations stored as a graph instead of joined strings.
+
+        Every GO term becomes a BiologicalProcess node holding only its own properties, every gene
+        product a GeneProduct node, and every distinct annotation an ANNOTATED_TO relationship from
+        the gene product to the process carrying the evidence (qualifier, ECO ID, evidence code,
+        reference, ...). All writes are batched UNWIND MERGEs, so the cost is linear in the number
+        of annotations and running the ingest again does not change the graph.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame containing biological process data.
+        batch_size : int
+            The maximum number of rows per UNWIND transaction.
+
+        Returns
+        -------
+        dict
+            The number of 'processes', 'gene_products' and 'annotations' written, and the
+            'nodes_created' and 'relationships_created' by this run.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+        logging.info("Starting to add biological processes with GeneProduct annotations to Neo4j.")
+        rows = build_annotation_rows(data)
+        totals = {
+            'processes': len(rows['processes']),
+            'gene_products': len(rows['gene_products']),
+            'annotations': len(rows['annotations']),
+            'nodes_created': 0,
+            'relationships_created': 0,
+        }
+        writes = [
+            (self._merge_process_node_batch, rows['processes'], 'nodes_created', 'BiologicalProcess writer'),
+            (self._merge_gene_product_batch, rows['gene_products'], 'nodes_created', 'GeneProduct writer'),
+            (self._merge_annotation_batch, rows['annotations'], 'relationships_created', 'ANNOTATED_TO writer'),
+        ]
+        # The writers run one after the other, the annotations need both of their end nodes
+        for write_batch, items, counter, name in writes:
+            with BatchWriter(self.driver, work=write_batch, batch_size=batch_size, name=name) as writer:
+                writer.write(items)
+            totals[counter] += writer.totals.get('written', 0)
+
+        logging.info(
+            f"Finished adding {totals['processes']} biological processes, {totals['gene_products']} gene products "
+            f"and {totals['annotations']} annotations. Nodes created: {totals['nodes_created']}, "
+            f"relationships created: {totals['relationships_created']}"
+        )
+        return totals
+
+    def add_biological_process_chunks(self, chunks, mode='aggregated'):
+        """
+        Add biological processes from a stream of annotation DataFrames, one chunk at a time.
+
+        All storage modes give the same result for chunked and for whole input: the string modes
+        append the values of later chunks to the existing nodes, the 'nodes' mode merges.
+
+        Parameters
+        ----------
+        chunks : iterable
+            DataFrames in the ARUK-UCL layout, e.g. from `iter_annotation_chunks`.
+        mode : str
+            The storage mode, one of `ANNOTATION_STORAGE_MODES`, see `add_arukucl_to_neo4j_db`.
+
+        Returns
+        -------
+        int
+            The number of annotation rows passed to Neo4j.
+        """
+        write_chunk = {
+            'rows': self.add_biological_process,
+            'aggregated': self.add_biological_process_aggregated,
+            'nodes': self.add_biological_process_annotations,
+        }.get(mode)
+        if write_chunk is None:
+            raise ValueError(f"Unknown annotation storage mode '{mode}', expected one of {', '.join(ANNOTATION_STORAGE_MODES)}")
+
+        annotations = 0
+        for chunk in chunks:
+            write_chunk(chunk)
+            annotations += len(chunk)
+            logging.info(f"Added {annotations} annotations to Neo4j so far")
+        return annotations
+
+    @staticmethod
+    def _merge_process_node_batch(tx, processes):
+        """
+        Create a batch of BiologicalProcess nodes without annotation properties.
+
+        Returns
+        -------
+        int
+            The number of created nodes.
+        """
+        rows = [{'goTerm': process['goTerm'], 'uuid': generate_uuid(), 'properties': process} for process in processes]
+        result = tx.run(
+            "UNWIND $rows AS row "
+            "MERGE (b:BiologicalProcess {goTerm: row.goTerm}) "
+            "ON CREATE SET b.uuid = row.uuid "
+            "SET b += row.properties",
+            rows=rows,
+        )
+        return result.consume().counters.nodes_created
+
+    @staticmethod
+    def _merge_gene_product_batch(tx, gene_products):
+        """
+        Create or update a batch of GeneProduct nodes.
+
+        Returns
+        -------
+        int
+            The number of created nodes.
+        """
+        rows = [
+            {'geneProductId': product['geneProductId'], 'uuid': generate_uuid(), 'properties': product}
+            for product in gene_products
+        ]
+        result = tx.run(
+            "UNWIND $rows AS row "
+            "MERGE (g:GeneProduct {geneProductId: row.geneProductId}) "
+            "ON CREATE SET g.uuid = row.uuid "
+            "SET g += row.properties",
+            rows=rows,
+        )
+        return result.consume().counters.nodes_created
+
+    @staticmethod
+    def _merge_annotation_batch(tx, annotations):
+        """
+        Create a batch of ANNOTATED_TO relationships between GeneProduct and BiologicalProcess nodes.
+
+        The evidence properties are part of the MERGE pattern, so an annotation that already exists
+        is matched instead of written again.
+
+        Returns
+        -------
+        int
+            The number of created relationships.
+        """
+        keys = ', '.join(f"{prop}: row.properties.{prop}" for prop in ANNOTATION_PROPERTY_MAPPING.values())
+        result = tx.run(
+            "UNWIND $rows AS row "
+            "MATCH (g:GeneProduct {geneProductId: row.geneProductId}) "
+            "MATCH (b:BiologicalProcess {goTerm: row.goTerm}) "
+            f"MERGE (g)-[:ANNOTATED_TO {{{keys}}}]->(b)",
+            rows=annotations,
+        )
+        return result.consume().counters.relationships_created
+
     @staticmethod
     
     def _create_or_update_biological_process(tx, row):
@@ -100,22 +519,7 @@ class Neo4jConnectionExtended(Neo4jConnection):
             The created biological process node.
         """
         # Mapping of DataFrame column names to Neo4j property names
-        property_mapping = {
-            'GENE PRODUCT DB': 'geneProductDb',
-            'GENE PRODUCT ID': 'geneProductId',
-            'SYMBOL': 'symbol',  # this property needs renaming - but first we need to find out what it actually means
-            'QUALIFIER': 'qualifier',
-            'GO TERM': 'goTerm',
-            'GO NAME': 'goName',
-            'ECO ID': 'ecoId',
-            'GO EVIDENCE CODE': 'goEvidenceCode',
-            'REFERENCE': 'reference',
-            'WITH/FROM': 'withFrom',
-            'TAXON ID': 'taxonId',
-            'ASSIGNED BY': 'assignedBy',
-            'ANNOTATION EXTENSION': 'annotationExtension',
-            'GO ASPECT': 'goAspect',
-        }
+        property_mapping = BIOLOGICAL_PROCESS_PROPERTY_MAPPING
 
         # Create the attributes dictionary based on the mapping
         attributes = {}
@@ -183,9 +587,77 @@ class Neo4jConnectionExtended(Neo4jConnection):
     
 
 
-def add_arukucl_to_neo4j_db():
+def _split_env_list(name):
+    """
+    Return the comma-separated values of an environment variable, or None if it is not set.
+    """
+    value = os.getenv(name)
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def filter_and_add_arukucl(neo4j_conn, input_path, mode='aggregated', aspects=('P',), evidence_codes=None, taxa=None,
+                           filtered_output_path=None, chunksize=None):
+    """
+    Filter the ARUK-UCL annotations and add them to Neo4j in one streaming pass.
+
+    This fuses `filter_for_biological_processes` with the ingest: the annotations are filtered
+    chunk by chunk while they are read and handed straight to the Neo4j writer, without writing
+    and re-reading the filtered TSV. The filtered TSV can still be kept as an artifact.
+
+    Parameters
+    ----------
+    neo4j_conn : Neo4jConnectionExtended
+        The connection used for writing.
+    input_path : str
+        The unfiltered annotation file, a QuickGO TSV or a GAF file, optionally gzip-compressed.
+    mode : str
+        The storage mode, one of `ANNOTATION_STORAGE_MODES`, see `add_arukucl_to_neo4j_db`.
+    aspects, evidence_codes, taxa : iterable, optional
+        The predicates of `filter_annotations`. By default only biological processes are kept.
+    filtered_output_path : str, optional
+        Also write the filtered annotations to this TSV file.
+    chunksize : int, optional
+        The number of annotation rows per chunk, defaults to the reader's default.
+
+    Returns
+    -------
+    int
+        The number of annotations added.
+    """
+    reader_options = {'chunksize': chunksize} if chunksize else {}
+    chunks = iter_annotation_chunks(input_path, aspects=aspects, evidence_codes=evidence_codes, taxa=taxa, **reader_options)
+    if filtered_output_path:
+        chunks = write_annotation_chunks(chunks, filtered_output_path)
+    logging.info(
+        f"Filtering {input_path} (aspects: {aspects}, evidence codes: {evidence_codes}, taxa: {taxa}) "
+        f"and adding the annotations to Neo4j."
+    )
+    return neo4j_conn.add_biological_process_chunks(chunks, mode=mode)
+
+
+def add_arukucl_to_neo4j_db(mode=None):
     """
     Function that adds biological processes selected by ARUK-UCL to a Neo4j database.
+
+    Parameters
+    ----------
+    mode : str
+        How the annotations are stored, one of `ANNOTATION_STORAGE_MODES`:
+        'rows' writes every annotation row on its own (`add_biological_process`),
+        'aggregated' groups the annotations by GO term and writes them in batches
+        (`add_biological_process_aggregated`), both joining the annotation values into strings;
+        'nodes' stores them as GeneProduct nodes and ANNOTATED_TO relationships
+        (`add_biological_process_annotations`). If None, the environment variable
+        'ARUK_UCL_ANNOTATION_MODE' is used, and 'aggregated' if that is not set either.
+
+    The unfiltered annotation file 'input_path_arukucl' is filtered and ingested in one pass
+    with `filter_and_add_arukucl`, so running `filter_arukucl_for_bioprocess.py` first is not
+    needed. It may also be a gzip-compressed TSV or a GAF file such as goa_human.gaf.gz.
+    The predicates are read from the environment variables 'ARUK_UCL_ASPECTS' (default 'P'),
+    'ARUK_UCL_EVIDENCE_CODES' and 'ARUK_UCL_TAXA', comma-separated. If 'output_path_arukucl'
+    is set, the filtered annotations are also written to that TSV file.
     """
     #### ADD only if the node is not already there - this should be based on the GO ID 
     ### The GO ID is the relevant factor that determines, if the data point is already in there
@@ -193,19 +665,18 @@ def add_arukucl_to_neo4j_db():
 
     setup_environment()
     setup_logging()
-    
-    filtered_arukucl_path = os.getenv('BIOPROCESS_ARUK_UCL_GO_TERMS_TSV')
-    if not filtered_arukucl_path:
-        logging.error("The environment variable 'BIOPROCESS_ARUK_UCL_GO_TERMS_TSV' is not set")
+
+    if mode is None:
+        mode = os.getenv('ARUK_UCL_ANNOTATION_MODE', 'aggregated')
+    if mode not in ANNOTATION_STORAGE_MODES:
+        logging.error(f"Unknown annotation storage mode '{mode}', expected one of {', '.join(ANNOTATION_STORAGE_MODES)}")
         return
-    
-    try:
-        logging.info(f"Loading data from {filtered_arukucl_path}")
-        data = pd.read_csv(filtered_arukucl_path, sep='\t')
-    except Exception as e:
-        logging.error(f"Failed to load data from {filtered_arukucl_path}: {e}")
+
+    arukucl_path = os.getenv('input_path_arukucl', 'datasets/ARUK-UCL-GO-terms.tsv')
+    if not os.path.exists(arukucl_path):
+        logging.error(f"Failed to load data from {arukucl_path}: file not found")
         return
-    
+
     try:
         logging.info("Initializing Neo4j connection.")
         neo4j_conn = Neo4jConnectionExtended(
@@ -219,7 +690,14 @@ def add_arukucl_to_neo4j_db():
         return
 
     try:
-        neo4j_conn.add_biological_process(data)
+        neo4j_conn.ensure_schema()
+        filter_and_add_arukucl(
+            neo4j_conn, arukucl_path, mode=mode,
+            aspects=_split_env_list('ARUK_UCL_ASPECTS') or ['P'],
+            evidence_codes=_split_env_list('ARUK_UCL_EVIDENCE_CODES'),
+            taxa=_split_env_list('ARUK_UCL_TAXA'),
+            filtered_output_path=os.getenv('output_path_arukucl'),
+        )
     except Exception as e:
         logging.error(f'Failed to add biological processes to Neo4j: {e}')
     finally:
@@ -3,6 +3,16 @@ import sys
 from lxml import etree
 import logging
 import uuid
+import queue
+import threading
+import time
+import io
+import re
+import mmap
+import json
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the project root to sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -11,87 +21,277 @@ sys.path.insert(0, project_root)
 from src_pub.utils.logging_config import setup_logging
 from src_pub.utils.conn_neo4j import Neo4jConnection
 from src_pub.utils.uuid_util import generate_uuid
+from src_pub.db_entry.drugbank_fields import DRUG_FIELD_SPEC, DRUG_PROTEIN_FIELD_SPEC, DrugFieldExtractor
+from src_pub.db_entry.drugbank_cache import load_or_build_drug_cache
+
+# Streaming configuration
+DEFAULT_QUEUE_SIZE = 1000  # High-water mark of parsed drugs waiting to be written
+QUEUE_PUT_TIMEOUT = 1  # Seconds between checks whether the writer aborted
+
+# Marks the end of the parsed drug stream in the queue
+_END_OF_STREAM = object()
+
+# Write configuration
+DEFAULT_BATCH_SIZE = 500  # Drugs per UNWIND transaction, tune with the per-batch throughput logs
+
+# Relationship types between Drug and Protein nodes per interaction kind
+PROTEIN_RELATIONSHIP_TYPES = {
+    'target': 'HAS_TARGET',
+    'enzyme': 'HAS_ENZYME',
+    'carrier': 'HAS_CARRIER',
+    'transporter': 'HAS_TRANSPORTER',
+}
+
+# Properties that do not describe the DrugBank content of a drug
+HASH_EXCLUDED_PROPERTIES = ('uuid', 'contentHash')
+
+
+def compute_content_hash(drug_properties):
+    """
+    Computes a stable hash over the DrugBank-derived properties of a drug.
+
+    The UUID and the hash itself are excluded, so the same record always yields the same hash.
+
+    Args:
+        drug_properties (dict): Drug node properties as returned by `DrugBank2Neo4j.drug_to_properties`.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the canonical JSON serialisation.
+    """
+    content = {key: value for key, value in drug_properties.items() if key not in HASH_EXCLUDED_PROPERTIES}
+    serialised = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(serialised.encode('utf-8')).hexdigest()
+
+
+def iter_batches(iterable, batch_size):
+    """
+    Groups the items of an iterable into lists of at most `batch_size` items.
+
+    Args:
+        iterable (iterable): The items to group.
+        batch_size (int): The maximum number of items per batch.
+
+    Yields:
+        list: The next batch of items.
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# Parallel parsing configuration
+SHARDS_PER_WORKER = 4  # More shards than workers keep all cores busy until the end
+MAX_SHARD_BYTES = 32 * 1024 * 1024  # Larger releases are split into more shards, bounding the records per shard
+ROOT_TAG_SCAN_BYTES = 64 * 1024  # The <drugbank> start tag is expected within the first bytes
+
+_DRUG_TAG_PATTERN = re.compile(rb'<drug[\s>/]|</drug>')
+_ROOT_TAG_PATTERN = re.compile(rb'<drugbank[\s>][^>]*>')
+
+
+def scan_drug_offsets(input_file_path):
+    """
+    Scans the DrugBank XML file for the byte ranges of its top-level drug elements.
+
+    Drug elements nested inside other drugs (e.g. in pathways) are part of the range of
+    their enclosing top-level drug.
+
+    Args:
+        input_file_path (str): The path to the DrugBank XML file.
+
+    Returns:
+        tuple: The raw `<drugbank ...>` start tag (bytes) and a list of (start, end) byte offsets.
+    """
+    logging.info(f"Scanning {input_file_path} for top-level drug elements.")
+    drug_ranges = []
+    with open(input_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        root_match = _ROOT_TAG_PATTERN.search(data, 0, ROOT_TAG_SCAN_BYTES)
+        if root_match is None:
+            raise ValueError(f"No <drugbank> root element found in the first {ROOT_TAG_SCAN_BYTES} bytes of {input_file_path}")
+        root_start_tag = root_match.group(0)
+
+        depth = 0
+        start = None
+        for match in _DRUG_TAG_PATTERN.finditer(data, root_match.end()):
+            if match.group(0) == b'</drug>':
+                depth -= 1
+                if depth == 0:
+                    drug_ranges.append((start, match.end()))
+                continue
+
+            tag_end = data.find(b'>', match.start())
+            if data[tag_end - 1:tag_end] == b'/':
+                # Self-closing drug element
+                if depth == 0:
+                    drug_ranges.append((match.start(), tag_end + 1))
+                continue
+            if depth == 0:
+                start = match.start()
+            depth += 1
+
+    logging.info(f"Found {len(drug_ranges)} top-level drug elements.")
+    return root_start_tag, drug_ranges
+
+
+def split_into_shards(drug_ranges, shard_count):
+    """
+    Splits consecutive drug byte ranges into at most `shard_count` contiguous shards of similar size.
+
+    Args:
+        drug_ranges (list): The (start, end) byte offsets returned by `scan_drug_offsets`.
+        shard_count (int): The desired number of shards.
+
+    Returns:
+        list: The (start, end) byte offsets of each shard, in file order.
+    """
+    if not drug_ranges:
+        return []
+    total_bytes = drug_ranges[-1][1] - drug_ranges[0][0]
+    target_bytes = max(total_bytes // max(shard_count, 1), 1)
+
+    shards = []
+    shard_start = None
+    for start, end in drug_ranges:
+        if shard_start is None:
+            shard_start = start
+        if end - shard_start >= target_bytes:
+            shards.append((shard_start, end))
+            shard_start = None
+    if shard_start is not None:
+        shards.append((shard_start, drug_ranges[-1][1]))
+    return shards
+
+
+def _parse_drug_shard(input_file_path, namespace, root_start_tag, start, end, with_proteins=False):
+    """
+    Parses the drugs in one byte range of the DrugBank XML file. Runs in a worker process.
+
+    The range is wrapped in the original `<drugbank>` start tag so that namespaces resolve
+    exactly as they do in the full document.
+
+    Returns:
+        list: A list of dictionaries, each containing information about a drug, or of
+            (drug, protein interactions) tuples if `with_proteins` is set.
+    """
+    with open(input_file_path, 'rb') as f:
+        f.seek(start)
+        fragment = f.read(end - start)
+    document = io.BytesIO(root_start_tag + fragment + b'</drugbank>')
+    parser = DrugBank2Neo4j(input_file_path, namespace, configure_logging=False)
+    return list(parser.iter_drugbank_xml(source=document, with_proteins=with_proteins))
+
 
 class DrugBank2Neo4j:
-    def __init__(self, input_file_path, namespace):
+    def __init__(self, input_file_path, namespace, configure_logging=True):
         """
         Initialize the DrugBank2Neo4j class.
 
         Args:
             input_file_path (str): The path to the DrugBank XML file.
             namespace (dict): The namespace dictionary for parsing the XML.
+            configure_logging (bool): Whether to set up the pipeline logging. Disabled in
+                worker processes, which inherit the logging of the parent process.
         """
         self.input_file_path = input_file_path
         self.namespace = namespace
-        setup_logging(log_file_prefix="logs/drugbank_pipeline", processed_file="drugbank_full_dataset")
+        self.field_extractor = DrugFieldExtractor(DRUG_FIELD_SPEC, namespace)
+        self.protein_extractor = DrugFieldExtractor(DRUG_PROTEIN_FIELD_SPEC, namespace)
+        if configure_logging:
+            setup_logging(log_file_prefix="logs/drugbank_pipeline", processed_file="drugbank_full_dataset")
 
     def extract_drug_info(self, drug_elem):
         """
         Extracts drug information from an XML element.
 
+        The extracted fields are declared in `DRUG_FIELD_SPEC` and compiled once per instance.
+
         Args:
             drug_elem (etree.Element): The XML element representing a drug.
 
         Returns:
             dict: A dictionary containing extracted drug information.
         """
-        def get_text(element, default=''):
-            return element.text if element is not None else default
+        return self.field_extractor(drug_elem)
 
-        go_classifiers_info = []
-        for go in drug_elem.findall('.//{http://www.drugbank.ca}go-classifier'):
-            go_classifiers_info.append({
-                'Category': get_text(go.find('db:category', namespaces=self.namespace)),
-                'Description': get_text(go.find('db:description', namespaces=self.namespace))
-            })
+    def extract_protein_interactions(self, drug_elem, drugbank_id):
+        """
+        Extracts the targets, enzymes, carriers and transporters of a drug from an XML element.
 
-        classification_elem = drug_elem.find('db:classification', namespaces=self.namespace)
-        classification_info = {
-            'Direct Parent': get_text(classification_elem.find('db:direct-parent', namespaces=self.namespace)),
-            'Kingdom': get_text(classification_elem.find('db:kingdom', namespaces=self.namespace)),
-            'Superclass': get_text(classification_elem.find('db:superclass', namespaces=self.namespace)),
-            'Class': get_text(classification_elem.find('db:class', namespaces=self.namespace)),
-        } if classification_elem is not None else {}
-
-        drug_info = {
-            'DrugBank ID': get_text(drug_elem.find('db:drugbank-id', namespaces=self.namespace)),
-            'Name': get_text(drug_elem.find('db:name', namespaces=self.namespace)),
-            'Description': get_text(drug_elem.find('db:description', namespaces=self.namespace)),
-            'GO Classifiers': go_classifiers_info,
-            'Simple Description': get_text(drug_elem.find('db:simple-description', namespaces=self.namespace)),
-            'Clinical Description': get_text(drug_elem.find('db:clinical-description', namespaces=self.namespace)),
-            'Therapeutically Significant': get_text(drug_elem.find('db:therapeutically-significant', namespaces=self.namespace)),
-            'Affected Organisms': [org.text for org in drug_elem.findall('db:affected-organisms/db:affected-organism', namespaces=self.namespace)],
-            'Indication': get_text(drug_elem.find('db:indication', namespaces=self.namespace)),
-            'Pharmacodynamics': get_text(drug_elem.find('db:pharmacodynamics', namespaces=self.namespace)),
-            'Mechanism of Action': get_text(drug_elem.find('db:mechanism-of-action', namespaces=self.namespace)),
-            'Direct Parent': classification_info.get('Direct Parent', ''),
-            'Kingdom': classification_info.get('Kingdom', ''),
-            'Superclass': classification_info.get('Superclass', ''),
-            'Class': classification_info.get('Class', ''),
-        }
-        return drug_info
+        Args:
+            drug_elem (etree.Element): The XML element representing a drug.
+            drugbank_id (str): The DrugBank ID of the drug, stored on every interaction.
 
-    def parse_drugbank_xml(self):
+        Returns:
+            list: One dictionary per interacting polypeptide with the keys 'DrugBank ID', 'Kind'
+                ('target', 'enzyme', 'carrier' or 'transporter'), 'Position', 'Actions',
+                'Known Action' and 'Protein' (the polypeptide fields of `POLYPEPTIDE_FIELD_SPEC`).
+                Entries without a polypeptide, e.g. DNA targets, are skipped.
         """
-        Parses the DrugBank XML file and extracts drug information.
+        interactions = []
+        for kind, entries in self.protein_extractor(drug_elem).items():
+            for entry in entries:
+                for polypeptide in entry['Polypeptides']:
+                    interactions.append({
+                        'DrugBank ID': drugbank_id,
+                        'Kind': kind,
+                        'Position': entry['Position'],
+                        'Actions': entry['Actions'],
+                        'Known Action': entry['Known Action'],
+                        'Protein': polypeptide,
+                    })
+        return interactions
+
+    def extract_drug_entities(self, drug_elem):
+        """
+        Extracts a drug and its protein interactions from an XML element in one pass.
 
         Returns:
-            list: A list of dictionaries, each containing information about a drug.
+            tuple: The result of `extract_drug_info` and of `extract_protein_interactions`.
+        """
+        drug_info = self.extract_drug_info(drug_elem)
+        return drug_info, self.extract_protein_interactions(drug_elem, drug_info['DrugBank ID'])
+
+    def iter_drugbank_xml(self, source=None, with_proteins=False):
+        """
+        Lazily parses the DrugBank XML file and yields drug information one drug at a time.
+
+        Only top-level drug elements are extracted, like in `scan_drug_offsets`; the drug stubs
+        nested in pathways are skipped.
+
+        Processed elements are cleared as soon as they have been extracted, so memory usage
+        stays flat regardless of the size of the DrugBank release.
+
+        Args:
+            source (str or file-like, optional): The XML to parse. Defaults to `input_file_path`.
+            with_proteins (bool): Also extract the protein interactions of every drug in the same pass.
+
+        Yields:
+            dict: A dictionary containing information about a single drug, or a tuple of that
+                dictionary and its protein interactions if `with_proteins` is set.
         """
+        if source is None:
+            source = self.input_file_path
+        extract = self.extract_drug_entities if with_proteins else self.extract_drug_info
         try:
-            logging.info(f"Starting to parse the XML file: {self.input_file_path}")
-            context = etree.iterparse(self.input_file_path, events=('end',), tag='{http://www.drugbank.ca}drug')
-            logging.info(f"XML file parsed successfully.")
+            logging.info(f"Starting to parse the XML file: {source}")
+            context = etree.iterparse(source, events=('end',), tag='{http://www.drugbank.ca}drug')
+            logging.info(f"XML file opened for incremental parsing.")
 
             count = 0
-            drug_details = []
 
             for event, elem in context:
+                parent = elem.getparent()
+                if parent is None or parent.getparent() is not None:
+                    # Drugs nested in other drugs (e.g. pathway drugs) only carry an ID and a name;
+                    # they are cleared together with their top-level drug
+                    continue
+                drug_info = None
                 try:
                     if elem.find('db:drugbank-id', namespaces=self.namespace) is not None:
-                        drug_info = self.extract_drug_info(elem)
-                        drug_details.append(drug_info)
+                        drug_info = extract(elem)
                         count += 1
                         if count % 5 == 0:
                             logging.info(f"Processed {count} drugs: {drug_info}")
@@ -104,20 +304,114 @@ class DrugBank2Neo4j:
                 except Exception as e:
                     logging.error(f"Error processing drug element: {e}")
 
+                if drug_info is not None:
+                    yield drug_info
+
             logging.info(f"Total drugs processed: {count}")
-            return drug_details
 
         except Exception as e:
             logging.error(f"Failed to parse the XML file: {e}")
             raise
 
-    def add_drug_to_neo4j(self, tx, drug):
+    def parse_drugbank_xml(self, cache_dir=None, parse_workers=None):
         """
-        Adds drug information to the Neo4j database.
+        Parses the DrugBank XML file and extracts drug information.
 
         Args:
-            tx (neo4j.Transaction): The Neo4j transaction object.
-            drug (dict): A dictionary containing drug information to be added to the database.
+            cache_dir (str, optional): Directory of the columnar parse cache. If given, the records
+                are loaded from the cache when the XML file is unchanged, and cached otherwise.
+            parse_workers (int, optional): Parse the XML in this many processes instead of sequentially.
+
+        Returns:
+            list: A list of dictionaries, each containing information about a drug.
+        """
+        if cache_dir is None:
+            return list(self._iter_drugs(parse_workers))
+        return load_or_build_drug_cache(self.input_file_path, cache_dir, lambda: list(self._iter_drugs(parse_workers)))
+
+    def iter_drugbank_xml_parallel(self, max_workers=None, shards_per_worker=SHARDS_PER_WORKER, with_proteins=False):
+        """
+        Parses the DrugBank XML file in worker processes and yields drug information in file order.
+
+        The file is pre-scanned for the byte ranges of the top-level drug elements, which are
+        split into shards of at most about `MAX_SHARD_BYTES` and parsed by a `ProcessPoolExecutor`.
+        Only `max_workers + 1` shards are submitted at a time, and a shard's records are released
+        once they have been yielded, so memory is bounded by the shard window and not by the size
+        of the release. Shards are yielded in file order, so the output is identical to
+        `iter_drugbank_xml`.
+
+        Args:
+            max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            shards_per_worker (int): The minimum number of shards per worker; more shards balance the
+                load better.
+            with_proteins (bool): Also extract the protein interactions, see `iter_drugbank_xml`.
+
+        Yields:
+            dict: A dictionary containing information about a single drug.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        root_start_tag, drug_ranges = scan_drug_offsets(self.input_file_path)
+        total_bytes = drug_ranges[-1][1] - drug_ranges[0][0] if drug_ranges else 0
+        shard_count = max(max_workers * shards_per_worker, -(-total_bytes // MAX_SHARD_BYTES))
+        shards = split_into_shards(drug_ranges, shard_count)
+        logging.info(f"Parsing {len(drug_ranges)} top-level drug elements in {len(shards)} shards with {max_workers} worker processes.")
+
+        count = 0
+        pending = deque()
+        next_shards = iter(shards)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            def submit_next():
+                shard = next(next_shards, None)
+                if shard is not None:
+                    pending.append(executor.submit(
+                        _parse_drug_shard, self.input_file_path, self.namespace, root_start_tag, *shard, with_proteins))
+
+            # One shard more than workers keeps every worker busy while the results are consumed
+            for _ in range(max_workers + 1):
+                submit_next()
+            shard_index = 0
+            while pending:
+                drug_details = pending.popleft().result()
+                submit_next()
+                shard_index += 1
+                count += len(drug_details)
+                logging.info(f"Shard {shard_index}/{len(shards)} parsed: {len(drug_details)} drugs, {count} in total.")
+                yield from drug_details
+                del drug_details
+
+        logging.info(f"Total drugs processed: {count}")
+
+    def parse_drugbank_xml_parallel(self, max_workers=None, shards_per_worker=SHARDS_PER_WORKER):
+        """
+        Parses the DrugBank XML file in worker processes and extracts drug information.
+
+        Args:
+            max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            shards_per_worker (int): Shards per worker.
+
+        Returns:
+            list: A list of dictionaries, each containing information about a drug, in file order.
+        """
+        return list(self.iter_drugbank_xml_parallel(max_workers=max_workers, shards_per_worker=shards_per_worker))
+
+    def _iter_drugs(self, parse_workers=None, with_proteins=False):
+        """
+        Yields the drugs of the XML file, parsed sequentially or in `parse_workers` processes.
+        """
+        if parse_workers and parse_workers > 1:
+            return self.iter_drugbank_xml_parallel(max_workers=parse_workers, with_proteins=with_proteins)
+        return self.iter_drugbank_xml(with_proteins=with_proteins)
+
+    @staticmethod
+    def drug_to_properties(drug):
+        """
+        Maps an extracted drug dictionary onto the property names of a Drug node.
+
+        Args:
+            drug (dict): A dictionary containing drug information as returned by `extract_drug_info`.
+
+        Returns:
+            dict: The Drug node properties, including a freshly generated UUID and the content hash.
         """
         go_descriptions = drug.get('GO Classifiers', [])
         go_terms = [term for desc in go_descriptions for term in desc['Description'].split('; ')]
@@ -139,6 +433,18 @@ class DrugBank2Neo4j:
             'superclass': drug.get('Superclass', ''),
             'class': drug.get('Class', ''),
         }
+        drug_properties['contentHash'] = compute_content_hash(drug_properties)
+        return drug_properties
+
+    def add_drug_to_neo4j(self, tx, drug):
+        """
+        Adds drug information to the Neo4j database.
+
+        Args:
+            tx (neo4j.Transaction): The Neo4j transaction object.
+            drug (dict): A dictionary containing drug information to be added to the database.
+        """
+        drug_properties = self.drug_to_properties(drug)
 
         logging.info(f"Adding drug to Neo4j with properties: {drug_properties}")
 
@@ -158,26 +464,452 @@ class DrugBank2Neo4j:
                 d.directParent = $directParent,
                 d.kingdom = $kingdom,
                 d.superclass = $superclass,
-                d.class = $class
+                d.class = $class,
+                d.contentHash = $contentHash
         """, **drug_properties)
 
         counters = result.consume().counters
         logging.debug(f"Result from Neo4j: nodes created: {counters.nodes_created}, relationships created: {counters.relationships_created}, properties set: {counters.properties_set}")
 
-    def run_pipeline(self):
+    def add_drug_batch_to_neo4j(self, tx, drugs):
+        """
+        Adds a batch of drugs to the Neo4j database with a single UNWIND query.
+
+        Args:
+            tx (neo4j.Transaction): The Neo4j transaction object.
+            drugs (list): A list of dictionaries containing drug information to be added to the database.
+
+        Returns:
+            dict: The counters and server timings reported for the batch.
+        """
+        batch = [self.drug_to_properties(drug) for drug in drugs]
+
+        result = tx.run("""
+            UNWIND $batch AS row
+            MERGE (d:Drug {drugbankId: row.drugbankId})
+            ON CREATE SET
+                d.uuid = row.uuid,
+                d.name = row.name,
+                d.description = row.description,
+                d.simpleDescription = row.simpleDescription,
+                d.clinicalDescription = row.clinicalDescription,
+                d.therapeuticallySignificant = row.therapeuticallySignificant,
+                d.indication = row.indication,
+                d.pharmacodynamics = row.pharmacodynamics,
+                d.mechanismOfAction = row.mechanismOfAction,
+                d.affectedGoProcess = row.affectedGoProcess,
+                d.directParent = row.directParent,
+                d.kingdom = row.kingdom,
+                d.superclass = row.superclass,
+                d.class = row.class,
+                d.contentHash = row.contentHash
+        """, batch=batch)
+
+        summary = result.consume()
+        counters = summary.counters
+        return {
+            'drugs': len(batch),
+            'nodes_created': counters.nodes_created,
+            'properties_set': counters.properties_set,
+            'result_available_after': summary.result_available_after,
+            'result_consumed_after': summary.result_consumed_after,
+        }
+
+    def write_drugs_in_batches(self, session, drugs, batch_size=DEFAULT_BATCH_SIZE, write_batch=None):
+        """
+        Writes drugs to Neo4j in batches, one transaction per batch.
+
+        Logs the counters and the throughput of every batch so that the batch size can be
+        tuned for the server at hand.
+
+        Args:
+            session (neo4j.Session): The Neo4j session used for writing.
+            drugs (iterable): An iterable of drug dictionaries, e.g. a list or a generator.
+            batch_size (int): The number of drugs sent per UNWIND transaction.
+            write_batch (callable, optional): The transaction function writing one batch.
+                Defaults to `add_drug_batch_to_neo4j`.
+
+        Returns:
+            dict: Totals over all batches ('batches', 'drugs', 'nodes_created', 'properties_set', 'seconds').
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+        write_batch = write_batch or self.add_drug_batch_to_neo4j
+
+        totals = {'batches': 0, 'drugs': 0, 'nodes_created': 0, 'properties_set': 0, 'seconds': 0.0}
+        for batch in iter_batches(drugs, batch_size):
+            start = time.perf_counter()
+            stats = session.execute_write(write_batch, batch)
+            elapsed = max(time.perf_counter() - start, 1e-9)
+
+            totals['batches'] += 1
+            totals['drugs'] += stats['drugs']
+            totals['nodes_created'] += stats['nodes_created']
+            totals['properties_set'] += stats['properties_set']
+            totals['seconds'] += elapsed
+            logging.info(
+                f"Batch {totals['batches']}: {stats['drugs']} drugs, nodes created: {stats['nodes_created']}, "
+                f"properties set: {stats['properties_set']}, server time: {stats['result_available_after']} ms + "
+                f"{stats['result_consumed_after']} ms, {stats['drugs'] / elapsed:.1f} drugs/sec"
+            )
+
+        if totals['seconds'] > 0:
+            logging.info(
+                f"Wrote {totals['drugs']} drugs in {totals['batches']} batches of up to {batch_size}, "
+                f"nodes created: {totals['nodes_created']}, {totals['drugs'] / totals['seconds']:.1f} drugs/sec overall"
+            )
+        return totals
+
+    @staticmethod
+    def protein_to_properties(protein):
+        """
+        Maps an extracted polypeptide dictionary onto the property names of a Protein node.
+
+        Args:
+            protein (dict): A polypeptide as extracted with `POLYPEPTIDE_FIELD_SPEC`.
+
+        Returns:
+            dict: The Protein node properties, including a freshly generated UUID. GO classifiers
+                are split by category into goProcess, goFunction and goComponent lists.
+        """
+        go_terms = {'process': [], 'function': [], 'component': []}
+        for classifier in protein.get('GO Classifiers', []):
+            category = (classifier.get('Category') or '').strip().lower()
+            if category in go_terms and classifier.get('Description'):
+                go_terms[category].append(classifier['Description'])
+
+        return {
+            'uuid': generate_uuid(),
+            'uniprotId': protein.get('UniProt ID', ''),
+            'source': protein.get('Source', ''),
+            'name': protein.get('Name', ''),
+            'geneName': protein.get('Gene Name', ''),
+            'organism': protein.get('Organism', ''),
+            'generalFunction': protein.get('General Function', ''),
+            'specificFunction': protein.get('Specific Function', ''),
+            'cellularLocation': protein.get('Cellular Location', ''),
+            'goProcess': go_terms['process'],
+            'goFunction': go_terms['function'],
+            'goComponent': go_terms['component'],
+        }
+
+    @staticmethod
+    def add_protein_batch_to_neo4j(tx, batch):
+        """
+        Creates or updates a batch of Protein nodes with a single UNWIND query.
+
+        Args:
+            tx (neo4j.Transaction): The Neo4j transaction object.
+            batch (list): Protein node properties as returned by `protein_to_properties`.
+
+        Returns:
+            int: The number of created Protein nodes.
+        """
+        rows = [
+            {
+                'uniprotId': properties['uniprotId'],
+                'uuid': properties['uuid'],
+                'properties': {key: value for key, value in properties.items() if key != 'uuid'},
+            }
+            for properties in batch
+        ]
+        result = tx.run("""
+            UNWIND $rows AS row
+            MERGE (p:Protein {uniprotId: row.uniprotId})
+            ON CREATE SET p.uuid = row.uuid
+            SET p += row.properties
+        """, rows=rows)
+        return result.consume().counters.nodes_created
+
+    @staticmethod
+    def add_protein_interaction_batch_to_neo4j(tx, interactions):
+        """
+        Connects Drug and Protein nodes with one UNWIND query per interaction kind.
+
+        Relationship types cannot be parameterised in Cypher, so the type is taken from the fixed
+        `PROTEIN_RELATIONSHIP_TYPES` mapping and never from the data.
+
+        Args:
+            tx (neo4j.Transaction): The Neo4j transaction object.
+            interactions (list): Interactions as returned by `extract_protein_interactions`.
+
+        Returns:
+            int: The number of created relationships.
+        """
+        rows_by_kind = {}
+        for interaction in interactions:
+            rows_by_kind.setdefault(interaction['Kind'], []).append({
+                'drugbankId': interaction['DrugBank ID'],
+                'uniprotId': interaction['Protein'].get('UniProt ID', ''),
+                'position': interaction['Position'],
+                'actions': interaction['Actions'],
+                'knownAction': interaction['Known Action'],
+            })
+
+        created = 0
+        for kind, rows in rows_by_kind.items():
+            relationship_type = PROTEIN_RELATIONSHIP_TYPES[kind]
+            result = tx.run(f"""
+                UNWIND $rows AS row
+                MATCH (d:Drug {{drugbankId: row.drugbankId}})
+                MATCH (p:Protein {{uniprotId: row.uniprotId}})
+                MERGE (d)-[r:{relationship_type}]->(p)
+                SET r.position = row.position, r.actions = row.actions, r.knownAction = row.knownAction
+            """, rows=rows)
+            created += result.consume().counters.relationships_created
+        return created
+
+    def write_entities_in_batches(self, session, entities, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Writes drugs, proteins and their relationships to Neo4j in batches.
+
+        The entities are split into three record streams, each buffered and written in UNWIND
+        batches. Whenever a buffer is full, drugs and proteins are flushed before the
+        relationships, so both ends of every relationship exist when it is written. Each
+        protein is written once per run even if many drugs interact with it.
+
+        Args:
+            session (neo4j.Session): The Neo4j session used for writing.
+            entities (iterable): (drug, protein interactions) tuples as yielded by
+                `iter_drugbank_xml(with_proteins=True)`.
+            batch_size (int): The maximum number of records per UNWIND transaction.
+
+        Returns:
+            dict: The totals 'drugs', 'proteins', 'relationships', 'nodes_created' and 'relationships_created'.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+        totals = {'drugs': 0, 'proteins': 0, 'relationships': 0, 'nodes_created': 0, 'relationships_created': 0}
+        drugs, proteins, interactions = [], [], []
+        written_proteins = set()
+
+        def flush():
+            if drugs:
+                stats = session.execute_write(self.add_drug_batch_to_neo4j, drugs)
+                totals['drugs'] += len(drugs)
+                totals['nodes_created'] += stats['nodes_created']
+                drugs.clear()
+            if proteins:
+                totals['nodes_created'] += session.execute_write(self.add_protein_batch_to_neo4j, proteins)
+                totals['proteins'] += len(proteins)
+                proteins.clear()
+            if interactions:
+                totals['relationships_created'] += session.execute_write(self.add_protein_interaction_batch_to_neo4j, interactions)
+                totals['relationships'] += len(interactions)
+                interactions.clear()
+            logging.info(
+                f"Written so far: {totals['drugs']} drugs, {totals['proteins']} proteins, "
+                f"{totals['relationships']} drug-protein relationships"
+            )
+
+        for drug, drug_interactions in entities:
+            drugs.append(drug)
+            for interaction in drug_interactions:
+                uniprot_id = interaction['Protein'].get('UniProt ID')
+                if not uniprot_id:
+                    continue
+                if uniprot_id not in written_proteins:
+                    written_proteins.add(uniprot_id)
+                    proteins.append(self.protein_to_properties(interaction['Protein']))
+                interactions.append(interaction)
+            if max(len(drugs), len(proteins), len(interactions)) >= batch_size:
+                flush()
+        flush()
+
+        logging.info(
+            f"Finished writing {totals['drugs']} drugs, {totals['proteins']} proteins and "
+            f"{totals['relationships']} drug-protein relationships. Nodes created: {totals['nodes_created']}, "
+            f"relationships created: {totals['relationships_created']}"
+        )
+        return totals
+
+    @staticmethod
+    def upsert_drug_batch_to_neo4j(tx, batch):
+        """
+        Creates or updates a batch of Drug nodes with a single UNWIND query.
+
+        Unlike `add_drug_batch_to_neo4j`, existing nodes are updated. They keep their UUID and
+        any property that is not derived from DrugBank (GO term IDs, ratings, ...), except that
+        `affectedGoProcessId` is reset when `affectedGoProcess` changed, so that the GO term
+        mapping picks the drug up again. A previous removal flag is cleared.
+
+        Args:
+            tx (neo4j.Transaction): The Neo4j transaction object.
+            batch (list): Drug node properties as returned by `drug_to_properties`.
+
+        Returns:
+            dict: The counters and server timings reported for the batch.
+        """
+        rows = [
+            {
+                'drugbankId': properties['drugbankId'],
+                'uuid': properties['uuid'],
+                'properties': {key: value for key, value in properties.items() if key != 'uuid'},
+            }
+            for properties in batch
+        ]
+
+        result = tx.run("""
+            UNWIND $rows AS row
+            MERGE (d:Drug {drugbankId: row.drugbankId})
+            ON CREATE SET d.uuid = row.uuid
+            SET d.affectedGoProcessId = CASE
+                WHEN d.affectedGoProcess = row.properties.affectedGoProcess THEN d.affectedGoProcessId
+                ELSE null END
+            SET d += row.properties
+            REMOVE d.removedFromRelease
+        """, rows=rows)
+
+        summary = result.consume()
+        counters = summary.counters
+        return {
+            'drugs': len(rows),
+            'nodes_created': counters.nodes_created,
+            'properties_set': counters.properties_set,
+            'result_available_after': summary.result_available_after,
+            'result_consumed_after': summary.result_consumed_after,
+        }
+
+    @staticmethod
+    def get_stored_content_hashes(session):
+        """
+        Reads the content hash and removal flag of every Drug node.
+
+        Args:
+            session (neo4j.Session): The Neo4j session used for reading.
+
+        Returns:
+            dict: Maps each drugbankId to a tuple (contentHash, removedFromRelease).
+        """
+        result = session.run("""
+            MATCH (d:Drug)
+            RETURN d.drugbankId AS drugbankId, d.contentHash AS contentHash,
+                   coalesce(d.removedFromRelease, false) AS removed
+        """)
+        return {record['drugbankId']: (record['contentHash'], record['removed']) for record in result}
+
+    @staticmethod
+    def flag_removed_drugs(tx, drugbank_ids):
+        """
+        Flags Drug nodes that are no longer part of the DrugBank release.
+
+        Args:
+            tx (neo4j.Transaction): The Neo4j transaction object.
+            drugbank_ids (list): The DrugBank IDs missing from the release.
+
+        Returns:
+            int: The number of flagged nodes.
+        """
+        result = tx.run("""
+            UNWIND $drugbankIds AS drugbankId
+            MATCH (d:Drug {drugbankId: drugbankId})
+            SET d.removedFromRelease = true
+            RETURN count(d) AS flagged
+        """, drugbankIds=drugbank_ids)
+        return result.single()['flagged']
+
+    def iter_changed_drugs(self, drugs, stored_hashes, stats):
+        """
+        Yields the properties of the drugs that are new or whose content hash changed.
+
+        Args:
+            drugs (iterable): Extracted drug dictionaries.
+            stored_hashes (dict): The result of `get_stored_content_hashes`.
+            stats (dict): Updated in place with the 'seen', 'new', 'changed', 'unchanged' and
+                'duplicates' counts and the set of 'seen_ids'.
+
+        Yields:
+            dict: Drug node properties as returned by `drug_to_properties`.
+        """
+        for drug in drugs:
+            properties = self.drug_to_properties(drug)
+            drugbank_id = properties['drugbankId']
+            if drugbank_id in stats['seen_ids']:
+                # A release listing the same top-level drug twice; like the full load, the first
+                # occurrence of an ID wins
+                stats['duplicates'] += 1
+                continue
+            stats['seen'] += 1
+            stats['seen_ids'].add(drugbank_id)
+
+            stored = stored_hashes.get(drugbank_id)
+            if stored is None:
+                stats['new'] += 1
+            elif stored[0] != properties['contentHash'] or stored[1]:
+                stats['changed'] += 1
+            else:
+                stats['unchanged'] += 1
+                continue
+            yield properties
+
+    def run_delta_pipeline(self, batch_size=DEFAULT_BATCH_SIZE, flag_removed=False, parse_workers=None):
+        """
+        Re-ingests a DrugBank release, writing only new drugs and drugs whose content changed.
+
+        The content hash stored on each Drug node is compared with the hash of the freshly
+        extracted record; unchanged drugs cause no write at all.
+
+        Args:
+            batch_size (int): The number of drugs written per transaction.
+            flag_removed (bool): Set `removedFromRelease` on Drug nodes missing from this release.
+            parse_workers (int, optional): Parse the XML in this many processes instead of sequentially.
+
+        Returns:
+            dict: The 'seen', 'new', 'changed', 'unchanged', 'duplicates' and 'removed' counts.
+        """
+        try:
+            with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+                conn.ensure_schema()
+                with conn.driver.session() as session:
+                    stored_hashes = self.get_stored_content_hashes(session)
+                    logging.info(f"Loaded content hashes of {len(stored_hashes)} Drug nodes.")
+
+                    stats = {'seen': 0, 'new': 0, 'changed': 0, 'unchanged': 0, 'duplicates': 0, 'removed': 0, 'seen_ids': set()}
+                    changed_drugs = self.iter_changed_drugs(self._iter_drugs(parse_workers), stored_hashes, stats)
+                    self.write_drugs_in_batches(session, changed_drugs, batch_size=batch_size, write_batch=self.upsert_drug_batch_to_neo4j)
+
+                    removed_ids = sorted(
+                        drugbank_id for drugbank_id, (_, removed) in stored_hashes.items()
+                        if drugbank_id not in stats['seen_ids'] and not removed
+                    )
+                    stats['removed'] = len(removed_ids)
+                    if removed_ids and flag_removed:
+                        flagged = session.execute_write(self.flag_removed_drugs, removed_ids)
+                        logging.info(f"Flagged {flagged} Drug nodes as removed from the release.")
+                    elif removed_ids:
+                        logging.info(f"{len(removed_ids)} Drug nodes are missing from the release and were left untouched.")
+
+            del stats['seen_ids']
+            logging.info(
+                f"Delta ingest finished. Drugs in release: {stats['seen']}, new: {stats['new']}, "
+                f"changed: {stats['changed']}, unchanged: {stats['unchanged']}, removed: {stats['removed']}"
+            )
+            return stats
+
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            raise
+
+    def run_pipeline(self, batch_size=DEFAULT_BATCH_SIZE, parse_workers=None, cache_dir=None):
         """
         Main function to parse DrugBank XML and add drug information to Neo4j.
+
+        Args:
+            batch_size (int): The number of drugs written per transaction.
+            parse_workers (int, optional): Parse the XML in this many processes instead of sequentially.
+            cache_dir (str, optional): Directory of the columnar parse cache, see `parse_drugbank_xml`.
         """
         try:
             # Parse the entire DrugBank XML file
-            drug_details = self.parse_drugbank_xml()
+            drug_details = self.parse_drugbank_xml(cache_dir=cache_dir, parse_workers=parse_workers)
 
             # Add drugs to the Neo4j database
             with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+                conn.ensure_schema()
                 logging.info(f"Starting to add drugs to the Neo4j database.")
                 with conn.driver.session() as session:
-                    for drug in drug_details:
-                        session.execute_write(self.add_drug_to_neo4j, drug)
+                    self.write_drugs_in_batches(session, drug_details, batch_size=batch_size)
                 logging.info(f"Data has been added to the Neo4j database.")
 
             print("Data has been added to the Neo4j database")
@@ -186,11 +918,120 @@ class DrugBank2Neo4j:
             logging.error(f"An error occurred: {e}")
             raise
 
+    def _produce_drugs(self, drug_queue, stop_event, errors, parse_workers=None, with_proteins=False):
+        """
+        Parses the DrugBank XML file and feeds the extracted drugs into a bounded queue.
+
+        Runs in a background thread. `drug_queue.put` blocks while the queue is at its
+        high-water mark, which throttles parsing to the pace of the Neo4j writer.
+
+        Args:
+            drug_queue (queue.Queue): The bounded queue consumed by the Neo4j writer.
+            stop_event (threading.Event): Set by the writer to abort parsing early.
+            errors (list): Collects any exception raised while parsing.
+            parse_workers (int, optional): Parse the XML in this many processes instead of sequentially.
+            with_proteins (bool): Also extract the protein interactions of every drug.
+        """
+        try:
+            for drug_info in self._iter_drugs(parse_workers, with_proteins=with_proteins):
+                if not self._put_unless_stopped(drug_queue, drug_info, stop_event):
+                    logging.warning("Stopping XML parsing because the Neo4j writer aborted.")
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            # The sentinel is always delivered so that the writer never waits forever
+            self._put_unless_stopped(drug_queue, _END_OF_STREAM, stop_event)
+
+    @staticmethod
+    def _put_unless_stopped(drug_queue, item, stop_event):
+        """
+        Puts an item into the queue, waiting while it is full unless the writer aborted.
+
+        Returns:
+            bool: True if the item was queued, False if `stop_event` was set.
+        """
+        while not stop_event.is_set():
+            try:
+                drug_queue.put(item, timeout=QUEUE_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _consume_drugs(drug_queue):
+        """
+        Yields drugs from the queue until the end-of-stream sentinel arrives.
+
+        Args:
+            drug_queue (queue.Queue): The bounded queue filled by `_produce_drugs`.
+
+        Yields:
+            dict: A dictionary containing information about a single drug.
+        """
+        while True:
+            drug = drug_queue.get()
+            if drug is _END_OF_STREAM:
+                return
+            yield drug
+
+    def run_streaming_pipeline(self, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE, parse_workers=None,
+                               with_proteins=False):
+        """
+        Parses DrugBank XML and writes drug information to Neo4j concurrently.
+
+        The XML is parsed in a background thread and the extracted drugs flow through a
+        bounded queue to the Neo4j writer, so parsing and writing overlap and at most
+        `queue_size` parsed drugs are held in memory at any time.
+
+        Args:
+            queue_size (int): High-water mark of the queue between parser and writer.
+            batch_size (int): The number of drugs written per transaction.
+            parse_workers (int, optional): Parse the XML in this many processes instead of sequentially.
+            with_proteins (bool): Also write the targets, enzymes, carriers and transporters of every
+                drug as Protein nodes with typed relationships, extracted in the same pass.
+        """
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be a positive integer, got {queue_size}")
+
+        drug_queue = queue.Queue(maxsize=queue_size)
+        stop_event = threading.Event()
+        errors = []
+        producer = threading.Thread(
+            target=self._produce_drugs,
+            args=(drug_queue, stop_event, errors, parse_workers, with_proteins),
+            name="drugbank-xml-parser",
+            daemon=True,
+        )
+
+        try:
+            with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+                conn.ensure_schema()
+                logging.info(f"Starting to stream drugs to the Neo4j database (queue size: {queue_size}).")
+                producer.start()
+                with conn.driver.session() as session:
+                    if with_proteins:
+                        totals = self.write_entities_in_batches(session, self._consume_drugs(drug_queue), batch_size=batch_size)
+                    else:
+                        totals = self.write_drugs_in_batches(session, self._consume_drugs(drug_queue), batch_size=batch_size)
+                producer.join()
+                if errors:
+                    raise errors[0]
+                logging.info(f"Data has been added to the Neo4j database. Drugs written: {totals['drugs']}")
+
+            print("Data has been added to the Neo4j database")
+
+        except Exception as e:
+            stop_event.set()
+            logging.error(f"An error occurred: {e}")
+            raise
+
 
 if __name__ == "__main__":
     logging.critical("Initializing script for adding drugbank entities to Neo4j.")
     input_file_path = 'drugbank_full_dataset.xml' # Update this path to the location of the DrugBank XML file on your system
     namespace = {'db': 'http://www.drugbank.ca'}
     pipeline = DrugBank2Neo4j(input_file_path, namespace)
-    pipeline.run_pipeline()
+    pipeline.run_streaming_pipeline(queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE)
 
@@ -12,6 +12,7 @@ sys.path.insert(0, project_root)
 from src_pub.utils.logging_config import setup_logging
 from src_pub.utils.conn_neo4j import Neo4jConnection
 from src_pub.utils.uuid_util import generate_uuid
+from src_pub.utils.graph_stats import count_nodes
 
 class PathologyNeo4j:
     def __init__(self, driver):
@@ -94,18 +95,17 @@ class PathologyNeo4j:
         This is done by comparing the number of relationships of the Alzheimer node to the total number of nodes.
         The total number of nodes should be equal to the number of relationships of the Alzheimer node minus one (because the pathology node is not connected to itself).
         """
-        total_nodes_query = "MATCH (n) RETURN count(n) AS total_nodes"
+        # The degree of the Alzheimer node is read from its relationship chain, not by expanding it
         alzheimer_connections_query = """
-        MATCH (p:Pathology {pathologyName: 'Alzheimer'})-[r:RELATED_TO]-()
-        RETURN count(r) AS alzheimer_connections
+        MATCH (p:Pathology {pathologyName: 'Alzheimer'})
+        RETURN COUNT { (p)-[:RELATED_TO]-() } AS alzheimer_connections
         """
         
         with self.driver.session() as session:
-            total_nodes_result = session.run(total_nodes_query).single()
+            total_nodes = count_nodes(session)
             alzheimer_connections_result = session.run(alzheimer_connections_query).single()
         
-        total_nodes = total_nodes_result['total_nodes']
-        alzheimer_connections = alzheimer_connections_result['alzheimer_connections']
+        alzheimer_connections = alzheimer_connections_result['alzheimer_connections'] if alzheimer_connections_result else 0
 
         logging.info(f"Total nodes in the database: {total_nodes}")
         logging.info(f"Connections of the Alzheimer node: {alzheimer_connections}")
@@ -128,6 +128,7 @@ def add_pathology():
 
     try:
           with Neo4jConnection(uri, user, password) as conn:
+            conn.ensure_schema()
             pathology_neo4j = PathologyNeo4j(conn.driver)
             pathology_neo4j.create_alzheimer_node()
             pathology_neo4j.connect_biological_processes_to_alzheimer()
@@ -1,6 +1,5 @@
 import os
 import sys
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import logging
 
@@ -9,8 +8,10 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
-from src_pub.utils.conn_neo4j import Neo4jConnection
+from src_pub.utils.conn_neo4j import Neo4jConnection, get_driver
 from src_pub.utils.uuid_util import generate_uuid
+from src_pub.utils.batch_writer import BatchWriter
+from src_pub.utils.graph_backend import InMemoryGraph
 
 # Load environment variables from .env file
 load_dotenv()
@@ -19,11 +20,62 @@ load_dotenv()
 setup_logging()
 logger = logging.getLogger(__name__)
 
-def connect_drug_to_biological_process(uri, user, password):
+LINK_BATCH_SIZE = 1000  # Drug-process pairs per UNWIND transaction
+
+LINK_QUERY = """
+    UNWIND $rows AS row
+    MATCH (b:BiologicalProcess {goTerm: row.goTermId})
+    MATCH (d:Drug {drugbankId: row.drugbankId})
+    MERGE (d)-[:AFFECTS]->(b)
+"""
+
+def iter_drug_process_pairs(drug_records):
+    """
+    Yield one parameter map per (drug, GO term) pair of the Drug records.
+    """
+    for record in drug_records:
+        drugbank_id = record.get('drugbankId')
+        affected_go_process_ids = record.get('affectedGoProcessId')
+
+        if not drugbank_id:
+            logger.warning(f"Drug node without drugbankId found with affectedGoProcessId: {affected_go_process_ids}")
+            continue
+
+        # Check if affectedGoProcessId is a list
+        if not isinstance(affected_go_process_ids, list):
+            logger.warning(f"Drug node {drugbank_id} affectedGoProcessId is not a list: {affected_go_process_ids}")
+            continue
+
+        logger.debug(f"Processing Drug node {drugbank_id} with affectedGoProcessId: {affected_go_process_ids}")
+        for go_term_id in affected_go_process_ids:
+            # Ensure the go_term_id is properly trimmed
+            yield {'drugbankId': drugbank_id, 'goTermId': go_term_id.strip()}
+
+def link_drugs_to_processes(backend):
+    """
+    Connect every Drug node to the BiologicalProcess nodes of its affectedGoProcessId on a graph backend.
+    """
+    drugs = [drug for drug in backend.find_nodes('Drug') if drug.get('affectedGoProcessId')]
+    if not drugs:
+        logger.warning("No Drug nodes found with non-empty affectedGoProcessId property.")
+        return 0
+    pairs = [(pair['drugbankId'], pair['goTermId']) for pair in iter_drug_process_pairs(drugs)]
+    created = backend.link('Drug', 'BiologicalProcess', 'AFFECTS', pairs)
+    logger.info(f"Completed processing {len(drugs)} Drug nodes. Drug-process pairs: {len(pairs)}, relationships created: {created}")
+    return created
+
+def connect_drug_to_biological_process(uri, user, password, batch_size=LINK_BATCH_SIZE, in_memory=False):
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
+        driver = get_driver(uri, user, password)
         logger.info("Database connection established successfully.")
 
+        if in_memory:
+            # Link in memory and write only the new relationships back
+            graph = InMemoryGraph.load_from_neo4j(driver, labels=['Drug', 'BiologicalProcess'])
+            link_drugs_to_processes(graph)
+            graph.flush_to_neo4j(driver, batch_size=batch_size)
+            return
+
         with driver.session() as session:
             logger.info("Starting to find Drug nodes with non-empty affectedGoProcessId property.")
             
@@ -31,56 +83,23 @@ def connect_drug_to_biological_process(uri, user, password):
             drug_nodes_result = session.run("""
                 MATCH (d:Drug)
                 WHERE size(d.affectedGoProcessId) > 0
-                RETURN d
+                RETURN d.drugbankId AS drugbankId, d.affectedGoProcessId AS affectedGoProcessId
             """)
 
             if drug_nodes_result.peek() is None:
                 logger.warning("No Drug nodes found with non-empty affectedGoProcessId property.")
                 return
 
-            nodes_processed = 0
-            for record in drug_nodes_result:
-                drug_node = record['d']
-                drugbank_id = drug_node.get('drugbankId', None)
-                
-                if not drugbank_id:
-                    logger.warning(f"Drug node without drugbankId found: {drug_node.id} with properties: {drug_node.items()}")
-                    continue
-
-                affected_go_process_ids = drug_node.get('affectedGoProcessId', [])
-                
-                logger.info(f"Processing Drug node {drugbank_id} with affectedGoProcessId: {affected_go_process_ids}")
-
-                # Check if affectedGoProcessId is a list
-                if isinstance(affected_go_process_ids, list):
-                    for go_term_id in affected_go_process_ids:
-                        # Ensure the go_term_id is properly trimmed
-                        go_term_id = go_term_id.strip()
-                        result = session.run("""
-                            MATCH (b:BiologicalProcess {goTerm: $go_term_id})
-                            WITH b
-                            MATCH (d:Drug {drugbankId: $drugbank_id})
-                            MERGE (d)-[:AFFECTS]->(b)
-                            RETURN b
-                        """, drugbank_id=drugbank_id, go_term_id=go_term_id)
-                        
-                        summary = result.consume()
-                        if summary.counters.contains_updates:
-                            logger.critical(f"Connected Drug node {drugbank_id} to BiologicalProcess with goTerm: {go_term_id}")
-                        else:
-                            logger.info(f"No BiologicalProcess node found with goTerm: {go_term_id} for Drug node {drugbank_id}")
-
-                    nodes_processed += 1
-                else:
-                    logger.warning(f"Drug node {drugbank_id} affectedGoProcessId is not a list: {affected_go_process_ids}")
-
-            logger.info(f"Completed processing all Drug nodes. Total nodes processed: {nodes_processed}")
+            with BatchWriter(driver, LINK_QUERY, batch_size=batch_size, name='AFFECTS writer') as writer:
+                writer.write(iter_drug_process_pairs(drug_nodes_result))
+
+            logger.info(
+                f"Completed processing all Drug nodes. Drug-process pairs: {writer.totals['rows']}, "
+                f"relationships created: {writer.totals.get('relationships_created', 0)}"
+            )
 
     except Exception as e:
         logger.critical(f"Failed to establish database connection: {str(e)}")
-    finally:
-        if 'driver' in locals():
-            driver.close()
 
 # Connection details
 uri = os.getenv("uri")
@@ -89,4 +108,5 @@ password = os.getenv("password")
 
 # Connect drug nodes to biological process nodes
 logger.info("Initializing script for connecting Drug nodes to BiologicalProcess nodes.")
-connect_drug_to_biological_process(uri, user, password)
\ No newline at end of file
+# GRAPH_BACKEND=memory links on an in-memory copy of the graph
+connect_drug_to_biological_process(uri, user, password, in_memory=os.getenv("GRAPH_BACKEND") == "memory")
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Columnar cache for the drug records extracted from the DrugBank XML.
+
+Parsing the full DrugBank release takes minutes. The first parse stores the extracted records
+as an Arrow IPC file; later runs memory-map that file back instead of parsing the XML again.
+
+A cache file is keyed by the size, the modification time and a hash of the first and last
+bytes of the XML file, together with a fingerprint of `DRUG_FIELD_SPEC`, so a new release or
+a change of the extracted fields never serves stale records. Hashing only the ends of the file
+keeps the key computation well below a second for the 1.5 GB release.
+
+Requires pyarrow (`pip install pyarrow`).
+
+Example usage:
+    from drugbank_cache import load_or_build_drug_cache
+
+    drugs = load_or_build_drug_cache('drugbank_full_dataset.xml', 'datasets/cache', parser.parse_drugbank_xml)
+"""
+
+import os
+import json
+import hashlib
+import logging
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is only needed when the cache is used
+    pa = None
+
+from src_pub.db_entry.drugbank_fields import DRUG_FIELD_SPEC
+
+CACHE_FORMAT_VERSION = 2  # 2: pathway drug stubs are no longer extracted
+HASHED_BYTES = 1024 * 1024  # Bytes hashed at the start and at the end of the XML file
+
+
+def _require_pyarrow():
+    """
+    Raise an informative error if pyarrow is not installed.
+    """
+    if pa is None:
+        raise ImportError("The DrugBank parse cache requires pyarrow. Install it with 'pip install pyarrow'.")
+
+
+def compute_cache_key(input_file_path):
+    """
+    Compute the cache key of a DrugBank XML file.
+
+    Parameters
+    ----------
+    input_file_path : str
+        The path to the DrugBank XML file.
+
+    Returns
+    -------
+    str
+        A hexadecimal key derived from file size, modification time, the first and last
+        `HASHED_BYTES` of the file, the field specification and the cache format version.
+    """
+    stat = os.stat(input_file_path)
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+    digest.update(json.dumps(DRUG_FIELD_SPEC, sort_keys=True).encode('utf-8'))
+    with open(input_file_path, 'rb') as f:
+        digest.update(f.read(HASHED_BYTES))
+        if stat.st_size > HASHED_BYTES:
+            f.seek(max(stat.st_size - HASHED_BYTES, HASHED_BYTES))
+            digest.update(f.read(HASHED_BYTES))
+    return digest.hexdigest()[:32]
+
+
+def cache_path_for(input_file_path, cache_dir):
+    """
+    Return the path of the cache file for a DrugBank XML file.
+    """
+    base_name = os.path.splitext(os.path.basename(input_file_path))[0]
+    return os.path.join(cache_dir, f"{base_name}_{compute_cache_key(input_file_path)}.arrow")
+
+
+def write_drug_cache(drugs, cache_path):
+    """
+    Write extracted drug records to an Arrow IPC file.
+
+    The file is written next to its final location and renamed into place, so a crashed run
+    never leaves a truncated cache behind.
+
+    Parameters
+    ----------
+    drugs : list
+        Drug dictionaries as returned by `DrugBank2Neo4j.parse_drugbank_xml`.
+    cache_path : str
+        The path of the cache file.
+    """
+    _require_pyarrow()
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    table = pa.Table.from_pylist(drugs)
+    tmp_path = f"{cache_path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, cache_path)
+    logging.info(f"Wrote {table.num_rows} drug records to the cache {cache_path}")
+
+
+def load_drug_table(cache_path):
+    """
+    Memory-map a cache file as an Arrow table without copying its data.
+
+    Parameters
+    ----------
+    cache_path : str
+        The path of the cache file.
+
+    Returns
+    -------
+    pyarrow.Table
+        One row per drug, one column per extracted field.
+    """
+    _require_pyarrow()
+    with pa.memory_map(cache_path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def load_drug_records(cache_path):
+    """
+    Load a cache file as drug dictionaries in the format of `DrugBank2Neo4j.parse_drugbank_xml`.
+    """
+    return load_drug_table(cache_path).to_pylist()
+
+
+def load_or_build_drug_cache(input_file_path, cache_dir, parse):
+    """
+    Return the drug records of a DrugBank XML file, from the cache if possible.
+
+    Parameters
+    ----------
+    input_file_path : str
+        The path to the DrugBank XML file.
+    cache_dir : str
+        The directory holding the cache files.
+    parse : callable
+        Called without arguments to parse the XML file on a cache miss.
+
+    Returns
+    -------
+    list
+        Drug dictionaries as returned by `DrugBank2Neo4j.parse_drugbank_xml`.
+    """
+    _require_pyarrow()
+    cache_path = cache_path_for(input_file_path, cache_dir)
+    if os.path.exists(cache_path):
+        logging.info(f"Loading drug records from the cache {cache_path}")
+        return load_drug_records(cache_path)
+
+    logging.info(f"No cache found for {input_file_path}, parsing the XML file.")
+    drugs = parse()
+    write_drug_cache(drugs, cache_path)
+    return drugs
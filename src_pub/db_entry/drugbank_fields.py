@@ -0,0 +1,218 @@
+"""
+Declarative field specification for the extraction of drug records from the DrugBank XML.
+
+Each entry of `DRUG_FIELD_SPEC` maps the name of a field in the extracted drug dictionary
+to the path it is read from, relative to a top-level drug element:
+
+    'Indication': {'path': 'db:indication'}
+
+Supported keys per field:
+    path : str
+        An XPath relative to the drug element, using the prefixes of the namespace dictionary.
+        Paths selecting attributes (e.g. '@type') yield the attribute value.
+    cardinality : str, optional
+        'one' (default) takes the first match, 'many' returns a list of all matches.
+    default : object, optional
+        Value used when a 'one' field has no match. Defaults to ''. 'many' fields default to [].
+    fields : dict, optional
+        A nested field specification applied to every matched element, e.g. to turn each
+        GO classifier into a dictionary. Without it the text of the matched element is used.
+
+The specification is compiled once by `DrugFieldExtractor`: single-step child paths such as
+'db:name' are resolved in one pass over the children of the drug element, every other path is
+compiled into an `lxml.etree.XPath` object. Adding a field, e.g. the synonyms of a drug, is a
+one-line change that does not add per-field namespace or path resolution to the hot loop:
+
+    'Synonyms': {'path': 'db:synonyms/db:synonym', 'cardinality': 'many'}
+
+`DRUG_PROTEIN_FIELD_SPEC` describes the targets, enzymes, carriers and transporters of a drug
+with their polypeptides and GO classifiers in the same way, so they can be extracted from the
+same element in the same pass.
+
+Example usage:
+    extractor = DrugFieldExtractor(DRUG_FIELD_SPEC, {'db': 'http://www.drugbank.ca'})
+    drug_info = extractor(drug_elem)
+"""
+
+import re
+from lxml import etree
+
+GO_CLASSIFIER_FIELD_SPEC = {
+    'Category': {'path': 'db:category'},
+    'Description': {'path': 'db:description'},
+}
+
+DRUG_FIELD_SPEC = {
+    'DrugBank ID': {'path': 'db:drugbank-id'},
+    'Name': {'path': 'db:name'},
+    'Description': {'path': 'db:description'},
+    'GO Classifiers': {
+        'path': './/db:go-classifier',
+        'cardinality': 'many',
+        'fields': GO_CLASSIFIER_FIELD_SPEC,
+    },
+    'Simple Description': {'path': 'db:simple-description'},
+    'Clinical Description': {'path': 'db:clinical-description'},
+    'Therapeutically Significant': {'path': 'db:therapeutically-significant'},
+    'Affected Organisms': {'path': 'db:affected-organisms/db:affected-organism', 'cardinality': 'many'},
+    'Indication': {'path': 'db:indication'},
+    'Pharmacodynamics': {'path': 'db:pharmacodynamics'},
+    'Mechanism of Action': {'path': 'db:mechanism-of-action'},
+    'Direct Parent': {'path': 'db:classification/db:direct-parent'},
+    'Kingdom': {'path': 'db:classification/db:kingdom'},
+    'Superclass': {'path': 'db:classification/db:superclass'},
+    'Class': {'path': 'db:classification/db:class'},
+}
+
+POLYPEPTIDE_FIELD_SPEC = {
+    'UniProt ID': {'path': '@id'},
+    'Source': {'path': '@source'},
+    'Name': {'path': 'db:name'},
+    'Gene Name': {'path': 'db:gene-name'},
+    'Organism': {'path': 'db:organism'},
+    'General Function': {'path': 'db:general-function'},
+    'Specific Function': {'path': 'db:specific-function'},
+    'Cellular Location': {'path': 'db:cellular-location'},
+    'GO Classifiers': {'path': 'db:go-classifiers/db:go-classifier', 'cardinality': 'many', 'fields': GO_CLASSIFIER_FIELD_SPEC},
+}
+
+# A target, enzyme, carrier or transporter entry of a drug
+PROTEIN_INTERACTION_FIELD_SPEC = {
+    'BE ID': {'path': 'db:id'},
+    'Position': {'path': '@position'},
+    'Actions': {'path': 'db:actions/db:action', 'cardinality': 'many'},
+    'Known Action': {'path': 'db:known-action'},
+    'Polypeptides': {'path': 'db:polypeptide', 'cardinality': 'many', 'fields': POLYPEPTIDE_FIELD_SPEC},
+}
+
+# Maps the interaction kind to the element path below a top-level drug element
+PROTEIN_INTERACTION_PATHS = {
+    'target': 'db:targets/db:target',
+    'enzyme': 'db:enzymes/db:enzyme',
+    'carrier': 'db:carriers/db:carrier',
+    'transporter': 'db:transporters/db:transporter',
+}
+
+DRUG_PROTEIN_FIELD_SPEC = {
+    kind: {'path': path, 'cardinality': 'many', 'fields': PROTEIN_INTERACTION_FIELD_SPEC}
+    for kind, path in PROTEIN_INTERACTION_PATHS.items()
+}
+
+CARDINALITIES = ('one', 'many')
+
+_CHILD_STEP_PATTERN = re.compile(r'(\w+):([\w.-]+)')
+
+
+class DrugFieldExtractor:
+    """
+    Applies a compiled field specification to XML elements.
+
+    Attributes
+    ----------
+    field_spec : dict
+        The field specification, see the module docstring.
+    namespaces : dict
+        The namespace dictionary used to resolve the prefixes of the paths.
+
+    Methods
+    -------
+    __call__(elem):
+        Extracts all fields of the specification from an element.
+    """
+
+    def __init__(self, field_spec, namespaces):
+        """
+        Compiles the field specification.
+
+        Parameters
+        ----------
+        field_spec : dict
+            The field specification, see the module docstring.
+        namespaces : dict
+            The namespace dictionary used to resolve the prefixes of the paths.
+
+        Raises
+        ------
+        ValueError
+            If a field has an unknown cardinality or a path uses an unknown namespace prefix.
+        """
+        self.field_spec = field_spec
+        self.namespaces = namespaces
+        self._fields = []  # (name, many, default) in specification order
+        self._child_fields = {}  # Clark tag -> [(name, many, sub-extractor)]
+        self._xpath_fields = []  # (name, many, compiled XPath, sub-extractor)
+
+        for name, spec in field_spec.items():
+            cardinality = spec.get('cardinality', 'one')
+            if cardinality not in CARDINALITIES:
+                raise ValueError(f"Unknown cardinality '{cardinality}' for field '{name}', expected one of {CARDINALITIES}")
+            many = cardinality == 'many'
+            sub_extractor = DrugFieldExtractor(spec['fields'], namespaces) if spec.get('fields') else None
+            self._fields.append((name, many, spec.get('default', '')))
+
+            path = spec['path']
+            child_step = _CHILD_STEP_PATTERN.fullmatch(path)
+            if child_step:
+                prefix, local_name = child_step.groups()
+                if prefix not in namespaces:
+                    raise ValueError(f"Unknown namespace prefix '{prefix}' in path '{path}' of field '{name}'")
+                tag = f"{{{namespaces[prefix]}}}{local_name}"
+                self._child_fields.setdefault(tag, []).append((name, many, sub_extractor))
+            else:
+                try:
+                    xpath = etree.XPath(path, namespaces=namespaces)
+                except etree.XPathSyntaxError as e:
+                    raise ValueError(f"Invalid path '{path}' of field '{name}': {e}") from e
+                self._xpath_fields.append((name, many, xpath, sub_extractor))
+
+    def __call__(self, elem):
+        """
+        Extracts all fields of the specification from an element.
+
+        Parameters
+        ----------
+        elem : lxml.etree._Element
+            The element to extract the fields from, e.g. a top-level drug element.
+
+        Returns
+        -------
+        dict
+            The extracted fields in specification order. 'one' fields hold the text of the
+            first match (or the result of the nested specification), 'many' fields a list.
+        """
+        found = {}
+
+        # One pass over the children serves all single-step paths
+        if self._child_fields:
+            for child in elem:
+                targets = self._child_fields.get(child.tag)
+                if targets is None:
+                    continue
+                for name, many, sub_extractor in targets:
+                    if many:
+                        found.setdefault(name, []).append(sub_extractor(child) if sub_extractor else child.text)
+                    elif name not in found:
+                        found[name] = sub_extractor(child) if sub_extractor else child.text
+
+        for name, many, xpath, sub_extractor in self._xpath_fields:
+            matches = xpath(elem)
+            if many:
+                found[name] = [_match_value(match, sub_extractor) for match in matches]
+            elif matches:
+                found[name] = _match_value(matches[0], sub_extractor)
+
+        return {
+            name: found[name] if name in found else ([] if many else default)
+            for name, many, default in self._fields
+        }
+
+
+def _match_value(match, sub_extractor):
+    """
+    Returns the value of an XPath match: the nested fields, an attribute value or the element text.
+    """
+    if sub_extractor is not None:
+        return sub_extractor(match)
+    if isinstance(match, str):
+        return str(match)
+    return match.text
@@ -0,0 +1,259 @@
+"""
+This module exports DrugBank drugs and ARUK-UCL biological processes as CSV files for `neo4j-admin database import`.
+
+For a fresh database an offline import is much faster than transactional MERGE queries through
+`Neo4jConnection`. The exporter produces the same graph as the transactional scripts:
+
+    (:Drug)-[:AFFECTS]->(:BiologicalProcess)-[:RELATED_TO]->(:Pathology {pathologyName: 'Alzheimer'})
+
+Every node type and relationship type is written as a header file plus a data file, and all
+nodes get their `uuid` assigned up front, which also serves as the import ID.
+
+Drugs are linked to biological processes by matching the GO process names of a drug against
+the GO names of the ARUK-UCL annotations (case-insensitive). Names that are not part of the
+annotation file can be resolved with an optional name -> GO ID mapping, e.g. an earlier result
+of the GO term mapping.
+
+Functions:
+    build_drug_rows(drugs, go_name_to_id): Build the Drug node rows and their resolved GO term IDs.
+    build_biological_process_rows(data): Aggregate the ARUK-UCL annotations into one row per GO term.
+    write_bulk_import_files(drugs, data, output_dir, go_name_to_id): Write all header and data files.
+    build_import_command(files, database): Assemble the matching neo4j-admin command.
+
+Example usage:
+    $ python src_pub/db_entry/export_bulk_import.py
+    $ neo4j-admin database import full --array-delimiter="|" --multiline-fields=true --nodes=... --relationships=... neo4j
+"""
+
+import os
+import sys
+import csv
+import logging
+import pandas as pd
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.uuid_util import generate_uuid
+from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+from src_pub.db_entry.add_arukuclprocess2neo4j import BIOLOGICAL_PROCESS_PROPERTY_MAPPING, aggregate_biological_processes, _split_env_list
+from src_pub.dataset_prep.go_annotation_reader import iter_annotation_chunks
+
+ARRAY_DELIMITER = '|'  # Passed to neo4j-admin as --array-delimiter, DrugBank texts contain ';'
+PATHOLOGY_NAME = 'Alzheimer'
+
+DRUG_COLUMNS = [
+    ('uuid', 'uuid:ID'),
+    ('drugbankId', 'drugbankId'),
+    ('name', 'name'),
+    ('description', 'description'),
+    ('simpleDescription', 'simpleDescription'),
+    ('clinicalDescription', 'clinicalDescription'),
+    ('therapeuticallySignificant', 'therapeuticallySignificant'),
+    ('indication', 'indication'),
+    ('pharmacodynamics', 'pharmacodynamics'),
+    ('mechanismOfAction', 'mechanismOfAction'),
+    ('affectedGoProcess', 'affectedGoProcess:string[]'),
+    ('affectedGoProcessId', 'affectedGoProcessId:string[]'),
+    ('directParent', 'directParent'),
+    ('kingdom', 'kingdom'),
+    ('superclass', 'superclass'),
+    ('class', 'class'),
+    ('contentHash', 'contentHash'),
+]
+
+BIOLOGICAL_PROCESS_COLUMNS = [('uuid', 'uuid:ID'), ('label', 'label')] + [
+    (prop, prop) for prop in BIOLOGICAL_PROCESS_PROPERTY_MAPPING.values()
+]
+
+PATHOLOGY_COLUMNS = [('uuid', 'uuid:ID'), ('pathologyName', 'pathologyName')]
+
+RELATIONSHIP_HEADER = [':START_ID', ':END_ID']
+
+
+def build_drug_rows(drugs, go_name_to_id=None):
+    """
+    Build the Drug node rows from extracted DrugBank records.
+
+    Parameters
+    ----------
+    drugs : iterable
+        Drug dictionaries as returned by `DrugBank2Neo4j.parse_drugbank_xml`, i.e. top-level drugs
+        only; the pathway drug stubs carrying just an ID and a name are not extracted.
+    go_name_to_id : dict, optional
+        Maps lower-cased GO process names to GO term IDs.
+
+    Returns
+    -------
+    list
+        One property dictionary per unique drugbankId. Like the transactional load, the first
+        occurrence of a drugbankId wins.
+    """
+    go_name_to_id = go_name_to_id or {}
+    rows = []
+    seen_ids = set()
+    for drug in drugs:
+        properties = DrugBank2Neo4j.drug_to_properties(drug)
+        if properties['drugbankId'] in seen_ids:
+            continue
+        seen_ids.add(properties['drugbankId'])
+        go_ids = []
+        for process in properties['affectedGoProcess']:
+            go_id = go_name_to_id.get(process.strip().lower())
+            if go_id and go_id not in go_ids:
+                go_ids.append(go_id)
+        properties['affectedGoProcessId'] = go_ids
+        rows.append(properties)
+    return rows
+
+
+def build_biological_process_rows(data):
+    """
+    Aggregate the ARUK-UCL annotations into one BiologicalProcess row per GO term.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        DataFrame containing biological process data, as read from the filtered ARUK-UCL TSV.
+
+    Returns
+    -------
+    list
+        One property dictionary per GO term, in order of first appearance, see
+        `aggregate_biological_processes`, each with a newly generated uuid.
+    """
+    return [{'uuid': generate_uuid(), **process} for process in aggregate_biological_processes(data)]
+
+
+def _format_value(value):
+    """
+    Format a property value for the CSV files, joining lists with the array delimiter.
+    """
+    if isinstance(value, (list, tuple)):
+        return ARRAY_DELIMITER.join(str(item) for item in value)
+    return '' if value is None else value
+
+
+def _write_csv(output_dir, name, header, rows):
+    """
+    Write one header file and one data file, returning both paths.
+    """
+    header_path = os.path.join(output_dir, f"{name}_header.csv")
+    data_path = os.path.join(output_dir, f"{name}.csv")
+    with open(header_path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(header)
+    with open(data_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for row in rows:
+            writer.writerow([_format_value(value) for value in row])
+    logging.info(f"Wrote {data_path} with header {header_path}")
+    return header_path, data_path
+
+
+def write_bulk_import_files(drugs, data, output_dir, go_name_to_id=None):
+    """
+    Write the header and data CSV files for `neo4j-admin database import`.
+
+    Parameters
+    ----------
+    drugs : iterable
+        Drug dictionaries as returned by `DrugBank2Neo4j.parse_drugbank_xml`.
+    data : pd.DataFrame
+        DataFrame containing biological process data, as read from the filtered ARUK-UCL TSV.
+    output_dir : str
+        Directory for the CSV files. Created if it does not exist.
+    go_name_to_id : dict, optional
+        Additional GO process name -> GO term ID mappings used to link drugs.
+
+    Returns
+    -------
+    dict
+        Maps 'nodes' and 'relationships' to lists of (label or type, header path, data path),
+        and 'counts' to the number of rows written per file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    process_rows = build_biological_process_rows(data)
+    process_uuid_by_term = {row['goTerm']: row['uuid'] for row in process_rows}
+
+    name_to_id = {row['goName'].strip().lower(): row['goTerm'] for row in process_rows}
+    for name, go_id in (go_name_to_id or {}).items():
+        name_to_id.setdefault(name.strip().lower(), go_id)
+    drug_rows = build_drug_rows(drugs, name_to_id)
+
+    pathology_uuid = generate_uuid()
+
+    affects = [
+        (drug['uuid'], process_uuid_by_term[go_id])
+        for drug in drug_rows
+        for go_id in drug['affectedGoProcessId']
+        if go_id in process_uuid_by_term
+    ]
+    related_to = [(row['uuid'], pathology_uuid) for row in process_rows]
+
+    files = {'nodes': [], 'relationships': [], 'counts': {}}
+    node_files = [
+        ('Drug', 'drugs', DRUG_COLUMNS, drug_rows),
+        ('BiologicalProcess', 'biological_processes', BIOLOGICAL_PROCESS_COLUMNS, process_rows),
+        ('Pathology', 'pathologies', PATHOLOGY_COLUMNS, [{'uuid': pathology_uuid, 'pathologyName': PATHOLOGY_NAME}]),
+    ]
+    for label, name, columns, rows in node_files:
+        header = [column for _, column in columns] + [':LABEL']
+        values = ([row.get(prop, '') for prop, _ in columns] + [label] for row in rows)
+        files['nodes'].append((label,) + _write_csv(output_dir, name, header, values))
+        files['counts'][name] = len(rows)
+
+    for rel_type, name, rows in [('AFFECTS', 'affects', affects), ('RELATED_TO', 'related_to', related_to)]:
+        header = RELATIONSHIP_HEADER + [':TYPE']
+        values = (list(pair) + [rel_type] for pair in rows)
+        files['relationships'].append((rel_type,) + _write_csv(output_dir, name, header, values))
+        files['counts'][name] = len(rows)
+
+    logging.info(f"Bulk import files written to {output_dir}: {files['counts']}")
+    return files
+
+
+def build_import_command(files, database='neo4j'):
+    """
+    Assemble the `neo4j-admin database import full` command for the written files.
+
+    Parameters
+    ----------
+    files : dict
+        The result of `write_bulk_import_files`.
+    database : str
+        The name of the database to create.
+
+    Returns
+    -------
+    str
+        The command line.
+    """
+    # DrugBank texts contain line breaks inside quoted fields
+    parts = ['neo4j-admin database import full', f'--array-delimiter="{ARRAY_DELIMITER}"', '--multiline-fields=true']
+    parts += [f'--nodes={label}="{header},{data}"' for label, header, data in files['nodes']]
+    parts += [f'--relationships={rel_type}="{header},{data}"' for rel_type, header, data in files['relationships']]
+    parts.append(database)
+    return ' \\\n    '.join(parts)
+
+
+if __name__ == "__main__":
+    from src_pub.utils.logging_config import setup_logging
+
+    setup_logging(log_file_prefix="logs/bulk_import_export", processed_file="bulk_import_export")
+    logging.critical("Initializing script for exporting DrugBank and ARUK-UCL data for neo4j-admin import.")
+    input_file_path = 'drugbank_full_dataset.xml' # Update this path to the location of the DrugBank XML file on your system
+    # The unfiltered annotations, filtered with the same predicates as add_arukuclprocess2neo4j.py
+    arukucl_path = os.getenv('input_path_arukucl', 'datasets/ARUK-UCL-GO-terms.tsv')
+    output_dir = 'datasets/bulk_import'
+
+    chunks = iter_annotation_chunks(
+        arukucl_path,
+        aspects=_split_env_list('ARUK_UCL_ASPECTS') or ['P'],
+        evidence_codes=_split_env_list('ARUK_UCL_EVIDENCE_CODES'),
+        taxa=_split_env_list('ARUK_UCL_TAXA'),
+    )
+    parser = DrugBank2Neo4j(input_file_path, {'db': 'http://www.drugbank.ca'}, configure_logging=False)
+    written = write_bulk_import_files(parser.parse_drugbank_xml(), pd.concat(chunks, ignore_index=True), output_dir)
+    print(build_import_command(written))
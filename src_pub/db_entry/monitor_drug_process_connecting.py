@@ -1,7 +1,6 @@
 import os
 import sys
 import time
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import logging
 
@@ -10,7 +9,8 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
-from src_pub.utils.conn_neo4j import Neo4jConnection
+from src_pub.utils.conn_neo4j import Neo4jConnection, get_driver
+from src_pub.utils.graph_stats import count_relationships
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,22 +21,23 @@ logger = logging.getLogger(__name__)
 
 def monitor_connections(uri, user, password):
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
+        driver = get_driver(uri, user, password)
         logger.info("Monitoring script: Database connection established successfully.")
 
         while True:
             with driver.session() as session:
                 logger.info("Monitoring script: Checking number of connections and unique nodes between Drug and BiologicalProcess nodes.")
                 
+                # AFFECTS only connects Drug to BiologicalProcess nodes, so the count store answers the total
+                connection_count = count_relationships(session, 'AFFECTS', start_label='Drug')
+
                 result = session.run("""
                     MATCH (d:Drug)-[:AFFECTS]->(b:BiologicalProcess)
-                    RETURN count(*) AS connection_count,
-                           count(distinct d) AS drug_count,
+                    RETURN count(distinct d) AS drug_count,
                            count(distinct b) AS bio_process_count
                 """)
                 
                 record = result.single()
-                connection_count = record['connection_count']
                 drug_count = record['drug_count']
                 bio_process_count = record['bio_process_count']
                 
@@ -49,9 +50,6 @@ def monitor_connections(uri, user, password):
 
     except Exception as e:
         logger.critical(f"Monitoring script: Failed to establish database connection: {str(e)}")
-    finally:
-        if 'driver' in locals():
-            driver.close()
 
 # Connection details
 uri = os.getenv("uri")
@@ -1,6 +1,5 @@
 import os
 import sys
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import logging
 
@@ -9,7 +8,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
-from src_pub.utils.conn_neo4j import Neo4jConnection
+from src_pub.utils.conn_neo4j import Neo4jConnection, get_driver
 from src_pub.utils.uuid_util import generate_uuid
 
 # Load environment variables from .env file
@@ -21,7 +20,7 @@ logger = logging.getLogger(__name__)
 
 def remove_unconnected_drug_nodes(uri, user, password):
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
+        driver = get_driver(uri, user, password)
         logger.info("Database connection established successfully.")
 
         with driver.session() as session:
@@ -72,9 +71,6 @@ def remove_unconnected_drug_nodes(uri, user, password):
 
     except Exception as e:
         logger.critical(f"Failed to establish database connection or remove nodes: {str(e)}")
-    finally:
-        if 'driver' in locals():
-            driver.close()
 
 # Connection details
 uri = os.getenv("uri")
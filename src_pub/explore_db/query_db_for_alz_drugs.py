@@ -11,6 +11,7 @@ sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
 from src_pub.utils.conn_neo4j import Neo4jConnection
+from src_pub.explore_db.search_drugs import ALZHEIMER_INDICATION_QUERY, fetch_drugs_matching
 
 
 class Neo4jDrugExporter:
@@ -19,21 +20,19 @@ class Neo4jDrugExporter:
 
     def fetch_drugs_from_neo4j(self):
         """
-        Fetch drug nodes with 'indication' property containing 'alzheim' (case insensitive) from Neo4j database.
+        Fetch drug nodes with an 'indication' mentioning Alzheimer's (case insensitive) from Neo4j database.
+
+        The drugs are looked up with the full-text index over the Drug text fields instead of
+        scanning and lowercasing the indication of every Drug node.
 
         Returns:
             list: A list of dictionaries, each containing drug properties.
         """
-        query = """
-        MATCH (d:Drug)
-        WHERE toLower(d.indication) CONTAINS 'alzheim'
-        RETURN d
-        """
         try:
             with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+                conn.ensure_schema()
                 with conn.driver.session() as session:
-                    result = session.run(query)
-                    drugs = [record["d"] for record in result]
+                    drugs = fetch_drugs_matching(session, ALZHEIMER_INDICATION_QUERY)
                     return drugs
         except Exception as e:
             logging.error(f"An error occurred while fetching drugs from Neo4j: {e}")
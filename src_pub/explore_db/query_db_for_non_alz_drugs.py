@@ -9,6 +9,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from src_pub.utils.conn_neo4j import Neo4jConnection
+from src_pub.explore_db.search_drugs import ALZHEIMER_INDICATION_QUERY, fetch_drugs_matching, fetch_drugs_not_matching
 
 # Explicit logging configuration
 logging.basicConfig(
@@ -28,30 +29,23 @@ class Neo4jDrugExporter:
         """
         Fetch drug nodes from Neo4j database.
 
+        Drugs whose indication mentions Alzheimer's are looked up with the full-text index over
+        the Drug text fields instead of scanning and lowercasing the indication of every node.
+
         Args:
             exclude_alzheim (bool): If True, exclude nodes with 'indication' property containing 'alzheim'.
 
         Returns:
             list: A list of dictionaries, each containing drug properties.
         """
-        if exclude_alzheim:
-            query = """
-            MATCH (d:Drug)
-            WHERE NOT toLower(d.indication) CONTAINS 'alzheim' OR d.indication IS NULL OR d.indication = ''
-            RETURN d
-            """
-        else:
-            query = """
-            MATCH (d:Drug)
-            WHERE toLower(d.indication) CONTAINS 'alzheim'
-            RETURN d
-            """
-
         try:
             with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+                conn.ensure_schema()
                 with conn.driver.session() as session:
-                    result = session.run(query)
-                    drugs = [record["d"] for record in result]
+                    if exclude_alzheim:
+                        drugs = fetch_drugs_not_matching(session, ALZHEIMER_INDICATION_QUERY)
+                    else:
+                        drugs = fetch_drugs_matching(session, ALZHEIMER_INDICATION_QUERY)
                     return drugs
         except Exception as e:
             logging.error(f"An error occurred while fetching drugs from Neo4j: {e}")
@@ -0,0 +1,173 @@
+"""
+This module searches Drug nodes through the full-text index over their long text fields.
+
+The index `drug_text` is declared in `src_pub/utils/neo4j_schema.py` and covers indication,
+description, mechanismOfAction, pharmacodynamics and the LLM rating reasons. Queries use the
+Lucene syntax, e.g. 'amyloid AND tau', 'mechanismOfAction:acetylcholinesterase' or 'alzheim*'.
+The index analyzer lowercases both the text and the query terms, so searches are case-insensitive.
+
+Functions:
+    escape_lucene(text): Escape the Lucene special characters of a literal search term.
+    search_drugs(session, query, fields, limit, min_score): Return the ranked matching drugs.
+    fetch_drugs_matching(session, query): Return the Drug nodes matching a query.
+    fetch_drugs_not_matching(session, query): Return the Drug nodes not matching a query.
+
+Example usage:
+    $ python src_pub/explore_db/search_drugs.py "amyloid AND tau" --limit 20
+    $ python src_pub/explore_db/search_drugs.py "alzheim*" --field indication
+"""
+
+import os
+import re
+import sys
+import logging
+import argparse
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.neo4j_schema import FULLTEXT_INDEXES
+
+DRUG_TEXT_INDEX = 'drug_text'
+DRUG_TEXT_FIELDS = dict((name, props) for name, _, props in FULLTEXT_INDEXES)[DRUG_TEXT_INDEX]
+
+# Drugs whose indication mentions Alzheimer's disease, replaces toLower(d.indication) CONTAINS 'alzheim'
+ALZHEIMER_INDICATION_QUERY = 'indication:alzheim*'
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+
+
+def escape_lucene(text):
+    """
+    Escape the Lucene special characters of a literal search term.
+    """
+    return _LUCENE_SPECIAL.sub(r'\\\1', text)
+
+
+def _scope_query(query, fields):
+    """
+    Restrict a query to the given fields of the index.
+    """
+    unknown = [field for field in fields if field not in DRUG_TEXT_FIELDS]
+    if unknown:
+        raise ValueError(f"Not part of the full-text index '{DRUG_TEXT_INDEX}': {', '.join(unknown)}")
+    return ' OR '.join(f"{field}:({query})" for field in fields)
+
+
+def search_drugs(session, query, fields=None, limit=None, min_score=None):
+    """
+    Search Drug nodes with the full-text index and return them ranked by relevance.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used for the query.
+    query : str
+        A Lucene query, see the module docstring.
+    fields : list, optional
+        Only search these properties of the index, e.g. ['indication'].
+    limit : int, optional
+        Return at most this many drugs.
+    min_score : float, optional
+        Only return drugs with at least this relevance score.
+
+    Returns
+    -------
+    list
+        Dictionaries with the 'drugbankId', 'name' and 'score' of every matching drug, best first.
+    """
+    if fields:
+        query = _scope_query(query, fields)
+    result = session.run(
+        f"""
+        CALL db.index.fulltext.queryNodes($index, $search) YIELD node, score
+        WHERE $min_score IS NULL OR score >= $min_score
+        RETURN node.drugbankId AS drugbankId, node.name AS name, score
+        ORDER BY score DESC
+        {'LIMIT $limit' if limit else ''}
+        """,
+        index=DRUG_TEXT_INDEX, search=query, min_score=min_score, limit=limit,
+    )
+    return result.data()
+
+
+def fetch_drugs_matching(session, query):
+    """
+    Return the Drug nodes matching a full-text query, ranked by relevance.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used for the query.
+    query : str
+        A Lucene query, e.g. `ALZHEIMER_INDICATION_QUERY`.
+
+    Returns
+    -------
+    list
+        The matching Drug nodes.
+    """
+    result = session.run(
+        """
+        CALL db.index.fulltext.queryNodes($index, $search) YIELD node, score
+        RETURN node AS d
+        ORDER BY score DESC
+        """,
+        index=DRUG_TEXT_INDEX, search=query,
+    )
+    return [record["d"] for record in result]
+
+
+def fetch_drugs_not_matching(session, query):
+    """
+    Return the Drug nodes that do not match a full-text query, including drugs without any indexed text.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used for the query.
+    query : str
+        A Lucene query, e.g. `ALZHEIMER_INDICATION_QUERY`.
+
+    Returns
+    -------
+    list
+        The Drug nodes not matching the query.
+    """
+    result = session.run(
+        """
+        CALL db.index.fulltext.queryNodes($index, $search) YIELD node
+        WITH collect(elementId(node)) AS matching
+        MATCH (d:Drug)
+        WHERE NOT elementId(d) IN matching
+        RETURN d
+        """,
+        index=DRUG_TEXT_INDEX, search=query,
+    )
+    return [record["d"] for record in result]
+
+
+def main():
+    from src_pub.utils.conn_neo4j import Neo4jConnection
+
+    parser = argparse.ArgumentParser(description='Search Drug nodes with the full-text index.')
+    parser.add_argument('query', help="A Lucene query, e.g. 'amyloid AND tau'")
+    parser.add_argument('--field', action='append', dest='fields', choices=DRUG_TEXT_FIELDS,
+                        help='Only search this property, can be repeated')
+    parser.add_argument('--limit', type=int, default=25, help='Maximum number of drugs to return')
+    parser.add_argument('--min-score', type=float, help='Minimum relevance score')
+    args = parser.parse_args()
+
+    Neo4jConnection.setup_environment()
+    with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+        conn.ensure_schema()
+        with conn.driver.session() as session:
+            drugs = search_drugs(session, args.query, fields=args.fields, limit=args.limit, min_score=args.min_score)
+    for rank, drug in enumerate(drugs, start=1):
+        print(f"{rank:>3}. {drug['score']:7.3f}  {drug['drugbankId']}  {drug['name']}")
+    logging.info(f"Found {len(drugs)} drugs for '{args.query}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,16 +3,21 @@ import sys
 import requests
 import logging
 import time
-from neo4j import GraphDatabase, basic_auth
+import threading
 from dotenv import load_dotenv
 from requests.exceptions import RequestException
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the project root to sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
+from src_pub.utils.conn_neo4j import get_driver
+from src_pub.utils.batch_writer import BatchWriter
+from src_pub.gene_ontology_data.go_term_resolver import GoTermResolver, normalize_name
+from src_pub.gene_ontology_data.go_lookup_cache import GoLookupCache
+from src_pub.gene_ontology_data.quickgo_client import QUICKGO_SEARCH_URL, TIMEOUT, QuickGoLookupError, search_go_term_ids
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,20 +29,24 @@ logger = logging.getLogger(__name__)
 # Retry configuration
 MAX_RETRIES = 4
 BACKOFF_FACTOR = 2
-MAX_WORKERS = 10  # Number of threads to use
+MAX_WORKERS = 10  # Threads for the blocking remote lookups (without httpx) and the concurrent batch writes
+
+# Local ontology release (go-basic.obo or go.json) used before asking QuickGO, optional
+GO_ONTOLOGY_PATH = os.getenv("go_ontology_path")
+
+# Persistent cache of the name lookups, versioned by the ontology release (or QuickGO)
+GO_LOOKUP_CACHE_PATH = os.getenv("go_lookup_cache_path", os.path.join(project_root, 'datasets', 'go_lookup_cache.sqlite'))
+GO_LOOKUP_RELEASE = os.getenv("go_lookup_release", "quickgo")
+
+_resolver = None
+_resolver_lock = threading.Lock()
 
 def create_driver(uri, user, password):
-    return GraphDatabase.driver(
-        uri, 
-        auth=basic_auth(user, password),
-        max_connection_lifetime=30*60,  # 30 minutes
-        max_connection_pool_size=50,   # Adjust as needed
-        connection_timeout=300,        # 5 minutes
-        encrypted=False  # Set to True if using encryption
-    )
-# Function to get GO term ID from EBI QuickGO API
+    # Shared driver, the pool is configured with the NEO4J_* variables (see conn_neo4j)
+    return get_driver(uri, user, password)
+# Function to get GO term ID from EBI QuickGO API, None if there is none; raises QuickGoLookupError if the lookup fails
 def get_go_term_id(term_name):
-    url = "https://www.ebi.ac.uk/QuickGO/services/ontology/go/search"
+    url = QUICKGO_SEARCH_URL
     params = {
         'query': term_name,
         'limit': 1,  # Number of results to return
@@ -49,7 +58,7 @@ def get_go_term_id(term_name):
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = requests.get(url, params=params, headers=headers, timeout=TIMEOUT)
             if response.status_code == 200:
                 results = response.json()
                 if results['results']:
@@ -60,96 +69,154 @@ def get_go_term_id(term_name):
                     logger.warning(f"No GO term ID found for '{term_name}'")
                     return None
             else:
-                logger.error(f"Failed to fetch GO term ID for '{term_name}', status code: {response.status_code}")
-                return None
+                raise QuickGoLookupError(f"Failed to fetch GO term ID for '{term_name}', status code: {response.status_code}")
         except RequestException as e:
             wait_time = BACKOFF_FACTOR ** attempt
             logger.error(f"Request failed (attempt {attempt + 1}/{MAX_RETRIES}) for '{term_name}': {e}. Retrying in {wait_time} seconds...")
             time.sleep(wait_time)
 
     logger.critical(f"All retry attempts failed for '{term_name}'")
-    return None
-
-# Function to process a single node with retry logic
-def process_single_node_with_retry(record, session):
-    node = record['n']
-    node_id = node.id
-
-    # Check if the node already has 'affectedGoProcessId' property
-    if 'affectedGoProcessId' in node and node['affectedGoProcessId'] is not None:
-        logger.info(f"Node {node_id} already has 'affectedGoProcessId' property. Skipping...")
-        return
-
-    affected_go_processes = node['affectedGoProcess']
-    logger.info(f"Node {node_id} affectedGoProcess: {affected_go_processes}")
-    go_term_ids = []
-    processes = []
-
+    raise QuickGoLookupError(f"All retry attempts failed for '{term_name}'")
+
+UPDATE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (n:Drug {drugbankId: row.drugbankId})
+    SET n.affectedGoProcessId = row.go_term_ids
+"""
+
+# Keyset pagination over the unique drugbankId: each page starts after the last id of the previous
+# one, so the updates of earlier pages cannot shift later pages (as they do with SKIP)
+DRUG_PAGE_QUERY = """
+    MATCH (n:Drug)
+    WHERE n.drugbankId > $after
+      AND n.affectedGoProcess IS NOT NULL AND size(n.affectedGoProcess) > 0 AND n.affectedGoProcessId IS NULL
+    RETURN n.drugbankId AS drugbankId, n.affectedGoProcess AS processes
+    ORDER BY n.drugbankId
+    LIMIT $limit
+"""
+
+def get_resolver():
+    """
+    Return the resolver of the local ontology release, None if go_ontology_path is not set.
+    """
+    global _resolver
+    if GO_ONTOLOGY_PATH and _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = GoTermResolver.from_file(GO_ONTOLOGY_PATH, namespace='biological_process')
+                logger.info(f"Resolving GO terms with the local release {_resolver.release}, QuickGO only on a miss")
+    return _resolver
+
+# Function to resolve GO term names, locally if possible and the rest with one QuickGO run;
+# names whose lookup failed are left out, so that they are not cached as having no GO term
+def resolve_go_terms(term_names):
+    resolver = get_resolver()
+    go_term_ids = {}
+    remote_names = []
+    for term_name in term_names:
+        go_term_id = resolver.resolve_local(term_name)[0] if resolver is not None else None
+        if go_term_id is None:
+            remote_names.append(term_name)
+        else:
+            go_term_ids[term_name] = go_term_id
+    logger.info(f"{len(go_term_ids)} GO term names resolved locally, {len(remote_names)} left for QuickGO")
+
+    if remote_names:
+        try:
+            # Rate-limited asynchronous client, configured with the QUICKGO_* variables
+            go_term_ids.update(search_go_term_ids(remote_names))
+        except ImportError as e:
+            logger.warning(f"{e} Falling back to blocking requests.")
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                go_term_ids.update(pair for pair in executor.map(lookup_go_term_id, remote_names) if pair is not None)
+    return go_term_ids
+
+# Function to look up one name with blocking requests, None if the lookup failed
+def lookup_go_term_id(term_name):
+    try:
+        return term_name, get_go_term_id(term_name)
+    except QuickGoLookupError as e:
+        logger.error(e)
+        return None
+
+DRUG_PROCESSES_QUERY = """
+    MATCH (n:Drug)
+    WHERE n.affectedGoProcess IS NOT NULL AND size(n.affectedGoProcess) > 0 AND n.affectedGoProcessId IS NULL
+    RETURN n.affectedGoProcess AS processes
+"""
+
+# Function to split the 'affectedGoProcess' property into process names
+def split_processes(affected_go_processes):
     if isinstance(affected_go_processes, str):
         processes = affected_go_processes.split(',')
     elif isinstance(affected_go_processes, list):
         processes = affected_go_processes
-
-    for process in processes:
-        process = process.strip()
-        go_term_id = get_go_term_id(process)
-        if go_term_id:
-            go_term_ids.append(go_term_id)
-
-    for attempt in range(MAX_RETRIES):
-        try:
-            logger.info(f"Updating node {node_id} with GO term IDs: {go_term_ids}")
-            update_result = session.run(
-                "MATCH (n) WHERE id(n)=$id SET n.affectedGoProcessId = $go_term_ids RETURN n", 
-                id=node_id, go_term_ids=go_term_ids)
-            if update_result.single() is not None:
-                logger.info(f"Successfully updated node {node_id} with affectedGoProcessId.")
-                return
-            else:
-                logger.error(f"Failed to update node {node_id}.")
-                return
-        except Exception as e:
-            wait_time = BACKOFF_FACTOR ** attempt
-            logger.error(f"Error updating node {node_id} (attempt {attempt + 1}/{MAX_RETRIES}): {e}. Retrying in {wait_time} seconds...")
-            time.sleep(wait_time)
-    logger.critical(f"All retry attempts failed for updating node {node_id}")
+    else:
+        processes = []
+    return [process.strip() for process in processes if process and process.strip()]
+
+# Function to collect the distinct process names of the drugs still to map
+def collect_process_names(session):
+    names = set()
+    for record in session.run(DRUG_PROCESSES_QUERY):
+        names.update(split_processes(record['processes']))
+    return names
+
+# Function to resolve every distinct process name once, through the persistent cache
+def resolve_process_names(names):
+    resolver = get_resolver()
+    release = resolver.release if resolver is not None else GO_LOOKUP_RELEASE
+    with GoLookupCache(GO_LOOKUP_CACHE_PATH, release) as cache:
+        go_term_ids = cache.resolve_all(names, resolve_many=resolve_go_terms)
+        logger.info(f"GO lookup cache {GO_LOOKUP_CACHE_PATH} (release {release}): {cache.stats}")
+    return go_term_ids
+
+# Function to resolve the GO term IDs of a single drug from the resolved names; None if the lookup
+# of one of its names failed, so that the drug keeps no affectedGoProcessId and is mapped on the next run
+def resolve_go_term_ids(record, go_term_lookup):
+    go_term_ids = []
+    for process in split_processes(record['processes']):
+        name = normalize_name(process)
+        if name not in go_term_lookup:
+            logger.warning(f"Drug {record['drugbankId']} is left for the next run, the lookup of '{process}' failed")
+            return None
+        if go_term_lookup[name]:
+            go_term_ids.append(go_term_lookup[name])
+
+    logger.debug(f"Drug {record['drugbankId']} GO term IDs: {go_term_ids}")
+    return {'drugbankId': record['drugbankId'], 'go_term_ids': go_term_ids}
+
+# Function to read the drugs still to map page by page, ordered by drugbankId
+def iter_drug_pages(driver, batch_size):
+    after = ''
+    while True:
+        records, _, _ = driver.execute_query(DRUG_PAGE_QUERY, after=after, limit=batch_size, routing_='r')
+        if not records:
+            return
+        yield records
+        after = records[-1]['drugbankId']
 
 # Function to process nodes in Neo4j in batches
 def process_nodes_in_batches(uri, user, password, batch_size=50):
     driver = create_driver(uri, user, password)
     with driver.session() as session:
-        logger.info("Running query to count nodes with label 'Drug' and non-null, non-empty 'affectedGoProcess' property.")
-        count_result = session.run("MATCH (n:Drug) WHERE n.affectedGoProcess IS NOT NULL AND size(n.affectedGoProcess) > 0 RETURN count(n) AS count")
-        total_nodes = count_result.single()["count"]
-        logger.info(f"Total nodes to process: {total_nodes}")
-
-        total_batches = (total_nodes // batch_size) + 1
-        for batch in range(total_batches):
-            logger.info(f"Processing batch {batch + 1} of {total_batches}")
-            try:
-                result = session.run(
-                    "MATCH (n:Drug) WHERE n.affectedGoProcess IS NOT NULL AND size(n.affectedGoProcess) > 0 "
-                    "RETURN n SKIP $skip LIMIT $limit",
-                    skip=batch * batch_size, limit=batch_size)
-            except Exception as e:
-                logger.error(f"Error executing query for batch {batch + 1}: {e}")
-                time.sleep(10)  # Wait before retrying
-                continue
-
-            nodes_processed = 0
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                future_to_record = {executor.submit(process_single_node_with_retry, record, session): record for record in result}
-                for future in as_completed(future_to_record):
-                    record = future_to_record[future]
-                    try:
-                        future.result()
-                        nodes_processed += 1
-                    except Exception as e:
-                        logger.error(f"Error processing node {record['n'].id}: {e}")
-
-            logger.info(f"Batch {batch + 1} processed: {nodes_processed} nodes")
-
-    driver.close()
+        # Pre-pass: each distinct process name is looked up once, not once per drug
+        process_names = collect_process_names(session)
+    logger.info(f"Resolving {len(process_names)} distinct GO process names")
+    go_term_lookup = resolve_process_names(process_names)
+
+    # The writer buffers the rows of consecutive pages and sends one UNWIND write per batch_size
+    # rows, so a batch can span pages when drugs with failed lookups are skipped; the batches are
+    # independent, so up to MAX_WORKERS of them are written concurrently, each in its own session
+    writer = BatchWriter(driver, UPDATE_QUERY, batch_size=batch_size, max_in_flight=MAX_WORKERS,
+                         name='affectedGoProcessId writer')
+    with writer:
+        for batch, records in enumerate(iter_drug_pages(driver, batch_size), start=1):
+            rows = [row for row in (resolve_go_term_ids(record, go_term_lookup) for record in records) if row is not None]
+            writer.write(rows)
+            logger.info(f"Batch {batch} queued: {len(rows)} of {len(records)} drugs, up to {records[-1]['drugbankId']}")
+
+    logger.info(f"affectedGoProcessId set on {writer.totals['rows']} drugs")
 
 
 # Connection details
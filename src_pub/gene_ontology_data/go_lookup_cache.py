@@ -0,0 +1,203 @@
+"""
+This module stores the results of GO term name lookups in a persistent SQLite cache.
+
+Every distinct process name is resolved once per ontology release: the GO ID found, or the fact
+that none was found (a negative result), is written to the cache, and later runs read it from
+there instead of asking the resolver or QuickGO again. Failed lookups (errors, exhausted
+retries) are not cached, so those names are looked up again on the next run. Entries are keyed
+by the release, so a new ontology release (or a different remote service) starts with an empty
+cache while the entries of the old release stay available for reproducing older runs.
+
+Names are cached in their normalized form (see `go_term_resolver.normalize_name`).
+
+Classes:
+    GoLookupCache: The SQLite cache of name lookups of one release.
+
+Example usage:
+    from src_pub.gene_ontology_data.go_lookup_cache import GoLookupCache
+
+    with GoLookupCache('datasets/go_lookup_cache.sqlite', release='releases/2024-01-17') as cache:
+        go_ids = cache.resolve_all(names, get_go_term_id)   # name -> GO ID or None, failed names missing
+"""
+
+import os
+import sys
+import time
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.gene_ontology_data.go_term_resolver import normalize_name
+
+SQLITE_MAX_VARIABLES = 900  # Names per SELECT, below the SQLite parameter limit
+
+_FAILED = object()  # Result of a `resolve` call that raised
+
+
+class GoLookupCache:
+    """
+    A persistent cache of GO term name lookups for one ontology release.
+
+    Attributes
+    ----------
+    path : str
+        The SQLite database file.
+    release : str
+        The ontology release or service the cached results belong to.
+    negative_ttl : float
+        Seconds after which a negative result is looked up again. None keeps them forever.
+    stats : dict
+        The number of 'hits', 'negative_hits', 'misses' and 'failed' lookups of `resolve_all`.
+
+    Methods
+    -------
+    get_many(names):
+        Returns the cached results of the names.
+    put_many(results):
+        Stores results, None for names without GO ID.
+    resolve_all(names, resolve, max_workers, resolve_many):
+        Returns the GO ID of every name, resolving each uncached name once.
+    close():
+        Closes the database.
+    """
+
+    def __init__(self, path, release, negative_ttl=None):
+        self.path = path
+        self.release = release or 'unversioned'
+        self.negative_ttl = negative_ttl
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'failed': 0}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS go_lookups ("
+            "release TEXT NOT NULL, name TEXT NOT NULL, go_id TEXT, resolved_at REAL NOT NULL, "
+            "PRIMARY KEY (release, name))"
+        )
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get_many(self, names):
+        """
+        Returns the cached results of the names.
+
+        Parameters
+        ----------
+        names : iterable
+            Term names, normalized before the lookup.
+
+        Returns
+        -------
+        dict
+            normalized name -> GO ID, or None for a cached negative result. Names that are not
+            cached, or whose negative result expired, are missing.
+        """
+        names = sorted({normalize_name(name) for name in names})
+        expired_before = time.time() - self.negative_ttl if self.negative_ttl is not None else None
+        found = {}
+        for start in range(0, len(names), SQLITE_MAX_VARIABLES):
+            chunk = names[start:start + SQLITE_MAX_VARIABLES]
+            rows = self._db.execute(
+                f"SELECT name, go_id, resolved_at FROM go_lookups WHERE release = ? AND name IN ({', '.join('?' * len(chunk))})",
+                [self.release, *chunk],
+            )
+            for name, go_id, resolved_at in rows:
+                if go_id is None and expired_before is not None and resolved_at < expired_before:
+                    continue
+                found[name] = go_id
+        return found
+
+    def put_many(self, results):
+        """
+        Stores lookup results.
+
+        Parameters
+        ----------
+        results : dict
+            name -> GO ID, or None if the name has no GO ID.
+        """
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO go_lookups (release, name, go_id, resolved_at) VALUES (?, ?, ?, ?)",
+            [(self.release, normalize_name(name), go_id, now) for name, go_id in results.items()],
+        )
+        self._db.commit()
+
+    def resolve_all(self, names, resolve=None, max_workers=1, resolve_many=None):
+        """
+        Returns the GO ID of every name, resolving each uncached name once.
+
+        Parameters
+        ----------
+        names : iterable
+            Term names, duplicates are resolved once.
+        resolve : callable
+            Returns the GO ID of a name, or None if the name has no GO term, and raises if the
+            lookup fails, e.g. `GO_term_mapping.get_go_term_id`.
+        max_workers : int
+            The number of threads calling `resolve` for the uncached names.
+        resolve_many : callable
+            Used instead of `resolve`: returns a dict of the GO IDs (or None) of a list of names,
+            leaving out the names whose lookup failed, e.g. to resolve all uncached names with
+            one asynchronous client.
+
+        Returns
+        -------
+        dict
+            normalized name -> GO ID or None. Names whose lookup failed are missing and are not
+            cached.
+        """
+        distinct = {}
+        for name in names:
+            distinct.setdefault(normalize_name(name), name)
+        results = self.get_many(distinct)
+        missing = [name for name in distinct if name not in results]
+        self.stats['hits'] += sum(go_id is not None for go_id in results.values())
+        self.stats['negative_hits'] += sum(go_id is None for go_id in results.values())
+        self.stats['misses'] += len(missing)
+        logging.info(
+            f"{len(distinct)} distinct GO term names: {len(results)} cached for release {self.release}, "
+            f"{len(missing)} to resolve"
+        )
+        if missing:
+            originals = [distinct[name] for name in missing]
+            if resolve_many is not None:
+                found = resolve_many(originals)
+            else:
+                def resolve_or_fail(name):
+                    try:
+                        return name, resolve(name)
+                    except Exception as e:
+                        logging.warning(f"Lookup of '{name}' failed, it is not cached: {e}")
+                        return name, _FAILED
+
+                if max_workers > 1:
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        found = dict(executor.map(resolve_or_fail, originals))
+                else:
+                    found = dict(map(resolve_or_fail, originals))
+            new_results = {
+                name: found[original] for name, original in zip(missing, originals)
+                if original in found and found[original] is not _FAILED
+            }
+            self.stats['failed'] += len(missing) - len(new_results)
+            self.put_many(new_results)
+            results.update(new_results)
+        return results
@@ -0,0 +1,424 @@
+"""
+This module resolves GO term names to GO IDs offline, from a local release of the Gene Ontology.
+
+The ontology (`go-basic.obo` or `go.json`, optionally gzipped) is parsed once into an index
+file next to it, `<ontology file>.index.json`, which maps every normalized term name and
+synonym to its GO ID. Names of obsolete terms map to the term that replaces them. The index is
+rebuilt automatically when the ontology file changes, and records the ontology release
+(`data-version`), so that a mapping run can be reproduced against a pinned release.
+
+Names are normalized by lowercasing and collapsing whitespace. A name resolves, in this order,
+to the term with that name, to a term with it as EXACT, NARROW, BROAD or RELATED synonym, or to
+the replacement of an obsolete term with that name. Unresolved names can fall back to a remote
+lookup such as `GO_term_mapping.get_go_term_id`.
+
+Functions:
+    normalize_name(name): The normalized form used as index key.
+    parse_obo(path): Read the terms and the release of an OBO file.
+    parse_go_json(path): Read the terms and the release of an OBO Graphs JSON file.
+    build_index(terms, release): Build the name and ID index of the parsed terms.
+    load_or_build_index(ontology_path, index_path): Load the index, rebuilding it if outdated.
+
+Classes:
+    GoTermResolver: Resolves names and IDs with the index, with an optional remote fallback.
+
+Example usage:
+    from src_pub.gene_ontology_data.go_term_resolver import GoTermResolver
+
+    resolver = GoTermResolver.from_file('datasets/go-basic.obo', fallback=get_go_term_id)
+    resolver.resolve('programmed cell death')   # 'GO:0012501'
+
+    $ python src_pub/gene_ontology_data/go_term_resolver.py datasets/go-basic.obo "apoptosis"
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import logging
+import argparse
+import threading
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+INDEX_FORMAT_VERSION = 3
+
+# Match kinds in resolution order
+MATCH_KINDS = ('name', 'EXACT', 'NARROW', 'BROAD', 'RELATED', 'obsolete')
+
+_SYNONYM = re.compile(r'^"((?:[^"\\]|\\.)*)"\s+(EXACT|NARROW|BROAD|RELATED)\b')
+_WHITESPACE = re.compile(r'\s+')
+_OBO_IRI = re.compile(r'^http://purl\.obolibrary\.org/obo/([A-Za-z]+)_(\w+)$')
+
+# OBO Graphs predicates
+_JSON_SYNONYM_SCOPES = {
+    'hasExactSynonym': 'EXACT',
+    'hasNarrowSynonym': 'NARROW',
+    'hasBroadSynonym': 'BROAD',
+    'hasRelatedSynonym': 'RELATED',
+}
+_JSON_REPLACED_BY = 'http://purl.obolibrary.org/obo/IAO_0100001'
+_JSON_NAMESPACE = 'http://www.geneontology.org/formats/oboInOwl#hasOBONamespace'
+_JSON_ALT_ID = 'http://www.geneontology.org/formats/oboInOwl#hasAlternativeId'
+
+
+def normalize_name(name):
+    """
+    Return the normalized form of a term name used as index key.
+    """
+    return _WHITESPACE.sub(' ', name).strip().lower()
+
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _new_term(go_id):
+    return {'id': go_id, 'name': None, 'namespace': None, 'obsolete': False, 'replaced_by': [],
+            'alt_ids': [], 'synonyms': []}
+
+
+def parse_obo(path):
+    """
+    Read the terms and the release of an OBO file, e.g. go-basic.obo.
+
+    Parameters
+    ----------
+    path : str
+        The path of the OBO file, optionally gzipped.
+
+    Returns
+    -------
+    tuple
+        (terms, release): a list of term dictionaries with 'id', 'name', 'namespace',
+        'obsolete', 'replaced_by', 'alt_ids' and 'synonyms' ((text, scope) tuples), and the
+        data-version of the file or None.
+    """
+    terms = []
+    release = None
+    term = None
+    in_header = True
+    with _open_text(path) as obo:
+        for line in obo:
+            line = line.strip()
+            if not line or line.startswith('!'):
+                continue
+            if line.startswith('['):
+                in_header = False
+                term = None
+                if line == '[Term]':
+                    term = _new_term(None)
+                    terms.append(term)
+                continue
+            tag, _, value = line.partition(':')
+            value = value.strip()
+            if in_header:
+                if tag == 'data-version':
+                    release = value
+                continue
+            if term is None:
+                continue
+            if tag == 'synonym':
+                match = _SYNONYM.match(value)
+                if match:
+                    term['synonyms'].append((match.group(1).replace('\\"', '"'), match.group(2)))
+                continue
+            value = value.split(' ! ')[0].strip()
+            if tag == 'id':
+                term['id'] = value
+            elif tag == 'name':
+                term['name'] = value
+            elif tag == 'namespace':
+                term['namespace'] = value
+            elif tag == 'is_obsolete':
+                term['obsolete'] = value == 'true'
+            elif tag == 'replaced_by':
+                term['replaced_by'].append(value)
+            elif tag == 'alt_id':
+                term['alt_ids'].append(value)
+    return [term for term in terms if term['id']], release
+
+
+def _curie(value):
+    """
+    Return 'GO:0008150' for an OBO IRI like 'http://purl.obolibrary.org/obo/GO_0008150'.
+    """
+    match = _OBO_IRI.match(value)
+    return f"{match.group(1)}:{match.group(2)}" if match else value
+
+
+def parse_go_json(path):
+    """
+    Read the terms and the release of an OBO Graphs JSON file, e.g. go.json.
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON file, optionally gzipped.
+
+    Returns
+    -------
+    tuple
+        (terms, release), see `parse_obo`. The release is the version IRI of the graph.
+    """
+    with _open_text(path) as handle:
+        document = json.load(handle)
+    terms = []
+    release = None
+    for graph in document.get('graphs', []):
+        release = release or graph.get('meta', {}).get('version')
+        for node in graph.get('nodes', []):
+            go_id = _curie(node.get('id', ''))
+            if not go_id.startswith('GO:') or node.get('type', 'CLASS') != 'CLASS':
+                continue
+            meta = node.get('meta', {})
+            term = _new_term(go_id)
+            term['name'] = node.get('lbl')
+            term['obsolete'] = bool(meta.get('deprecated', False))
+            for synonym in meta.get('synonyms', []):
+                scope = _JSON_SYNONYM_SCOPES.get(synonym.get('pred'))
+                if scope and synonym.get('val'):
+                    term['synonyms'].append((synonym['val'], scope))
+            for prop in meta.get('basicPropertyValues', []):
+                if prop.get('pred') == _JSON_REPLACED_BY:
+                    term['replaced_by'].append(_curie(prop['val']))
+                elif prop.get('pred') == _JSON_NAMESPACE:
+                    term['namespace'] = prop['val']
+                elif prop.get('pred') == _JSON_ALT_ID:
+                    term['alt_ids'].append(prop['val'])
+            terms.append(term)
+    return terms, release
+
+
+def build_index(terms, release=None):
+    """
+    Build the name and ID index of the parsed terms.
+
+    Parameters
+    ----------
+    terms : list
+        Term dictionaries as returned by `parse_obo` or `parse_go_json`.
+    release : str, optional
+        The ontology release recorded in the index.
+
+    Returns
+    -------
+    dict
+        'format', 'release', 'names': normalized name -> [[GO ID, match kind], ...] in
+        resolution order, every term carrying the name (in file order within a match kind, so
+        that the namespace filter of the resolver can still choose among them), 'ids': GO ID or alternative ID -> current GO ID (None for obsolete
+        terms without replacement), 'terms': GO ID -> [name, namespace] of the live terms.
+    """
+    by_id = {term['id']: term for term in terms}
+
+    def current(go_id, seen=()):
+        term = by_id.get(go_id)
+        if term is None or not term['obsolete']:
+            return go_id
+        if len(term['replaced_by']) != 1 or go_id in seen:
+            return None
+        return current(term['replaced_by'][0], seen + (go_id,))
+
+    candidates = {}
+
+    def add(name, go_id, kind):
+        if not name or go_id is None:
+            return
+        found = candidates.setdefault(normalize_name(name), [])
+        if [go_id, kind] not in found:
+            found.append([go_id, kind])
+
+    ids = {}
+    live_terms = {}
+    for term in terms:
+        target = current(term['id'])
+        ids[term['id']] = target
+        for alt_id in term['alt_ids']:
+            ids.setdefault(alt_id, target)
+        if term['obsolete']:
+            # Obsolete terms are named 'obsolete <former name>', index the former name
+            name = term['name'] or ''
+            add(name[len('obsolete '):] if name.startswith('obsolete ') else name, target, 'obsolete')
+            for text, _ in term['synonyms']:
+                add(text, target, 'obsolete')
+            continue
+        live_terms[term['id']] = [term['name'], term['namespace']]
+        add(term['name'], term['id'], 'name')
+        for text, scope in term['synonyms']:
+            add(text, term['id'], scope)
+
+    names = {
+        name: sorted(found, key=lambda candidate: MATCH_KINDS.index(candidate[1]))
+        for name, found in candidates.items()
+    }
+    return {'format': INDEX_FORMAT_VERSION, 'release': release, 'names': names, 'ids': ids, 'terms': live_terms}
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+
+def load_or_build_index(ontology_path, index_path=None):
+    """
+    Load the index of an ontology file, building it if it is missing or outdated.
+
+    Parameters
+    ----------
+    ontology_path : str
+        The path of go-basic.obo, go.obo or go.json, optionally gzipped.
+    index_path : str, optional
+        Where the index is stored, default `<ontology_path>.index.json`.
+
+    Returns
+    -------
+    dict
+        The index, see `build_index`.
+    """
+    index_path = index_path or f"{ontology_path}.index.json"
+    stamp = _source_stamp(ontology_path)
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as handle:
+            index = json.load(handle)
+        if index.get('format') == INDEX_FORMAT_VERSION and index.get('source') == stamp:
+            logging.info(f"Loaded GO index of release {index['release']} from {index_path}")
+            return index
+
+    logging.info(f"Building GO index from {ontology_path}")
+    parse = parse_go_json if ontology_path.endswith(('.json', '.json.gz')) else parse_obo
+    terms, release = parse(ontology_path)
+    index = build_index(terms, release)
+    index['source'] = stamp
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump(index, handle)
+    os.replace(tmp_path, index_path)
+    logging.info(f"Indexed {len(index['terms'])} GO terms and {len(index['names'])} names of release {release} in {index_path}")
+    return index
+
+
+class GoTermResolver:
+    """
+    Resolves GO term names and IDs with a local index.
+
+    Attributes
+    ----------
+    index : dict
+        The index, see `build_index`.
+    release : str
+        The ontology release of the index.
+    fallback : callable
+        Called with the name on a miss, e.g. a remote lookup. None disables it.
+    kinds : tuple
+        The match kinds accepted, see `MATCH_KINDS`.
+    namespace : str
+        Only resolve to terms of this namespace, e.g. 'biological_process'. None accepts all.
+    stats : dict
+        The number of 'local' hits, 'fallback' lookups and 'unresolved' names.
+
+    Methods
+    -------
+    from_file(ontology_path, index_path=None, **kwargs):
+        Classmethod, creates a resolver from an ontology file.
+    resolve(name):
+        Returns the GO ID of a term name, or None.
+    resolve_local(name):
+        Returns the GO ID and match kind from the index only, or (None, None).
+    resolve_id(go_id):
+        Returns the current GO ID for an ID, alternative ID or obsolete ID.
+    """
+
+    def __init__(self, index, fallback=None, kinds=MATCH_KINDS, namespace=None):
+        self.index = index
+        self.release = index.get('release')
+        self.fallback = fallback
+        self.kinds = tuple(kinds)
+        self.namespace = namespace
+        self.stats = {'local': 0, 'fallback': 0, 'unresolved': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, ontology_path, index_path=None, **kwargs):
+        """
+        Creates a resolver from an ontology file, see `load_or_build_index`.
+        """
+        return cls(load_or_build_index(ontology_path, index_path), **kwargs)
+
+    def _count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def resolve_local(self, name):
+        """
+        Returns the GO ID and match kind of a term name from the index only.
+
+        Returns
+        -------
+        tuple
+            (GO ID, match kind), or (None, None) if the name is not in the index.
+        """
+        for go_id, kind in self.index['names'].get(normalize_name(name), []):
+            if kind not in self.kinds:
+                continue
+            if self.namespace and self.index['terms'].get(go_id, [None, None])[1] != self.namespace:
+                continue
+            return go_id, kind
+        return None, None
+
+    def resolve(self, name):
+        """
+        Returns the GO ID of a term name, asking the fallback on a miss.
+
+        Parameters
+        ----------
+        name : str
+            The term name, e.g. a DrugBank GO classifier description.
+
+        Returns
+        -------
+        str
+            The GO ID, or None if neither the index nor the fallback resolve the name.
+        """
+        go_id, _ = self.resolve_local(name)
+        if go_id is not None:
+            self._count('local')
+            return go_id
+        if self.fallback is None:
+            self._count('unresolved')
+            return None
+        self._count('fallback')
+        logging.debug(f"'{name}' is not in the GO index of release {self.release}, using the fallback")
+        return self.fallback(name)
+
+    def resolve_id(self, go_id):
+        """
+        Returns the current GO ID for an ID, an alternative ID or the ID of an obsolete term.
+
+        Returns
+        -------
+        str
+            The current GO ID, None for unknown IDs and obsolete terms without replacement.
+        """
+        return self.index['ids'].get(go_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve GO term names with a local ontology file.')
+    parser.add_argument('ontology', help='go-basic.obo, go.obo or go.json, optionally gzipped')
+    parser.add_argument('names', nargs='+', help='Term names to resolve')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    resolver = GoTermResolver.from_file(args.ontology)
+    for name in args.names:
+        go_id, kind = resolver.resolve_local(name)
+        print(f"{name}\t{go_id or '-'}\t{kind or 'unresolved'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,6 @@ import os
 import sys
 import time
 import logging
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
 # Add the project root to sys.path
@@ -10,6 +9,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from src_pub.utils.logging_config import setup_logging
+from src_pub.utils.conn_neo4j import get_driver
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,14 +20,13 @@ logger = logging.getLogger(__name__)
 
 # Function to get the count of nodes with the affectedGoProcessId property
 def count_nodes_with_go_process_id(uri, user, password):
-    driver = GraphDatabase.driver(uri, auth=(user, password))
+    driver = get_driver(uri, user, password)
     with driver.session() as session:
         result = session.run(
             "MATCH (n:Drug) WHERE n.affectedGoProcessId IS NOT NULL RETURN count(n) AS count")
         count = result.single()["count"]
         logger.info(f"Number of nodes with affectedGoProcessId: {count}")
         return count
-    driver.close()
 
 # Connection details
 uri = os.getenv("uri")
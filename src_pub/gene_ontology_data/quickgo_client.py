@@ -0,0 +1,325 @@
+"""
+This module provides an asyncio client for the QuickGO GO term search, for the lookups that cannot be
+answered from the local ontology release or the lookup cache.
+
+The client keeps one pooled HTTP connection set (httpx) for all requests and limits them twice:
+
+    - a token bucket per host spreads the requests to at most `rate` per second (with bursts of up
+      to `burst`), so the lookups run at the allowed rate instead of tripping the throttling;
+    - a semaphore bounds the requests in flight to `concurrency`.
+
+Every request has a timeout. Timeouts, connection errors and 429/5xx responses are retried with
+exponential backoff; a `Retry-After` header (seconds or an HTTP date) takes precedence over the
+computed delay and also holds back the other requests to that host.
+
+The defaults are read from QUICKGO_RATE, QUICKGO_BURST, QUICKGO_CONCURRENCY and QUICKGO_TIMEOUT.
+httpx is only required when the client is used.
+
+Functions:
+    parse_retry_after(value, now): The delay in seconds requested by a Retry-After header.
+    search_go_term_ids(names, **config): Resolve names with a temporary client, from synchronous code.
+
+Classes:
+    QuickGoLookupError: A lookup failed, as opposed to finding no match.
+    TokenBucket: An asyncio token bucket.
+    QuickGoClient: The rate-limited asynchronous QuickGO search client.
+
+Example usage:
+    from src_pub.gene_ontology_data.quickgo_client import QuickGoClient
+
+    async with QuickGoClient(rate=10, concurrency=8) as client:
+        go_ids = await client.search_many(['apoptotic process', 'signal transduction'])   # failed names missing
+
+    # or from synchronous code
+    go_ids = search_go_term_ids(['apoptotic process'])
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed for the asynchronous client
+    httpx = None
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+QUICKGO_SEARCH_URL = "https://www.ebi.ac.uk/QuickGO/services/ontology/go/search"
+
+RATE = float(os.getenv("QUICKGO_RATE", 10))  # Requests per second per host
+BURST = int(os.getenv("QUICKGO_BURST", 10))  # Requests allowed at once after an idle period
+CONCURRENCY = int(os.getenv("QUICKGO_CONCURRENCY", 8))  # Requests in flight
+TIMEOUT = float(os.getenv("QUICKGO_TIMEOUT", 30))  # Seconds per request
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # Seconds before the first retry
+BACKOFF_FACTOR = 2
+MAX_BACKOFF = 60.0
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class QuickGoLookupError(Exception):
+    """
+    Raised when a QuickGO lookup fails, so that it is not mistaken for a name without GO term.
+    """
+
+
+def parse_retry_after(value, now=None):
+    """
+    Returns the delay in seconds requested by a Retry-After header.
+
+    Parameters
+    ----------
+    value : str
+        The header value, either delay seconds or an HTTP date.
+    now : float
+        The current Unix time, for HTTP dates.
+
+    Returns
+    -------
+    float
+        The delay, never negative, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket: `acquire` waits until a token is available.
+
+    Attributes
+    ----------
+    rate : float
+        Tokens added per second.
+    capacity : int
+        The maximum number of tokens, i.e. the burst size.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("The rate must be positive and the capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = max(self._updated, now)
+
+    def block(self, seconds):
+        """
+        Hands out no tokens for the next seconds, e.g. after a Retry-After response.
+        """
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        # Tokens start accumulating again once the block ends
+        self._tokens = min(self._tokens, 0.0)
+        self._updated = max(self._updated, self._blocked_until)
+
+    async def acquire(self):
+        """
+        Waits for a token and takes it. Waiters are served in order.
+        """
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class QuickGoClient:
+    """
+    Rate-limited asynchronous client for the QuickGO GO term search.
+
+    Attributes
+    ----------
+    search_url : str
+        The search endpoint.
+    stats : dict
+        The number of 'requests', 'retries', 'throttled' (429) responses and 'failed' lookups.
+
+    Methods
+    -------
+    search(term_name):
+        Returns the GO ID of the best match of a term name, raises QuickGoLookupError on failure.
+    search_many(names):
+        Returns the GO IDs of many names, concurrently within the limits, without the failed ones.
+    close():
+        Closes the connection pool.
+    """
+
+    def __init__(self, search_url=QUICKGO_SEARCH_URL, rate=RATE, burst=BURST, concurrency=CONCURRENCY,
+                 timeout=TIMEOUT, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, client=None):
+        if httpx is None:
+            raise ImportError("The asynchronous QuickGO client requires httpx. Install it with 'pip install httpx'.")
+        self.search_url = search_url
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'failed': 0}
+        self._buckets = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            headers={'Accept': 'application/json'},
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the connection pool.
+        """
+        await self._client.aclose()
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def _backoff(self, attempt):
+        delay = min(MAX_BACKOFF, self.backoff_base * BACKOFF_FACTOR ** attempt)
+        return delay * (0.5 + random.random() / 2)
+
+    async def search(self, term_name):
+        """
+        Returns the GO ID of the best match of a term name.
+
+        Parameters
+        ----------
+        term_name : str
+            The term name to search for.
+
+        Returns
+        -------
+        str
+            The GO ID, or None if there is no match.
+
+        Raises
+        ------
+        QuickGoLookupError
+            If QuickGO answers with an error status or the request failed after all retries.
+        """
+        params = {'query': term_name, 'limit': 1, 'ontology': 'go'}
+        bucket = self._bucket(self.search_url)
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                await bucket.acquire()
+                self.stats['requests'] += 1
+                try:
+                    response = await self._client.get(self.search_url, params=params)
+                except httpx.TransportError as e:  # Timeouts and connection errors
+                    delay = self._backoff(attempt)
+                    logging.warning(f"QuickGO request for '{term_name}' failed (attempt {attempt + 1}): {e!r}")
+                else:
+                    if response.status_code == 200:
+                        results = response.json().get('results') or []
+                        if results:
+                            return results[0]['id']
+                        logging.debug(f"No GO term ID found for '{term_name}'")
+                        return None
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        self.stats['failed'] += 1
+                        raise QuickGoLookupError(
+                            f"Failed to fetch GO term ID for '{term_name}', status code: {response.status_code}"
+                        )
+                    if response.status_code == 429:
+                        self.stats['throttled'] += 1
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is not None:
+                        delay = min(retry_after, MAX_BACKOFF)
+                        bucket.block(delay)
+                    else:
+                        delay = self._backoff(attempt)
+                    logging.warning(f"QuickGO answered {response.status_code} for '{term_name}' (attempt {attempt + 1})")
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
+
+        logging.critical(f"All retry attempts failed for '{term_name}'")
+        self.stats['failed'] += 1
+        raise QuickGoLookupError(f"All retry attempts failed for '{term_name}'")
+
+    async def search_many(self, names):
+        """
+        Returns the GO IDs of many names, concurrently within the rate and concurrency limits.
+
+        Parameters
+        ----------
+        names : iterable
+            The term names, duplicates are searched once.
+
+        Returns
+        -------
+        dict
+            name -> GO ID, or None if there is no match. Names whose lookup failed are left out,
+            so that they are not taken for names without GO term.
+        """
+        names = list(dict.fromkeys(names))
+        results = await asyncio.gather(*(self.search(name) for name in names), return_exceptions=True)
+        go_ids = {}
+        for name, result in zip(names, results):
+            if isinstance(result, QuickGoLookupError):
+                logging.error(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                go_ids[name] = result
+        logging.info(f"QuickGO lookups of {len(names)} names: {self.stats}")
+        return go_ids
+
+
+def search_go_term_ids(names, **config):
+    """
+    Resolves names with a temporary client, for synchronous callers.
+
+    Parameters
+    ----------
+    names : iterable
+        The term names.
+    **config
+        Keyword arguments of `QuickGoClient`.
+
+    Returns
+    -------
+    dict
+        name -> GO ID or None, without the names whose lookup failed.
+    """
+    async def run():
+        async with QuickGoClient(**config) as client:
+            return await client.search_many(names)
+
+    return asyncio.run(run())
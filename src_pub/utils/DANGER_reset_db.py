@@ -7,8 +7,10 @@ import sys
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
-from src.utils.logging_config import setup_logging
-from src.utils.conn_neo4j import Neo4jConnection
+from src_pub.utils.logging_config import setup_logging
+from src_pub.utils.conn_neo4j import Neo4jConnection
+from src_pub.utils.neo4j_schema import apply_schema, verify_schema
+from src_pub.utils.graph_stats import count_nodes, count_relationships
 
 def confirm_deletion(uri):
     """
@@ -42,18 +44,16 @@ def check_database_empty(session):
         True if the database is empty, False otherwise.
     """
     # Check node count
-    node_result = session.run("MATCH (n) RETURN COUNT(n) AS node_count").single()
-    node_count = node_result["node_count"]
+    node_count = count_nodes(session)
     logging.info(f"Node count after deletion: {node_count}")
 
     # Check relationship count
-    relationship_result = session.run("MATCH ()-[r]->() RETURN COUNT(r) AS relationship_count").single()
-    relationship_count = relationship_result["relationship_count"]
+    relationship_count = count_relationships(session)
     logging.info(f"Relationship count after deletion: {relationship_count}")
 
-    # Check index count
+    # Check index count, the built-in token lookup indexes are kept
     index_result = session.run("SHOW INDEXES").data()
-    index_count = len(index_result)
+    index_count = sum(index.get('type') != 'LOOKUP' for index in index_result)
     logging.info(f"Index count after deletion: {index_count}")
 
     # Check constraint count
@@ -70,28 +70,59 @@ def drop_all_indexes_and_constraints(session):
     """
     Drops all indexes and constraints in the Neo4j database.
 
+    The built-in LOOKUP indexes of node labels and relationship types are kept, Neo4j needs them
+    to find nodes by label without a full scan and does not recreate them by itself.
+
     Parameters
     ----------
     session : neo4j.Session
         The Neo4j session to use for dropping indexes and constraints.
     """
-    # Drop all indexes
+    # Drop all constraints first, the indexes backing them are dropped with them
+    constraints = session.run("SHOW CONSTRAINTS").data()
+    for constraint in constraints:
+        constraint_name = constraint['name']
+        session.run(f"DROP CONSTRAINT {constraint_name}")
+        logging.info(f"Dropped constraint: {constraint_name}")
+
+    # Drop all remaining indexes except the token lookup indexes
     indexes = session.run("SHOW INDEXES").data()
     for index in indexes:
         index_name = index['name']
+        if index.get('type') == 'LOOKUP':
+            logging.info(f"Kept token lookup index: {index_name}")
+            continue
         session.run(f"DROP INDEX {index_name}")
         logging.info(f"Dropped index: {index_name}")
 
-    # Drop all constraints
-    constraints = session.run("SHOW CONSTRAINTS").data()
-    for constraint in constraints:
-        constraint_name = constraint['name']
-        session.run(f"DROP CONSTRAINT {constraint_name}")
-        logging.info(f"Dropped constraint: {constraint_name}")
 
-def delete_all_nodes():
+def restore_schema(session):
+    """
+    Recreates the project's constraints and indexes after `drop_all_indexes_and_constraints`.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The Neo4j session to use for creating the constraints and indexes.
+
+    Returns
+    -------
+    bool
+        True if the restored schema is complete and all indexes are online.
+    """
+    logging.info("Restoring the project's constraints and indexes.")
+    apply_schema(session)
+    return verify_schema(session)
+
+def delete_all_nodes(restore=True):
     """
     Deletes all nodes and relationships in the Neo4j database.
+
+    Parameters
+    ----------
+    restore : bool
+        Recreate the project's constraints and indexes on the empty database afterwards,
+        so that the next ingest starts with indexed MERGE keys.
     """
     # Setup environment and logging
     Neo4jConnection.setup_environment()
@@ -128,6 +159,9 @@ def delete_all_nodes():
                         logging.info("The database is now empty.")
                     else:
                         logging.warning("The database is not empty after the deletion operation.")
+
+                    if restore:
+                        restore_schema(session)
             except Exception as e:
                 logging.error(f"An error occurred while deleting nodes: {e}")
                 raise
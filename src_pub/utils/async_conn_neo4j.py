@@ -0,0 +1,314 @@
+"""
+This module provides an asyncio variant of `Neo4jConnection`, built on the async Neo4j driver.
+
+Database calls of an `AsyncNeo4jConnection` are awaitable, so an asyncio pipeline can overlap
+them with HTTP-bound stages (QuickGO lookups, ClinicalTrials.gov fetches, Ollama calls) and keep
+many operations in flight on a single event loop. All of them share the connection pool of one
+driver; `max_in_flight` bounds how many batches `write_batches` sends concurrently.
+
+The async driver is bound to the event loop it is used on, so unlike the synchronous drivers it
+is not shared process-wide: each connection owns its driver and closes it on exit.
+
+Example usage:
+    import asyncio
+    from src_pub.utils.async_conn_neo4j import AsyncNeo4jConnection
+
+    async def main():
+        async with AsyncNeo4jConnection(URI, USERNAME, PASSWORD) as conn:
+            drugs = await conn.read("MATCH (d:Drug) RETURN d.drugbankId AS id LIMIT $n", n=10)
+            await conn.write_batches(
+                "UNWIND $rows AS row MATCH (d:Drug {drugbankId: row.id}) SET d.flag = row.flag",
+                rows,
+            )
+
+    asyncio.run(main())
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+from neo4j import AsyncGraphDatabase, basic_auth
+from neo4j.exceptions import Neo4jError
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.conn_neo4j import DRIVER_CONFIG
+from src_pub.utils.neo4j_schema import schema_statements, INDEX_ONLINE_TIMEOUT
+
+DEFAULT_BATCH_SIZE = 500  # Rows per UNWIND transaction
+DEFAULT_MAX_IN_FLIGHT = 8  # Concurrent write transactions of write_batches
+
+COUNTER_NAMES = ('nodes_created', 'nodes_deleted', 'relationships_created', 'relationships_deleted', 'properties_set')
+
+
+def _counters_to_dict(counters):
+    """
+    Return the update counters of a result summary as a dictionary.
+    """
+    return {name: getattr(counters, name) for name in COUNTER_NAMES}
+
+
+class AsyncNeo4jConnection:
+    """
+    A class to manage asynchronous connections to a Neo4j database.
+
+    Attributes
+    ----------
+    uri : str
+        The URI of the Neo4j database.
+    user : str
+        The username for the Neo4j database.
+    password : str
+        The password for the Neo4j database.
+    driver : neo4j.AsyncDriver
+        The async driver instance, created by `connect`.
+
+    Methods
+    -------
+    connect():
+        Creates the driver and verifies that the database is reachable.
+    close():
+        Closes the driver.
+    session(**kwargs):
+        Opens an async session on the driver.
+    read(query, **parameters):
+        Runs a query in a read transaction and returns its records.
+    write(query, **parameters):
+        Runs a query in a write transaction and returns its update counters.
+    write_batches(query, rows, batch_size, max_in_flight):
+        Writes rows with one UNWIND transaction per batch, several batches concurrently.
+    ensure_schema():
+        Creates the missing constraints and indexes of the project schema.
+    """
+
+    def __init__(self, uri, user, password, **config):
+        """
+        Constructs all the necessary attributes for the AsyncNeo4jConnection object.
+
+        Parameters
+        ----------
+        uri : str
+            The URI of the Neo4j database.
+        user : str
+            The username for the Neo4j database.
+        password : str
+            The password for the Neo4j database.
+        **config
+            Driver settings overriding `DRIVER_CONFIG`, e.g. max_connection_pool_size.
+        """
+        self.uri = uri
+        self.user = user
+        self.password = password
+        self.config = {**DRIVER_CONFIG, **config}
+        self.driver = None
+
+    async def connect(self):
+        """
+        Creates the driver and verifies that the database is reachable.
+
+        Raises
+        ------
+        Exception
+            If the connection to the Neo4j database cannot be established.
+        """
+        try:
+            logging.info("Establishing async connection to Neo4j db")
+            self.driver = AsyncGraphDatabase.driver(self.uri, auth=basic_auth(self.user, self.password), **self.config)
+            await self.driver.verify_connectivity()
+            logging.info("Async connection to Neo4j db established")
+        except Exception as e:
+            logging.error(f"Failed to establish async connection to Neo4j db: {e}")
+            await self.close()
+            raise
+
+    async def close(self):
+        """
+        Closes the driver.
+        """
+        if self.driver:
+            logging.info("Closing async connection to Neo4j db")
+            await self.driver.close()
+            self.driver = None
+
+    async def __aenter__(self):
+        """
+        Enters the runtime context, connecting to the database.
+
+        Returns
+        -------
+        AsyncNeo4jConnection
+            The AsyncNeo4jConnection object itself.
+        """
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Exits the runtime context, closing the driver.
+        """
+        await self.close()
+
+    def session(self, **kwargs):
+        """
+        Opens an async session on the driver.
+
+        Parameters
+        ----------
+        **kwargs
+            Session settings, e.g. database or fetch_size.
+
+        Returns
+        -------
+        neo4j.AsyncSession
+            A new session, to be used with `async with`.
+        """
+        return self.driver.session(**kwargs)
+
+    async def read(self, query, **parameters):
+        """
+        Runs a query in a managed read transaction, retried on transient errors.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query.
+        **parameters
+            The query parameters.
+
+        Returns
+        -------
+        list
+            The records as dictionaries.
+        """
+        async def work(tx):
+            result = await tx.run(query, **parameters)
+            return await result.data()
+
+        async with self.session() as session:
+            return await session.execute_read(work)
+
+    async def write(self, query, **parameters):
+        """
+        Runs a query in a managed write transaction, retried on transient errors.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query.
+        **parameters
+            The query parameters.
+
+        Returns
+        -------
+        dict
+            The update counters of the query, see `COUNTER_NAMES`.
+        """
+        async def work(tx):
+            result = await tx.run(query, **parameters)
+            summary = await result.consume()
+            return _counters_to_dict(summary.counters)
+
+        async with self.session() as session:
+            return await session.execute_write(work)
+
+    async def write_batches(self, query, rows, batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        """
+        Writes rows with one UNWIND transaction per batch, several batches concurrently.
+
+        The query receives a batch as the parameter `$rows`. Every batch runs in its own session
+        and managed write transaction; at most `max_in_flight` of them are open at a time. Batches
+        may commit in any order, so the query must not depend on the order of the rows across
+        batches.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query, starting with 'UNWIND $rows AS row'.
+        rows : iterable
+            The parameter maps, one per row.
+        batch_size : int
+            The number of rows per transaction.
+        max_in_flight : int
+            The maximum number of concurrent write transactions.
+
+        Returns
+        -------
+        dict
+            The summed update counters plus 'rows' and 'batches'.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+        totals = dict.fromkeys(COUNTER_NAMES, 0)
+        totals.update(rows=0, batches=0)
+
+        async def write_batch(batch):
+            try:
+                counters = await self.write(query, rows=batch)
+            finally:
+                semaphore.release()
+            for name, value in counters.items():
+                totals[name] += value
+            totals['rows'] += len(batch)
+            totals['batches'] += 1
+
+        start = time.perf_counter()
+        tasks = []
+        batch = []
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    await semaphore.acquire()
+                    tasks.append(asyncio.create_task(write_batch(batch)))
+                    batch = []
+            if batch:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(write_batch(batch)))
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        elapsed = time.perf_counter() - start
+        logging.info(
+            f"Wrote {totals['rows']} rows in {totals['batches']} batches in {elapsed:.2f} s "
+            f"({totals['rows'] / elapsed if elapsed else 0:.1f} rows/sec)"
+        )
+        return totals
+
+    async def ensure_schema(self, wait=True, timeout=INDEX_ONLINE_TIMEOUT):
+        """
+        Creates the missing constraints and indexes declared in `neo4j_schema`.
+
+        The async counterpart of `neo4j_schema.apply_schema`.
+
+        Parameters
+        ----------
+        wait : bool
+            Wait until all indexes are online.
+        timeout : int
+            The maximum number of seconds to wait for the indexes.
+
+        Returns
+        -------
+        int
+            The number of constraints and indexes that were created.
+        """
+        created = 0
+        async with self.session() as session:
+            for statement in schema_statements():
+                try:
+                    summary = await (await session.run(statement)).consume()
+                except Neo4jError as e:
+                    logging.error(f"Failed to apply '{statement}': {e}")
+                    continue
+                created += summary.counters.constraints_added + summary.counters.indexes_added
+            logging.info(f"Applied the Neo4j schema: {created} constraints and indexes created")
+            if wait:
+                await (await session.run("CALL db.awaitIndexes($timeout)", timeout=timeout)).consume()
+        return created
@@ -0,0 +1,311 @@
+"""
+This module provides the shared write path of the ingest scripts: batched UNWIND transactions
+with retries and backpressure.
+
+A `BatchWriter` takes a stream of parameter maps, groups them into batches by size (and
+optionally by age), and writes every batch in one managed write transaction, either with an
+UNWIND query receiving the batch as `$rows` or with a transaction function `work(tx, rows)`.
+
+    - Transient failures (deadlocks, leader switches, lost connections) that outlast the
+      driver's own retries of the managed transaction are retried with exponential backoff.
+    - With `max_in_flight > 1`, batches are written by a thread pool, each in its own session;
+      `add` blocks while `max_in_flight` batches are pending, so a fast producer cannot buffer
+      the whole input in memory.
+    - `totals` holds the rows, batches, retries and summed update counters, and the throughput
+      is logged on `close`.
+
+Batches written concurrently may commit in any order; only use `max_in_flight > 1` when the
+batches do not depend on each other (e.g. not for relationships between nodes written by the
+same writer).
+
+Classes:
+    BatchWriter: Buffers parameter maps and writes them in batched transactions.
+
+Example usage:
+    from src_pub.utils.batch_writer import BatchWriter
+
+    query = "UNWIND $rows AS row MATCH (d:Drug {drugbankId: row.drugbankId}) SET d.flag = row.flag"
+    with BatchWriter(conn.driver, query, batch_size=1000, max_in_flight=4) as writer:
+        for row in rows:
+            writer.add(row)
+    print(writer.totals)
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from neo4j.exceptions import TransientError, ServiceUnavailable, SessionExpired
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+DEFAULT_BATCH_SIZE = 500  # Rows per UNWIND transaction
+MAX_RETRIES = 4
+BACKOFF_FACTOR = 2
+BACKOFF_BASE = 1.0  # Seconds before the first retry
+
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+class BatchWriter:
+    """
+    Buffers parameter maps and writes them in batched managed transactions.
+
+    Attributes
+    ----------
+    driver : neo4j.Driver
+        The driver the sessions are opened on.
+    batch_size : int
+        The number of rows per transaction.
+    max_wait : float
+        A batch is written once its first row is this many seconds old, even if it is not full.
+        Checked when rows are added. None disables the age limit.
+    max_in_flight : int
+        The maximum number of batches written concurrently, 1 writes in the calling thread.
+    totals : dict
+        'rows', 'batches', 'retries', the summed update counters (query mode) or values
+        returned by `work`, and 'seconds' once the writer is closed.
+
+    Methods
+    -------
+    add(row):
+        Buffers one parameter map and writes the batch once it is full.
+    write(rows):
+        Adds all rows of an iterable.
+    flush():
+        Writes the buffered rows and waits for all pending batches.
+    close():
+        Flushes, releases the thread pool and logs the throughput.
+    """
+
+    def __init__(self, driver, query=None, work=None, batch_size=DEFAULT_BATCH_SIZE, max_wait=None, max_in_flight=1,
+                 parameters=None, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_factor=BACKOFF_FACTOR,
+                 session_config=None, name=None):
+        """
+        Constructs all the necessary attributes for the BatchWriter object.
+
+        Parameters
+        ----------
+        driver : neo4j.Driver
+            The driver the sessions are opened on.
+        query : str, optional
+            An UNWIND query receiving the batch as `$rows`. Its update counters are summed.
+        work : callable, optional
+            A transaction function `work(tx, rows)`, used instead of `query`. An int it returns
+            is summed as 'written', a dict is summed key by key.
+        batch_size : int
+            The number of rows per transaction.
+        max_wait : float, optional
+            The maximum age in seconds of a buffered batch.
+        max_in_flight : int
+            The maximum number of batches written concurrently.
+        parameters : dict, optional
+            Additional query parameters, passed with every batch.
+        max_retries : int
+            The number of retries of a batch after a transient error.
+        backoff_base : float
+            The seconds to wait before the first retry, multiplied by `backoff_factor` per retry.
+        backoff_factor : float
+            The growth of the wait between retries.
+        session_config : dict, optional
+            Session settings, e.g. database.
+        name : str, optional
+            The name used in the log messages.
+
+        Raises
+        ------
+        ValueError
+            If not exactly one of query and work is given, or batch_size or max_in_flight is
+            not positive.
+        """
+        if (query is None) == (work is None):
+            raise ValueError("Pass either an UNWIND query or a transaction function")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be a positive integer, got {max_in_flight}")
+        self.driver = driver
+        self.query = query
+        self.work = work
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.max_in_flight = max_in_flight
+        self.parameters = parameters or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.session_config = session_config or {}
+        self.name = name or 'BatchWriter'
+        self.totals = {'rows': 0, 'batches': 0, 'retries': 0}
+
+        self._buffer = []
+        self._buffer_started = None
+        self._lock = threading.Lock()
+        self._errors = []
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight) if max_in_flight > 1 else None
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._started = time.perf_counter()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown()
+        return False
+
+    def add(self, row):
+        """
+        Buffers one parameter map and writes the batch once it is full or too old.
+
+        Parameters
+        ----------
+        row : dict
+            The parameter map of one row.
+        """
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size or (
+                self.max_wait is not None and time.monotonic() - self._buffer_started >= self.max_wait):
+            self._submit()
+
+    def write(self, rows):
+        """
+        Adds all rows of an iterable.
+
+        Parameters
+        ----------
+        rows : iterable
+            The parameter maps.
+
+        Returns
+        -------
+        BatchWriter
+            The writer itself, to chain `.close()`.
+        """
+        for row in rows:
+            self.add(row)
+        return self
+
+    def flush(self):
+        """
+        Writes the buffered rows and waits for all pending batches.
+
+        Raises
+        ------
+        Exception
+            The first error of a batch that failed after all retries.
+        """
+        if self._buffer:
+            self._submit()
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+        self._raise_errors()
+
+    def close(self):
+        """
+        Flushes, releases the thread pool and logs the throughput.
+
+        Returns
+        -------
+        dict
+            The totals, see the class attributes.
+        """
+        if self._closed:
+            return self.totals
+        try:
+            self.flush()
+        finally:
+            self._shutdown()
+        seconds = time.perf_counter() - self._started
+        self.totals['seconds'] = seconds
+        logging.info(
+            f"{self.name}: wrote {self.totals['rows']} rows in {self.totals['batches']} batches in {seconds:.2f} s "
+            f"({self.totals['rows'] / seconds if seconds else 0:.1f} rows/sec, {self.totals['retries']} retries)"
+        )
+        return self.totals
+
+    def _shutdown(self):
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _raise_errors(self):
+        if self._errors:
+            raise self._errors[0]
+
+    def _submit(self):
+        """
+        Hands the buffered rows to a worker, blocking while `max_in_flight` batches are pending.
+        """
+        batch, self._buffer = self._buffer, []
+        self._raise_errors()
+        if self._executor is None:
+            self._write_batch(batch)
+            return
+        self._slots.acquire()
+        self._futures = [future for future in self._futures if not future.done()]
+        self._futures.append(self._executor.submit(self._write_batch_in_worker, batch))
+
+    def _write_batch_in_worker(self, batch):
+        try:
+            self._write_batch(batch)
+        except Exception as e:
+            with self._lock:
+                self._errors.append(e)
+        finally:
+            self._slots.release()
+
+    def _run_batch(self, tx, batch):
+        if self.work is not None:
+            return self.work(tx, batch)
+        summary = tx.run(self.query, rows=batch, **self.parameters).consume()
+        counters = summary.counters
+        return {
+            'nodes_created': counters.nodes_created,
+            'relationships_created': counters.relationships_created,
+            'properties_set': counters.properties_set,
+        }
+
+    def _write_batch(self, batch):
+        """
+        Writes one batch in a managed transaction, retrying transient errors with backoff.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.driver.session(**self.session_config) as session:
+                    result = session.execute_write(self._run_batch, batch)
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    logging.critical(f"{self.name}: all {self.max_retries} retries failed for a batch of {len(batch)} rows")
+                    raise
+                wait_time = self.backoff_base * self.backoff_factor ** attempt
+                logging.warning(
+                    f"{self.name}: batch of {len(batch)} rows failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}. "
+                    f"Retrying in {wait_time} seconds..."
+                )
+                with self._lock:
+                    self.totals['retries'] += 1
+                time.sleep(wait_time)
+
+        with self._lock:
+            self.totals['rows'] += len(batch)
+            self.totals['batches'] += 1
+            if isinstance(result, dict):
+                for key, value in result.items():
+                    self.totals[key] = self.totals.get(key, 0) + value
+            elif isinstance(result, int):
+                self.totals['written'] = self.totals.get('written', 0) + result
@@ -1,12 +1,24 @@
 """
 This module provides a standard connection class for interacting with the Neo4j database of this project.
 
+Drivers are shared process-wide: every Neo4jConnection (and every caller of `get_driver`) with the
+same uri, user and password reuses one lazily created driver and its connection pool, so the TCP/TLS
+handshake and authentication happen once per process instead of once per unit of work. The pool
+is configured with the environment variables NEO4J_MAX_CONNECTION_POOL_SIZE,
+NEO4J_MAX_CONNECTION_LIFETIME (seconds) and NEO4J_FETCH_SIZE (records per batch), or with
+`configure_driver_pool` before the first connection. Shared drivers are closed at interpreter exit.
+
 Example usage:
     from conn_neo4j import Neo4jConnection
 
     Neo4jConnection.setup_environment()
     with Neo4jConnection(URI, USERNAME, PASSWORD) as conn:
         conn.give_graph_summary()
+
+    from conn_neo4j import get_driver
+
+    with get_driver(URI, USERNAME, PASSWORD).session() as session:
+        session.run("MATCH (d:Drug) RETURN count(d)")
 """
 
 from dotenv import load_dotenv
@@ -18,12 +30,20 @@ import os
 
 # Example usage is at the bottom of the file
 
+import atexit
+import hashlib
 import logging
+import threading
 import rdflib
 from dotenv import load_dotenv, find_dotenv
 import os
 from neo4j import GraphDatabase, basic_auth
 
+from src_pub.utils.neo4j_schema import apply_schema
+from src_pub.utils.graph_stats import GraphStatistics
+from src_pub.utils.graph_backend import Neo4jBackend, InMemoryGraph
+from src_pub.utils.query_instrumentation import InstrumentedDriver, QUERY_STATS, instrumentation_enabled
+
 
 # Environment variables
 load_dotenv()
@@ -32,6 +52,81 @@ username = os.getenv("username")
 password = os.getenv("password")
 # ONTOLOGY_PATH = os.getenv("ontology_path") # Adjust this for each ontology in the end
 
+# Configuration of the shared driver pools, passed to GraphDatabase.driver
+DRIVER_CONFIG = {
+    'max_connection_pool_size': int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", 100)),
+    'max_connection_lifetime': int(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", 3600)),
+    'fetch_size': int(os.getenv("NEO4J_FETCH_SIZE", 1000)),
+}
+
+_drivers = {}  # (uri, user, password hash) -> neo4j.Driver
+_drivers_lock = threading.Lock()
+
+
+def configure_driver_pool(**config):
+    """
+    Updates the configuration used for drivers that are created afterwards.
+
+    Parameters
+    ----------
+    **config
+        Driver settings, e.g. max_connection_pool_size, max_connection_lifetime or fetch_size.
+        Drivers that already exist keep their configuration until `close_all_drivers` is called.
+    """
+    with _drivers_lock:
+        DRIVER_CONFIG.update(config)
+
+
+def get_driver(uri, user, password):
+    """
+    Returns the shared driver for a uri and credentials, creating it on first use.
+
+    The registry is thread-safe, so worker threads can call this concurrently and still share
+    one driver and its connection pool. Do not close the returned driver; use
+    `close_all_drivers` at the end of the process instead (it is also registered with atexit).
+
+    Parameters
+    ----------
+    uri : str
+        The URI of the Neo4j database.
+    user : str
+        The username for the Neo4j database.
+    password : str
+        The password for the Neo4j database. Other credentials for the same uri and user get
+        their own driver, so a wrong password is not hidden by an already authenticated one.
+
+    Returns
+    -------
+    neo4j.Driver
+        The shared driver instance.
+    """
+    # Only a digest of the password is kept in the registry key
+    key = (uri, user, hashlib.sha256((password or '').encode('utf-8')).hexdigest())
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            logging.info(f"Creating shared Neo4j driver for {user}@{uri}")
+            driver = GraphDatabase.driver(uri, auth=basic_auth(user, password), **DRIVER_CONFIG)
+            _drivers[key] = driver
+        return driver
+
+
+def close_all_drivers():
+    """
+    Closes all shared drivers and empties the registry.
+    """
+    with _drivers_lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        try:
+            driver.close()
+        except Exception as e:
+            logging.error(f"Failed to close shared Neo4j driver: {e}")
+
+
+atexit.register(close_all_drivers)
+
 
 class Neo4jConnection:
     """
@@ -47,6 +142,12 @@ class Neo4jConnection:
         The password for the Neo4j database. Imported from environment variables.
     driver : neo4j.Driver
         The driver instance for the Neo4j database connection.
+    shared : bool
+        Whether the driver comes from the process-wide registry.
+    instrument : bool
+        Whether the statements run through this connection are recorded in `QUERY_STATS`.
+    statistics : GraphStatistics
+        Cached node and relationship counts of the graph.
 
     Methods
     -------
@@ -54,15 +155,23 @@ class Neo4jConnection:
         Establishes a connection to the Neo4j database.
     close():
         Closes the connection to the Neo4j database.
+    session(**kwargs):
+        Opens a session on the driver.
     give_graph_summary():
         Prints a summary of the graph.
     check_graph_empty():
         Checks if the graph is empty.
+    statistics:
+        Node counts per label and relationship counts per type.
+    ensure_schema():
+        Creates the missing constraints and indexes of the project schema.
+    backend(in_memory=False, labels=None):
+        Returns the graph operations on the database or on an in-memory copy of it.
     setup_environment():
         Sets up the environment by loading environment variables and configuring logging.
     """
         
-    def __init__(self, uri, user, password):
+    def __init__(self, uri, user, password, shared=True, instrument=None):
         """
         Constructs all the necessary attributes for the Neo4jConnection object.
 
@@ -74,12 +183,21 @@ class Neo4jConnection:
             The username for the Neo4j database.
         password : str
             The password for the Neo4j database.
+        shared : bool
+            Use the process-wide driver for this uri and user. If False, the connection owns a
+            private driver that is closed by `close`.
+        instrument : bool, optional
+            Record latency, rows, server timings and counters of every statement, see
+            `query_instrumentation`. Defaults to the NEO4J_QUERY_INSTRUMENTATION variable.
         """
         logging.info("Running Neo4jConnection constructor")
         self.uri = uri
         self.user = user
         self.password = password
+        self.shared = shared
+        self.instrument = instrumentation_enabled() if instrument is None else instrument
         self.driver = None
+        self._statistics = None
         self.connect()
             
     def connect(self):
@@ -93,7 +211,12 @@ class Neo4jConnection:
         """
         try:
             logging.info("Establishing connection to Neo4j db")
-            self.driver = GraphDatabase.driver(self.uri, auth=basic_auth(self.user, self.password))
+            if self.shared:
+                self.driver = get_driver(self.uri, self.user, self.password)
+            else:
+                self.driver = GraphDatabase.driver(self.uri, auth=basic_auth(self.user, self.password), **DRIVER_CONFIG)
+            if self.instrument:
+                self.driver = InstrumentedDriver(self.driver, QUERY_STATS)
             logging.info("Connection to Neo4j db established")
         except Exception as e:
             logging.error(f"Falied to establish connection to Neo4j db: {e}")
@@ -103,12 +226,17 @@ class Neo4jConnection:
         """
         Closes the connection to the Neo4j database.
 
+        A shared driver stays open for the other connections of the process and is only released
+        by this connection.
+
         Raises
         ------
         Exception
             If the connection to the Neo4j database cannot be closed.
         """
-        if self.driver:
+        if self.driver and getattr(self, 'shared', False):
+            self.driver = None
+        elif self.driver:
             try:
                 logging.info("Closing connection to Neo4j db")
                 self.driver.close()
@@ -117,6 +245,22 @@ class Neo4jConnection:
                 logging.error(f"Failed to close connection to Neo4j db: {e}")
                 raise
     
+    def session(self, **kwargs):
+        """
+        Opens a session on the driver of this connection.
+
+        Parameters
+        ----------
+        **kwargs
+            Session settings, e.g. database or fetch_size.
+
+        Returns
+        -------
+        neo4j.Session
+            A new session, to be used as a context manager.
+        """
+        return self.driver.session(**kwargs)
+
     def __enter__(self):
         """
         Enters the runtime context related to this object.
@@ -143,6 +287,20 @@ class Neo4jConnection:
         """
         self.close()
 
+    @property
+    def statistics(self):
+        """
+        The cached node and relationship counts of the graph, read from the count store.
+
+        Returns
+        -------
+        GraphStatistics
+            The statistics of this connection's driver.
+        """
+        if getattr(self, '_statistics', None) is None or self._statistics.driver is not self.driver:
+            self._statistics = GraphStatistics(self.driver)
+        return self._statistics
+
     def give_graph_summary(self):
         """
         Prints a summary of the graph.
@@ -161,6 +319,11 @@ class Neo4jConnection:
                     logging.warning("Graph is empty")
                 else:
                     logging.info(f"Graph contains {node_count} nodes and {relationship_count} relationships")
+                    snapshot = self.statistics.snapshot()
+                    for label, count in snapshot['labels'].items():
+                        logging.info(f"  {label}: {count} nodes")
+                    for rel_type, count in snapshot['relationship_types'].items():
+                        logging.info(f"  {rel_type}: {count} relationships")
             else:
                 logging.warning("Failed to retrieve data from graph")
         except Exception as e:
@@ -171,6 +334,8 @@ class Neo4jConnection:
         """
         Checks if the graph is empty.
 
+        The counts come from the count store and are cached for a few seconds, see `statistics`.
+
         Returns
         -------
         dict
@@ -182,8 +347,52 @@ class Neo4jConnection:
                 The number of relationships in the graph.
 
         """
-        return {'node_count': 0, 'relationship_count': 0}
+        return {
+            'node_count': self.statistics.node_count(),
+            'relationship_count': self.statistics.relationship_count(),
+        }
+
+    def ensure_schema(self, wait=True):
+        """
+        Creates the missing constraints and indexes declared in `neo4j_schema`.
+
+        Call this at the start of every ingest, before the first MERGE, so that all lookups
+        on MERGE keys are served by an index.
+
+        Parameters
+        ----------
+        wait : bool
+            Wait until all indexes are online.
+
+        Returns
+        -------
+        int
+            The number of constraints and indexes that were created.
+        """
+        with self.session() as session:
+            return apply_schema(session, wait=wait)
     
+    def backend(self, in_memory=False, labels=None):
+        """
+        Returns the graph operations of `graph_backend` for this database.
+
+        Parameters
+        ----------
+        in_memory : bool
+            Load the graph into an `InMemoryGraph` instead of querying the database for every
+            operation. Write the changes back with `flush_to_neo4j(conn.driver)`.
+        labels : list, optional
+            The labels to load into memory, default all keyed labels.
+
+        Returns
+        -------
+        GraphBackend
+            A `Neo4jBackend` or a loaded `InMemoryGraph`.
+        """
+        if in_memory:
+            return InMemoryGraph.load_from_neo4j(self.driver, labels=labels)
+        return Neo4jBackend(self.driver)
+
     @staticmethod
     def setup_environment():
         """
@@ -0,0 +1,437 @@
+"""
+This module defines the graph operations used by the pipeline behind a pluggable backend.
+
+The working graph (a few thousand Drug nodes, a few hundred BiologicalProcess nodes, one
+Pathology) fits in memory. `InMemoryGraph` holds it in dictionaries indexed by label and node
+key, so linking, neighbor lookups, counts and property updates run at memory speed and without
+a server, e.g. in tests. `Neo4jBackend` runs the same operations as Cypher on a live database.
+An `InMemoryGraph` can be loaded from Neo4j, worked on, and its changes flushed back.
+
+Nodes are identified by the key property of their label, see `NODE_KEYS`. Relationships are
+identified by (start node, type, end node); relationship properties are stored but are not
+part of the identity.
+
+Classes:
+    GraphBackend: The operations every backend supports.
+    Neo4jBackend: The operations as Cypher queries on a Neo4j driver.
+    InMemoryGraph: The operations on dictionaries, loadable from and flushable to Neo4j.
+
+Example usage:
+    from src_pub.utils.graph_backend import InMemoryGraph
+
+    graph = InMemoryGraph.load_from_neo4j(conn.driver)
+    graph.link('Drug', 'BiologicalProcess', 'AFFECTS', [('DB00001', 'GO:0006915')])
+    graph.neighbors('Drug', 'DB00001', 'AFFECTS')
+    graph.flush_to_neo4j(conn.driver)
+"""
+
+import os
+import sys
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.neo4j_schema import UNIQUENESS_CONSTRAINTS
+from src_pub.utils.graph_stats import fetch_graph_counts
+from src_pub.utils.batch_writer import BatchWriter
+from src_pub.utils.uuid_util import generate_uuid
+
+# The key property of every label, from the uniqueness constraints of the schema
+NODE_KEYS = {label: prop for _, label, prop in UNIQUENESS_CONSTRAINTS if prop != 'uuid'}
+
+DIRECTIONS = ('out', 'in', 'both')
+
+
+def _quote(name):
+    """
+    Quote a label or relationship type for use in a Cypher pattern.
+    """
+    return '`' + name.replace('`', '``') + '`'
+
+
+def _node_key(label):
+    try:
+        return NODE_KEYS[label]
+    except KeyError:
+        raise ValueError(f"No key property declared for label '{label}', expected one of {', '.join(NODE_KEYS)}")
+
+
+class GraphBackend(ABC):
+    """
+    The graph operations used by the pipeline.
+
+    Methods
+    -------
+    merge_nodes(label, rows):
+        Creates or updates nodes by key, returns the number created.
+    update_properties(label, rows):
+        Sets properties on existing nodes, returns the number updated.
+    get_node(label, key):
+        Returns the properties of a node, or None.
+    find_nodes(label):
+        Returns the properties of all nodes with a label.
+    link(start_label, end_label, rel_type, pairs, properties=None):
+        Creates missing relationships between existing nodes, returns the number created.
+    neighbors(label, key, rel_type=None, direction='out', neighbor_label=None):
+        Returns the properties of the neighbors of a node.
+    label_counts():
+        Returns the number of nodes per label.
+    relationship_counts():
+        Returns the number of relationships per type.
+    """
+
+    @abstractmethod
+    def merge_nodes(self, label, rows):
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_properties(self, label, rows):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_node(self, label, key):
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_nodes(self, label):
+        raise NotImplementedError
+
+    @abstractmethod
+    def link(self, start_label, end_label, rel_type, pairs, properties=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def neighbors(self, label, key, rel_type=None, direction='out', neighbor_label=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def label_counts(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def relationship_counts(self):
+        raise NotImplementedError
+
+
+class Neo4jBackend(GraphBackend):
+    """
+    The graph operations as Cypher queries on a Neo4j driver.
+
+    Attributes
+    ----------
+    driver : neo4j.Driver
+        The driver the queries run on.
+    batch_size : int
+        The number of rows per UNWIND transaction of the writes.
+    """
+
+    def __init__(self, driver, batch_size=1000):
+        self.driver = driver
+        self.batch_size = batch_size
+
+    def _write(self, query, rows, counter):
+        with BatchWriter(self.driver, query, batch_size=self.batch_size, name='Neo4jBackend writer') as writer:
+            writer.write(rows)
+        return writer.totals.get(counter, 0)
+
+    def _read(self, query, **parameters):
+        with self.driver.session() as session:
+            return session.run(query, **parameters).data()
+
+    def merge_nodes(self, label, rows):
+        key = _node_key(label)
+        query = (
+            f"UNWIND $rows AS row MERGE (n:{_quote(label)} {{{key}: row.{key}}}) "
+            "ON CREATE SET n.uuid = coalesce(row.uuid, randomUUID()) "
+            "SET n += row"
+        )
+        return self._write(query, rows, 'nodes_created')
+
+    def update_properties(self, label, rows):
+        key = _node_key(label)
+        query = f"UNWIND $rows AS row MATCH (n:{_quote(label)} {{{key}: row.{key}}}) SET n += row RETURN count(n)"
+
+        def work(tx, batch):
+            return tx.run(query, rows=batch).single()[0]
+
+        with BatchWriter(self.driver, work=work, batch_size=self.batch_size, name='Neo4jBackend writer') as writer:
+            writer.write(rows)
+        return writer.totals.get('written', 0)
+
+    def get_node(self, label, key):
+        records = self._read(
+            f"MATCH (n:{_quote(label)} {{{_node_key(label)}: $key}}) RETURN properties(n) AS n", key=key
+        )
+        return records[0]['n'] if records else None
+
+    def find_nodes(self, label):
+        return [record['n'] for record in self._read(f"MATCH (n:{_quote(label)}) RETURN properties(n) AS n")]
+
+    def link(self, start_label, end_label, rel_type, pairs, properties=None):
+        rows = ({'start': start, 'end': end, 'properties': properties or {}} for start, end in pairs)
+        return self.link_rows(start_label, end_label, rel_type, rows)
+
+    def link_rows(self, start_label, end_label, rel_type, rows):
+        """
+        Like `link`, with the keys and properties of every relationship in a row
+        {'start': ..., 'end': ..., 'properties': {...}}.
+        """
+        start_key, end_key = _node_key(start_label), _node_key(end_label)
+        query = (
+            f"UNWIND $rows AS row "
+            f"MATCH (a:{_quote(start_label)} {{{start_key}: row.start}}) "
+            f"MATCH (b:{_quote(end_label)} {{{end_key}: row.end}}) "
+            f"MERGE (a)-[r:{_quote(rel_type)}]->(b) "
+            "SET r += row.properties"
+        )
+        return self._write(query, rows, 'relationships_created')
+
+    def neighbors(self, label, key, rel_type=None, direction='out', neighbor_label=None):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction '{direction}', expected one of {', '.join(DIRECTIONS)}")
+        rel = f"[:{_quote(rel_type)}]" if rel_type else "[]"
+        pattern = {'out': f"-{rel}->", 'in': f"<-{rel}-", 'both': f"-{rel}-"}[direction]
+        neighbor = f"(m:{_quote(neighbor_label)})" if neighbor_label else "(m)"
+        records = self._read(
+            f"MATCH (n:{_quote(label)} {{{_node_key(label)}: $key}}){pattern}{neighbor} "
+            "RETURN DISTINCT properties(m) AS m",
+            key=key,
+        )
+        return [record['m'] for record in records]
+
+    def label_counts(self):
+        with self.driver.session() as session:
+            return fetch_graph_counts(session)['labels']
+
+    def relationship_counts(self):
+        with self.driver.session() as session:
+            return fetch_graph_counts(session)['relationship_types']
+
+
+class InMemoryGraph(GraphBackend):
+    """
+    The graph operations on dictionaries indexed by label and node key.
+
+    Nodes are numbered in insertion order; `nodes` holds their properties, `labels` their labels
+    and `index` maps (label, key) to the node number. Relationships are kept in adjacency sets
+    per type and direction. Changes since the last load or flush are tracked for
+    `flush_to_neo4j`.
+
+    Methods
+    -------
+    load_from_neo4j(driver, labels=None):
+        Classmethod, reads the nodes of the given labels and the relationships between them.
+    flush_to_neo4j(driver, batch_size=1000):
+        Writes the changed nodes and the new relationships to Neo4j.
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.labels = []
+        self.index = {}
+        self._out = defaultdict(lambda: defaultdict(set))
+        self._in = defaultdict(lambda: defaultdict(set))
+        self._relationship_properties = {}
+        self._relationship_counts = defaultdict(int)
+        self._dirty_nodes = set()
+        self._new_relationships = set()
+
+    def _add_node(self, labels, properties):
+        node = len(self.nodes)
+        self.nodes.append(dict(properties))
+        self.labels.append(frozenset(labels))
+        for label in labels:
+            key = NODE_KEYS.get(label)
+            if key is not None and properties.get(key) is not None:
+                self.index[(label, properties[key])] = node
+        return node
+
+    def _add_relationship(self, start, rel_type, end, properties):
+        if end in self._out[start][rel_type]:
+            self._relationship_properties[(start, rel_type, end)].update(properties)
+            return False
+        self._out[start][rel_type].add(end)
+        self._in[end][rel_type].add(start)
+        self._relationship_properties[(start, rel_type, end)] = dict(properties)
+        self._relationship_counts[rel_type] += 1
+        return True
+
+    def _key_label(self, node):
+        """
+        The label a node is merged by in Neo4j: its first label in `NODE_KEYS` order whose key
+        is set, or None. Nodes and relationship endpoints use the same label.
+        """
+        return next(
+            (label for label, key in NODE_KEYS.items()
+             if label in self.labels[node] and self.nodes[node].get(key) is not None),
+            None,
+        )
+
+    def merge_nodes(self, label, rows):
+        key = _node_key(label)
+        created = 0
+        for row in rows:
+            node = self.index.get((label, row[key]))
+            if node is None:
+                node = self._add_node([label], {'uuid': generate_uuid(), **row})
+                created += 1
+            else:
+                self.nodes[node].update(row)
+            self._dirty_nodes.add(node)
+        return created
+
+    def update_properties(self, label, rows):
+        key = _node_key(label)
+        updated = 0
+        for row in rows:
+            node = self.index.get((label, row[key]))
+            if node is not None:
+                self.nodes[node].update(row)
+                self._dirty_nodes.add(node)
+                updated += 1
+        return updated
+
+    def get_node(self, label, key):
+        node = self.index.get((label, key))
+        return dict(self.nodes[node]) if node is not None else None
+
+    def find_nodes(self, label):
+        return [dict(properties) for properties, labels in zip(self.nodes, self.labels) if label in labels]
+
+    def link(self, start_label, end_label, rel_type, pairs, properties=None):
+        created = 0
+        for start_key, end_key in pairs:
+            start = self.index.get((start_label, start_key))
+            end = self.index.get((end_label, end_key))
+            if start is None or end is None:
+                continue
+            if self._add_relationship(start, rel_type, end, properties or {}):
+                self._new_relationships.add((start, rel_type, end))
+                created += 1
+        return created
+
+    def neighbors(self, label, key, rel_type=None, direction='out', neighbor_label=None):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction '{direction}', expected one of {', '.join(DIRECTIONS)}")
+        node = self.index.get((label, key))
+        if node is None:
+            return []
+        adjacency = []
+        if direction in ('out', 'both'):
+            adjacency.append(self._out.get(node, {}))
+        if direction in ('in', 'both'):
+            adjacency.append(self._in.get(node, {}))
+        found = []
+        for by_type in adjacency:
+            for found_type, neighbors in by_type.items():
+                if rel_type is None or found_type == rel_type:
+                    found.extend(neighbors)
+        return [
+            dict(self.nodes[neighbor]) for neighbor in sorted(set(found))
+            if neighbor_label is None or neighbor_label in self.labels[neighbor]
+        ]
+
+    def label_counts(self):
+        counts = defaultdict(int)
+        for labels in self.labels:
+            for label in labels:
+                counts[label] += 1
+        return dict(sorted(counts.items()))
+
+    def relationship_counts(self):
+        return {rel_type: count for rel_type, count in sorted(self._relationship_counts.items()) if count}
+
+    @classmethod
+    def load_from_neo4j(cls, driver, labels=None):
+        """
+        Reads the nodes of the given labels and the relationships between them.
+
+        Parameters
+        ----------
+        driver : neo4j.Driver
+            The driver used to read the graph.
+        labels : list, optional
+            The labels to load, default all labels of `NODE_KEYS`.
+
+        Returns
+        -------
+        InMemoryGraph
+            The loaded graph, without pending changes.
+        """
+        labels = list(labels or NODE_KEYS)
+        graph = cls()
+        element_ids = {}
+        with driver.session() as session:
+            nodes = session.run(
+                "MATCH (n) WHERE any(label IN labels(n) WHERE label IN $labels) "
+                "RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS properties",
+                labels=labels,
+            )
+            for record in nodes:
+                element_ids[record['id']] = graph._add_node(record['labels'], record['properties'])
+            relationships = session.run(
+                "MATCH (a)-[r]->(b) "
+                "WHERE any(label IN labels(a) WHERE label IN $labels) AND any(label IN labels(b) WHERE label IN $labels) "
+                "RETURN elementId(a) AS start, type(r) AS type, elementId(b) AS end, properties(r) AS properties",
+                labels=labels,
+            )
+            for record in relationships:
+                graph._add_relationship(element_ids[record['start']], record['type'], element_ids[record['end']],
+                                        record['properties'])
+        logging.info(f"Loaded {len(graph.nodes)} nodes and {sum(graph._relationship_counts.values())} relationships into memory")
+        return graph
+
+    def flush_to_neo4j(self, driver, batch_size=1000):
+        """
+        Writes the changed nodes and the new relationships to Neo4j.
+
+        Nodes are merged by the key of one of their labels, the first in `NODE_KEYS` order,
+        relationships are merged between the keys of the same labels. Nodes without a keyed
+        label are skipped.
+
+        Parameters
+        ----------
+        driver : neo4j.Driver
+            The driver used to write the changes.
+        batch_size : int
+            The number of rows per UNWIND transaction.
+
+        Returns
+        -------
+        dict
+            The number of 'nodes' and 'relationships' written.
+        """
+        backend = Neo4jBackend(driver, batch_size=batch_size)
+        by_label = defaultdict(list)
+        for node in sorted(self._dirty_nodes):
+            label = self._key_label(node)
+            if label:
+                by_label[label].append(self.nodes[node])
+        for label, rows in by_label.items():
+            backend.merge_nodes(label, rows)
+
+        by_type = defaultdict(list)
+        for start, rel_type, end in sorted(self._new_relationships):
+            start_label, end_label = self._key_label(start), self._key_label(end)
+            if start_label and end_label:
+                by_type[(start_label, end_label, rel_type)].append((start, end))
+        for (start_label, end_label, rel_type), pairs in by_type.items():
+            backend.link_rows(start_label, end_label, rel_type, [
+                {
+                    'start': self.nodes[start][NODE_KEYS[start_label]],
+                    'end': self.nodes[end][NODE_KEYS[end_label]],
+                    'properties': self._relationship_properties[(start, rel_type, end)],
+                }
+                for start, end in pairs
+            ])
+
+        flushed = {'nodes': sum(len(rows) for rows in by_label.values()),
+                   'relationships': sum(len(pairs) for pairs in by_type.values())}
+        self._dirty_nodes.clear()
+        self._new_relationships.clear()
+        logging.info(f"Flushed {flushed['nodes']} nodes and {flushed['relationships']} relationships to Neo4j")
+        return flushed
@@ -0,0 +1,242 @@
+"""
+This module reads node and relationship counts of the graph from the Neo4j count store.
+
+Neo4j keeps the number of nodes per label and of relationships per type in its count store,
+so count queries of the forms below are answered without scanning the graph:
+
+    MATCH (n) RETURN count(n)
+    MATCH (n:Label) RETURN count(n)
+    MATCH ()-[r:TYPE]->() RETURN count(r)
+    MATCH (:Label)-[r:TYPE]->() RETURN count(r)    (a label on at most one side)
+
+Any additional predicate, e.g. on a property, turns them into scans again. `GraphStatistics`
+caches a snapshot of all counts for a short time, so that monitors and summaries polling the
+statistics do not hit the database on every call.
+
+Functions:
+    count_nodes(session, label): Count the nodes, optionally of one label.
+    count_relationships(session, rel_type, start_label, end_label): Count the relationships.
+    fetch_graph_counts(session): Read the node counts per label and relationship counts per type.
+
+Classes:
+    GraphStatistics: A cached view of `fetch_graph_counts` for one driver.
+
+Example usage:
+    from src_pub.utils.graph_stats import GraphStatistics
+
+    stats = GraphStatistics(conn.driver)
+    stats.node_count('Drug'), stats.relationship_count('AFFECTS')
+
+    $ python src_pub/utils/graph_stats.py          # print the label and relationship breakdown
+    $ python src_pub/utils/graph_stats.py --json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+STATS_TTL = 10  # Seconds a snapshot of the counts is reused
+
+
+def _quote(name):
+    """
+    Quote a label or relationship type for use in a Cypher pattern.
+    """
+    return '`' + name.replace('`', '``') + '`'
+
+
+def count_nodes(session, label=None):
+    """
+    Count the nodes of the graph from the count store.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used for the query.
+    label : str, optional
+        Only count nodes with this label.
+
+    Returns
+    -------
+    int
+        The number of nodes.
+    """
+    pattern = f"(n:{_quote(label)})" if label else "(n)"
+    return session.run(f"MATCH {pattern} RETURN count(n) AS count").single()["count"]
+
+
+def count_relationships(session, rel_type=None, start_label=None, end_label=None):
+    """
+    Count the relationships of the graph from the count store.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used for the query.
+    rel_type : str, optional
+        Only count relationships of this type.
+    start_label : str, optional
+        Only count relationships starting at a node with this label.
+    end_label : str, optional
+        Only count relationships ending at a node with this label.
+
+    Returns
+    -------
+    int
+        The number of relationships.
+
+    Raises
+    ------
+    ValueError
+        If both start_label and end_label are given, the count store only holds counts
+        with a label on one side.
+    """
+    if start_label and end_label:
+        raise ValueError("The count store only answers relationship counts with a label on one side")
+    start = f"(:{_quote(start_label)})" if start_label else "()"
+    end = f"(:{_quote(end_label)})" if end_label else "()"
+    rel = f"[r:{_quote(rel_type)}]" if rel_type else "[r]"
+    return session.run(f"MATCH {start}-{rel}->{end} RETURN count(r) AS count").single()["count"]
+
+
+def fetch_graph_counts(session):
+    """
+    Read the node counts per label and the relationship counts per type.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used for the queries.
+
+    Returns
+    -------
+    dict
+        'node_count': int, 'relationship_count': int,
+        'labels': the number of nodes per label,
+        'relationship_types': the number of relationships per type.
+    """
+    labels = [record["label"] for record in session.run("CALL db.labels() YIELD label RETURN label")]
+    rel_types = [
+        record["relationshipType"]
+        for record in session.run("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")
+    ]
+    return {
+        'node_count': count_nodes(session),
+        'relationship_count': count_relationships(session),
+        'labels': {label: count_nodes(session, label) for label in sorted(labels)},
+        'relationship_types': {rel_type: count_relationships(session, rel_type) for rel_type in sorted(rel_types)},
+    }
+
+
+class GraphStatistics:
+    """
+    Node and relationship counts of a graph, cached for a short time.
+
+    The cache is shared by all threads using the instance; a snapshot older than `ttl`
+    seconds is read again on the next access.
+
+    Attributes
+    ----------
+    driver : neo4j.Driver
+        The driver used to read the counts.
+    ttl : float
+        The number of seconds a snapshot is reused.
+
+    Methods
+    -------
+    snapshot(refresh=False):
+        Returns all counts, see `fetch_graph_counts`.
+    node_count(label=None):
+        Returns the number of nodes, optionally of one label.
+    relationship_count(rel_type=None):
+        Returns the number of relationships, optionally of one type.
+    invalidate():
+        Drops the cached snapshot, e.g. after a write.
+    """
+
+    def __init__(self, driver, ttl=STATS_TTL, clock=time.monotonic):
+        self.driver = driver
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._read_at = None
+
+    def snapshot(self, refresh=False):
+        """
+        Returns the node and relationship counts, reading them again if the cache expired.
+
+        Parameters
+        ----------
+        refresh : bool
+            Ignore the cached snapshot.
+
+        Returns
+        -------
+        dict
+            See `fetch_graph_counts`.
+        """
+        with self._lock:
+            now = self._clock()
+            if refresh or self._snapshot is None or now - self._read_at >= self.ttl:
+                with self.driver.session() as session:
+                    self._snapshot = fetch_graph_counts(session)
+                self._read_at = now
+            return self._snapshot
+
+    def node_count(self, label=None):
+        """
+        Returns the number of nodes, optionally of one label (0 for unknown labels).
+        """
+        counts = self.snapshot()
+        return counts['labels'].get(label, 0) if label else counts['node_count']
+
+    def relationship_count(self, rel_type=None):
+        """
+        Returns the number of relationships, optionally of one type (0 for unknown types).
+        """
+        counts = self.snapshot()
+        return counts['relationship_types'].get(rel_type, 0) if rel_type else counts['relationship_count']
+
+    def invalidate(self):
+        """
+        Drops the cached snapshot.
+        """
+        with self._lock:
+            self._snapshot = None
+
+
+def main():
+    from src_pub.utils.conn_neo4j import Neo4jConnection
+
+    parser = argparse.ArgumentParser(description='Print the node and relationship counts of the graph.')
+    parser.add_argument('--json', action='store_true', help='Print the counts as JSON')
+    args = parser.parse_args()
+
+    Neo4jConnection.setup_environment()
+    with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+        counts = conn.statistics.snapshot()
+
+    if args.json:
+        print(json.dumps(counts, indent=2))
+        return
+    print(f"{counts['node_count']} nodes, {counts['relationship_count']} relationships")
+    print("Nodes per label:")
+    for label, count in counts['labels'].items():
+        print(f"  {label:<30} {count:>10}")
+    print("Relationships per type:")
+    for rel_type, count in counts['relationship_types'].items():
+        print(f"  {rel_type:<30} {count:>10}")
+    logging.info("Read the graph statistics from the count store")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+This module declares the constraints and indexes of the project's Neo4j schema and applies them.
+
+Every key used in a MERGE or MATCH of the ingest scripts is backed by a uniqueness constraint
+(which also creates a range index), so that lookups do not fall back to label scans as the graph
+grows. Additional range indexes cover properties that are filtered on but not unique, and a
+full-text index covers the long Drug text fields (see `src_pub/explore_db/search_drugs.py`).
+
+All statements use IF NOT EXISTS, so `apply_schema` can run at the start of every pipeline.
+
+Functions:
+    schema_statements(): The Cypher statements creating the declared schema.
+    apply_schema(session, wait, timeout): Create missing constraints and indexes and wait until they are online.
+    get_live_schema(session): Read the constraints and indexes of the database.
+    diff_schema(live_schema): Compare the live schema with the declared one.
+    verify_schema(session): Log the differences and return whether the live schema is complete.
+
+Example usage:
+    from src_pub.utils.neo4j_schema import apply_schema
+
+    with conn.driver.session() as session:
+        apply_schema(session)
+
+    $ python src_pub/utils/neo4j_schema.py            # apply the schema
+    $ python src_pub/utils/neo4j_schema.py --verify   # only compare it with the database
+"""
+
+import os
+import sys
+import logging
+import argparse
+from neo4j.exceptions import Neo4jError
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+INDEX_ONLINE_TIMEOUT = 300  # Seconds to wait for new indexes to come online
+
+# (name, label, property) of every uniqueness constraint
+UNIQUENESS_CONSTRAINTS = [
+    ('drug_drugbank_id', 'Drug', 'drugbankId'),
+    ('drug_uuid', 'Drug', 'uuid'),
+    ('biological_process_go_term', 'BiologicalProcess', 'goTerm'),
+    ('biological_process_uuid', 'BiologicalProcess', 'uuid'),
+    ('pathology_name', 'Pathology', 'pathologyName'),
+    ('pathology_uuid', 'Pathology', 'uuid'),
+    ('protein_uniprot_id', 'Protein', 'uniprotId'),
+    ('protein_uuid', 'Protein', 'uuid'),
+    ('gene_product_id', 'GeneProduct', 'geneProductId'),
+    ('gene_product_uuid', 'GeneProduct', 'uuid'),
+]
+
+# (name, label, property) of every range index on a non-unique property
+RANGE_INDEXES = [
+    ('drug_name', 'Drug', 'name'),
+    ('biological_process_go_name', 'BiologicalProcess', 'goName'),
+    ('protein_gene_name', 'Protein', 'geneName'),
+    ('gene_product_symbol', 'GeneProduct', 'symbol'),
+]
+
+# Number of LLM rating runs stored on Drug nodes as reason_rating_0 ... reason_rating_<n-1>
+RATING_RUNS = 10
+
+# (name, label, properties) of every full-text index. Neo4j cannot change the properties of an
+# existing full-text index; after editing a list, drop the index so that it is recreated.
+FULLTEXT_INDEXES = [
+    ('drug_text', 'Drug', [
+        'indication', 'description', 'mechanismOfAction', 'pharmacodynamics',
+    ] + [f'reason_rating_{run}' for run in range(RATING_RUNS)]),
+]
+
+
+def schema_statements():
+    """
+    Return the Cypher statements that create the declared constraints and indexes.
+
+    Returns
+    -------
+    list
+        One idempotent CREATE statement per constraint and index.
+    """
+    statements = [
+        f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+        for name, label, prop in UNIQUENESS_CONSTRAINTS
+    ]
+    statements += [
+        f"CREATE RANGE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+        for name, label, prop in RANGE_INDEXES
+    ]
+    statements += [
+        f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (n:{label}) ON EACH [{', '.join(f'n.{prop}' for prop in props)}]"
+        for name, label, props in FULLTEXT_INDEXES
+    ]
+    return statements
+
+
+def apply_schema(session, wait=True, timeout=INDEX_ONLINE_TIMEOUT):
+    """
+    Create the declared constraints and indexes that do not exist yet.
+
+    Constraints and indexes that already exist, under the declared or under any other name,
+    are left untouched. A constraint that cannot be created, e.g. because the graph already
+    holds duplicate keys, is logged and skipped; `verify_schema` reports it as missing.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used to change the schema.
+    wait : bool
+        Wait until all indexes are online, so that the following queries can use them.
+    timeout : int
+        The maximum number of seconds to wait for the indexes.
+
+    Returns
+    -------
+    int
+        The number of constraints and indexes that were created.
+    """
+    created = 0
+    for statement in schema_statements():
+        try:
+            summary = session.run(statement).consume()
+        except Neo4jError as e:
+            logging.error(f"Failed to apply '{statement}': {e}")
+            continue
+        created += summary.counters.constraints_added + summary.counters.indexes_added
+    logging.info(f"Applied the Neo4j schema: {created} constraints and indexes created")
+
+    if wait:
+        logging.info(f"Waiting up to {timeout} s for the indexes to come online")
+        session.run("CALL db.awaitIndexes($timeout)", timeout=timeout).consume()
+    return created
+
+
+def get_live_schema(session):
+    """
+    Read the constraints and indexes of the database.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used to read the schema.
+
+    Returns
+    -------
+    dict
+        'constraints': dictionaries with 'name', 'type', 'labelsOrTypes' and 'properties',
+        'indexes': dictionaries with 'name', 'type', 'labelsOrTypes', 'properties', 'state'
+        and 'owningConstraint'.
+    """
+    constraints = session.run(
+        "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties"
+    ).data()
+    indexes = session.run(
+        "SHOW INDEXES YIELD name, type, labelsOrTypes, properties, state, owningConstraint"
+    ).data()
+    return {'constraints': constraints, 'indexes': indexes}
+
+
+def _schema_key(entry):
+    """
+    Return the (label, property) a single-property constraint or index is defined on.
+    """
+    labels = entry.get('labelsOrTypes') or []
+    properties = entry.get('properties') or []
+    if len(labels) != 1 or len(properties) != 1:
+        return None
+    return labels[0], properties[0]
+
+
+def diff_schema(live_schema):
+    """
+    Compare the live schema with the declared one.
+
+    Constraints and indexes are matched by label and property, not by name, so equivalent
+    definitions created under another name count as present.
+
+    Parameters
+    ----------
+    live_schema : dict
+        The schema as returned by `get_live_schema`.
+
+    Returns
+    -------
+    dict
+        'missing': names of declared constraints and indexes that do not exist,
+        'unexpected': names of live constraints and indexes that are not declared (token
+        lookup indexes and indexes backing a constraint are ignored),
+        'not_online': names of live indexes whose state is not ONLINE.
+    """
+    unique_keys = {
+        _schema_key(constraint): constraint['name']
+        for constraint in live_schema['constraints']
+        if constraint.get('type') in ('UNIQUENESS', 'NODE_KEY', 'NODE_PROPERTY_UNIQUENESS')
+    }
+    range_keys = {
+        _schema_key(index): index['name']
+        for index in live_schema['indexes']
+        if index.get('type') == 'RANGE' and not index.get('owningConstraint')
+    }
+
+    missing = [name for name, label, prop in UNIQUENESS_CONSTRAINTS if (label, prop) not in unique_keys]
+    missing += [
+        name for name, label, prop in RANGE_INDEXES
+        if (label, prop) not in range_keys and (label, prop) not in unique_keys
+    ]
+    fulltext_keys = {
+        (tuple(index.get('labelsOrTypes') or []), tuple(index.get('properties') or [])): index['name']
+        for index in live_schema['indexes']
+        if index.get('type') == 'FULLTEXT'
+    }
+    missing += [
+        name for name, label, props in FULLTEXT_INDEXES
+        if ((label,), tuple(props)) not in fulltext_keys
+    ]
+
+    declared_unique = {(label, prop) for _, label, prop in UNIQUENESS_CONSTRAINTS}
+    declared_range = {(label, prop) for _, label, prop in RANGE_INDEXES}
+    unexpected = [name for key, name in unique_keys.items() if key not in declared_unique]
+    unexpected += [name for key, name in range_keys.items() if key not in declared_range]
+    declared_fulltext = {((label,), tuple(props)) for _, label, props in FULLTEXT_INDEXES}
+    unexpected += [name for key, name in fulltext_keys.items() if key not in declared_fulltext]
+
+    not_online = [index['name'] for index in live_schema['indexes'] if index.get('state') != 'ONLINE']
+    return {'missing': missing, 'unexpected': unexpected, 'not_online': not_online}
+
+
+def verify_schema(session):
+    """
+    Log the differences between the live and the declared schema.
+
+    Parameters
+    ----------
+    session : neo4j.Session
+        The session used to read the schema.
+
+    Returns
+    -------
+    bool
+        True if every declared constraint and index exists and all indexes are online.
+    """
+    diff = diff_schema(get_live_schema(session))
+    if diff['missing']:
+        logging.warning(f"Missing constraints and indexes: {', '.join(diff['missing'])}")
+    if diff['not_online']:
+        logging.warning(f"Indexes not online: {', '.join(diff['not_online'])}")
+    if diff['unexpected']:
+        logging.info(f"Constraints and indexes not declared in the project schema: {', '.join(diff['unexpected'])}")
+    complete = not diff['missing'] and not diff['not_online']
+    if complete:
+        logging.info("The Neo4j schema is complete and all indexes are online.")
+    return complete
+
+
+def main():
+    from src_pub.utils.conn_neo4j import Neo4jConnection
+
+    parser = argparse.ArgumentParser(description='Apply or verify the Neo4j schema of the project.')
+    parser.add_argument('--verify', action='store_true', help='Only compare the live schema with the declared one')
+    args = parser.parse_args()
+
+    Neo4jConnection.setup_environment()
+    with Neo4jConnection(os.getenv("uri"), os.getenv("username"), os.getenv("password")) as conn:
+        with conn.driver.session() as session:
+            if not args.verify:
+                apply_schema(session)
+            complete = verify_schema(session)
+    sys.exit(0 if complete else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,440 @@
+"""
+This module instruments the Cypher calls made through Neo4j sessions and transactions.
+
+`InstrumentedDriver` wraps a driver so that its sessions, and the transactions of their
+`execute_read`/`execute_write`, record for every statement:
+
+    - the wall time from `run` until the result is consumed (including client-side iteration),
+    - the number of rows returned,
+    - the server timings `result_available_after` and `result_consumed_after` (ms),
+    - the update counters,
+    - for a sampled fraction of the calls, the database hits of a PROFILE run.
+
+The records are aggregated by query fingerprint (the query with literals replaced by '?' and
+whitespace collapsed) in a `QueryStats`. Statements slower than the threshold are written to
+the slow-query log, and `QueryStats.summary_table` gives the end-of-run summary.
+
+`Neo4jConnection` wraps its driver when instrumentation is enabled, either with
+`Neo4jConnection(..., instrument=True)` or the environment variable NEO4J_QUERY_INSTRUMENTATION=1.
+NEO4J_SLOW_QUERY_MS (default 1000), NEO4J_PROFILE_SAMPLE_RATE (default 0) and
+NEO4J_SLOW_QUERY_LOG (a file, default: the regular log) configure it. The summary of the
+process-wide `QUERY_STATS` is logged at interpreter exit.
+
+Classes:
+    QueryStats: Thread-safe aggregation of the statement records by fingerprint.
+    InstrumentedDriver: A driver proxy returning instrumented sessions.
+    InstrumentedSession: A session proxy recording its statements.
+
+Functions:
+    fingerprint(query): Normalize a query for aggregation.
+    instrumentation_enabled(): Whether NEO4J_QUERY_INSTRUMENTATION is set.
+
+Example usage:
+    from src_pub.utils.query_instrumentation import InstrumentedDriver, QueryStats
+
+    stats = QueryStats(slow_threshold_ms=500)
+    driver = InstrumentedDriver(driver, stats, profile_sample_rate=0.01)
+    with driver.session() as session:
+        session.run("MATCH (d:Drug) RETURN count(d)").single()
+    print(stats.summary_table())
+"""
+
+import os
+import re
+import sys
+import time
+import atexit
+import random
+import logging
+import threading
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+SLOW_QUERY_MS = float(os.getenv("NEO4J_SLOW_QUERY_MS", 1000))
+PROFILE_SAMPLE_RATE = float(os.getenv("NEO4J_PROFILE_SAMPLE_RATE", 0))
+SLOW_QUERY_LOG = os.getenv("NEO4J_SLOW_QUERY_LOG")
+
+COUNTER_NAMES = ('nodes_created', 'nodes_deleted', 'relationships_created', 'relationships_deleted', 'properties_set')
+
+slow_query_logger = logging.getLogger('neo4j_slow_queries')
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?![\w.])")
+_WHITESPACE = re.compile(r"\s+")
+# Statements that cannot be profiled: schema commands, SHOW, and queries with an explicit prefix
+_NOT_PROFILABLE = re.compile(
+    r"^\s*(?:EXPLAIN|PROFILE|SHOW|(?:CREATE|DROP)\s+(?:OR\s+REPLACE\s+)?(?:\w+\s+)?(?:CONSTRAINT|INDEX))\b",
+    re.IGNORECASE,
+)
+
+
+def fingerprint(query):
+    """
+    Normalize a query so that calls differing only in literals and layout are aggregated.
+
+    Parameters
+    ----------
+    query : str
+        The Cypher query.
+
+    Returns
+    -------
+    str
+        The query with string and number literals replaced by '?' and whitespace collapsed.
+    """
+    query = _STRING_LITERAL.sub('?', query)
+    query = _NUMBER_LITERAL.sub('?', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+def instrumentation_enabled():
+    """
+    Return whether NEO4J_QUERY_INSTRUMENTATION enables the instrumentation by default.
+    """
+    return os.getenv("NEO4J_QUERY_INSTRUMENTATION", "0").lower() in ("1", "true", "yes")
+
+
+def _sum_db_hits(plan):
+    """
+    Sum the database hits of a PROFILE plan and all its children.
+    """
+    if not plan:
+        return 0
+    hits = plan.get('dbHits', 0) or 0
+    return hits + sum(_sum_db_hits(child) for child in plan.get('children', []))
+
+
+class QueryStats:
+    """
+    Thread-safe aggregation of statement records by query fingerprint.
+
+    Attributes
+    ----------
+    slow_threshold_ms : float
+        Statements at least this slow are written to the slow-query log.
+    stats : dict
+        fingerprint -> aggregated 'calls', 'total_ms', 'max_ms', 'rows', 'available_after_ms',
+        'consumed_after_ms', the update counters, 'profiled' and 'db_hits'.
+
+    Methods
+    -------
+    record(query, wall_ms, rows, summary, db_hits=None):
+        Adds one statement.
+    summary_table(top=20, sort_by='total_ms'):
+        Returns the aggregated records as a text table.
+    log_summary(top=20):
+        Logs the summary table.
+    reset():
+        Drops all records.
+    """
+
+    def __init__(self, slow_threshold_ms=SLOW_QUERY_MS):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, query, wall_ms, rows, summary, db_hits=None):
+        """
+        Adds one statement to the aggregation.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query as sent, without a PROFILE prefix.
+        wall_ms : float
+            The wall time from `run` until the result was consumed or the next statement was run.
+        rows : int
+            The number of rows returned to the client.
+        summary : neo4j.ResultSummary
+            The summary of the result, None if it is not available.
+        db_hits : int, optional
+            The database hits of a PROFILE run.
+        """
+        key = fingerprint(query)
+        available_after = getattr(summary, 'result_available_after', None) or 0
+        consumed_after = getattr(summary, 'result_consumed_after', None) or 0
+        counters = getattr(summary, 'counters', None)
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = dict(
+                    calls=0, total_ms=0.0, max_ms=0.0, rows=0, available_after_ms=0, consumed_after_ms=0,
+                    profiled=0, db_hits=0, **dict.fromkeys(COUNTER_NAMES, 0),
+                )
+            entry['calls'] += 1
+            entry['total_ms'] += wall_ms
+            entry['max_ms'] = max(entry['max_ms'], wall_ms)
+            entry['rows'] += rows
+            entry['available_after_ms'] += available_after
+            entry['consumed_after_ms'] += consumed_after
+            if counters is not None:
+                for name in COUNTER_NAMES:
+                    entry[name] += getattr(counters, name, 0)
+            if db_hits is not None:
+                entry['profiled'] += 1
+                entry['db_hits'] += db_hits
+
+        if wall_ms >= self.slow_threshold_ms:
+            slow_query_logger.warning(
+                f"Slow query ({wall_ms:.1f} ms, {rows} rows, server {available_after}+{consumed_after} ms"
+                f"{f', {db_hits} db hits' if db_hits is not None else ''}): {key}"
+            )
+
+    def summary_table(self, top=20, sort_by='total_ms'):
+        """
+        Returns the aggregated records as a text table.
+
+        Parameters
+        ----------
+        top : int
+            The number of fingerprints to include.
+        sort_by : str
+            The column to sort by, descending.
+
+        Returns
+        -------
+        str
+            One line per fingerprint with calls, total, mean and max wall time, rows, server
+            time, written entities and mean db hits of the profiled calls.
+        """
+        with self._lock:
+            entries = sorted(self.stats.items(), key=lambda item: item[1][sort_by], reverse=True)[:top]
+        lines = [
+            f"{'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>9} "
+            f"{'server ms':>10} {'written':>9} {'db hits':>9}  query"
+        ]
+        for key, entry in entries:
+            written = sum(entry[name] for name in COUNTER_NAMES if name != 'properties_set')
+            db_hits = f"{entry['db_hits'] / entry['profiled']:.0f}" if entry['profiled'] else '-'
+            query = key if len(key) <= 100 else key[:97] + '...'
+            lines.append(
+                f"{entry['calls']:>7} {entry['total_ms']:>10.1f} {entry['total_ms'] / entry['calls']:>9.1f} "
+                f"{entry['max_ms']:>9.1f} {entry['rows']:>9} "
+                f"{entry['available_after_ms'] + entry['consumed_after_ms']:>10} {written:>9} {db_hits:>9}  {query}"
+            )
+        return '\n'.join(lines)
+
+    def log_summary(self, top=20):
+        """
+        Logs the summary table, if any statement was recorded.
+        """
+        if self.stats:
+            logging.info(f"Cypher statements by total wall time:\n{self.summary_table(top=top)}")
+
+    def reset(self):
+        """
+        Drops all records.
+        """
+        with self._lock:
+            self.stats.clear()
+
+
+class _InstrumentedResult:
+    """
+    A result proxy recording its statement once the result is consumed, or once the next
+    statement is run while it is still open.
+    """
+
+    def __init__(self, result, query, start, stats, profiled):
+        self._result = result
+        self._query = query
+        self._start = start
+        self._stats = stats
+        self._profiled = profiled
+        self._rows = 0
+        self._recorded = False
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+    def _finish(self, summary=None, consume=True):
+        if self._recorded:
+            return summary
+        self._recorded = True
+        try:
+            if summary is None and consume:
+                summary = self._result.consume()
+        except Exception as e:
+            logging.debug(f"No summary for instrumented query: {e}")
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        db_hits = _sum_db_hits(getattr(summary, 'profile', None)) if self._profiled and summary is not None else None
+        self._stats.record(self._query, wall_ms, self._rows, summary, db_hits)
+        return summary
+
+    def __iter__(self):
+        for record in self._result:
+            self._rows += 1
+            yield record
+        self._finish()
+
+    def data(self, *keys):
+        data = self._result.data(*keys)
+        self._rows += len(data)
+        self._finish()
+        return data
+
+    def values(self, *keys):
+        values = self._result.values(*keys)
+        self._rows += len(values)
+        self._finish()
+        return values
+
+    def value(self, key=0, default=None):
+        values = self._result.value(key, default)
+        self._rows += len(values)
+        self._finish()
+        return values
+
+    def single(self, strict=False):
+        record = self._result.single(strict=strict)
+        self._rows += record is not None
+        self._finish()
+        return record
+
+    def consume(self):
+        summary = self._result.consume()
+        if self._recorded:
+            return summary
+        return self._finish(summary)
+
+
+class _InstrumentedRunner:
+    """
+    Shared `run` of the session and transaction proxies.
+    """
+
+    def __init__(self, target, stats, profile_sample_rate):
+        self._target = target
+        self._stats = stats
+        self._profile_sample_rate = profile_sample_rate
+        self._pending = None
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def run(self, query, parameters=None, **kwargs):
+        profiled = (
+            self._profile_sample_rate > 0
+            and random.random() < self._profile_sample_rate
+            and isinstance(query, str)
+            and not _NOT_PROFILABLE.match(query)
+        )
+        if self._pending is not None:
+            # The open result ends here; it is not consumed, so its records stay readable,
+            # but its summary (counters, db hits) is not available yet and is left out
+            self._pending._finish(consume=False)
+        start = time.perf_counter()
+        result = self._target.run(f"PROFILE {query}" if profiled else query, parameters, **kwargs)
+        self._pending = _InstrumentedResult(result, str(query), start, self._stats, profiled)
+        return self._pending
+
+    def _finish_pending(self):
+        """
+        Record the last result if it was never consumed explicitly, before the server discards it.
+        """
+        if self._pending is not None:
+            self._pending._finish()
+            self._pending = None
+
+
+class InstrumentedTransaction(_InstrumentedRunner):
+    """
+    A transaction proxy recording its statements.
+    """
+
+    def __enter__(self):
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._finish_pending()
+        return self._target.__exit__(exc_type, exc_value, traceback)
+
+    def commit(self):
+        self._finish_pending()
+        return self._target.commit()
+
+
+class InstrumentedSession(_InstrumentedRunner):
+    """
+    A session proxy recording its statements, including those of managed transactions.
+    """
+
+    def __enter__(self):
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._finish_pending()
+        return self._target.__exit__(exc_type, exc_value, traceback)
+
+    def close(self):
+        self._finish_pending()
+        return self._target.close()
+
+    def _wrap_work(self, work):
+        def instrumented_work(tx, *args, **kwargs):
+            instrumented = InstrumentedTransaction(tx, self._stats, self._profile_sample_rate)
+            try:
+                return work(instrumented, *args, **kwargs)
+            finally:
+                instrumented._finish_pending()
+        return instrumented_work
+
+    def execute_read(self, work, *args, **kwargs):
+        return self._target.execute_read(self._wrap_work(work), *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        return self._target.execute_write(self._wrap_work(work), *args, **kwargs)
+
+    def begin_transaction(self, *args, **kwargs):
+        return InstrumentedTransaction(self._target.begin_transaction(*args, **kwargs), self._stats,
+                                       self._profile_sample_rate)
+
+
+class InstrumentedDriver:
+    """
+    A driver proxy whose sessions record their statements in a `QueryStats`.
+
+    Attributes
+    ----------
+    driver : neo4j.Driver
+        The wrapped driver; everything but `session` is delegated to it.
+    stats : QueryStats
+        The aggregation the statements are recorded in.
+    profile_sample_rate : float
+        The fraction of statements run with PROFILE to collect database hits.
+    """
+
+    def __init__(self, driver, stats, profile_sample_rate=PROFILE_SAMPLE_RATE):
+        self.driver = driver
+        self.stats = stats
+        self.profile_sample_rate = profile_sample_rate
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def session(self, **kwargs):
+        """
+        Opens an instrumented session on the wrapped driver.
+        """
+        return InstrumentedSession(self.driver.session(**kwargs), self.stats, self.profile_sample_rate)
+
+
+def _configure_slow_query_log():
+    """
+    Write the slow-query log to NEO4J_SLOW_QUERY_LOG, if set.
+    """
+    if SLOW_QUERY_LOG and not slow_query_logger.handlers:
+        handler = logging.FileHandler(SLOW_QUERY_LOG)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        slow_query_logger.addHandler(handler)
+
+
+_configure_slow_query_log()
+
+# Process-wide aggregation used by Neo4jConnection
+QUERY_STATS = QueryStats()
+atexit.register(QUERY_STATS.log_summary)
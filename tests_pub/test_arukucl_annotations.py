@@ -0,0 +1,54 @@
+import os
+import sys
+import pandas as pd
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.db_entry.add_arukuclprocess2neo4j import aggregate_biological_processes, build_annotation_rows, ANNOTATION_PROPERTY_MAPPING
+
+
+def make_annotations():
+    return pd.DataFrame([
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P05067', 'SYMBOL': 'APP', 'GO TERM': 'GO:0006915',
+         'GO NAME': 'apoptotic process', 'GO EVIDENCE CODE': 'IDA', 'REFERENCE': 'PMID:1', 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P05067', 'SYMBOL': 'APP', 'GO TERM': 'GO:0006915',
+         'GO NAME': 'apoptotic process', 'GO EVIDENCE CODE': 'IDA', 'REFERENCE': 'PMID:1', 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P05067', 'SYMBOL': 'APP', 'GO TERM': 'GO:0042157',
+         'GO NAME': 'lipoprotein metabolic process', 'GO EVIDENCE CODE': None, 'REFERENCE': 'PMID:2', 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P10636', 'SYMBOL': 'MAPT', 'GO TERM': 'GO:0006915',
+         'GO NAME': 'apoptotic process', 'GO EVIDENCE CODE': 'IMP', 'REFERENCE': 'PMID:3', 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+    ])
+
+
+def test_annotation_rows_are_deduplicated():
+    rows = build_annotation_rows(make_annotations())
+
+    assert [process['goTerm'] for process in rows['processes']] == ['GO:0006915', 'GO:0042157']
+    assert rows['processes'][0] == {'label': 'apoptotic process', 'goTerm': 'GO:0006915', 'goName': 'apoptotic process', 'goAspect': 'P'}
+    assert rows['gene_products'] == [
+        {'geneProductDb': 'UniProtKB', 'geneProductId': 'P05067', 'symbol': 'APP', 'taxonId': '9606'},
+        {'geneProductDb': 'UniProtKB', 'geneProductId': 'P10636', 'symbol': 'MAPT', 'taxonId': '9606'},
+    ]
+    assert len(rows['annotations']) == 3
+
+
+def test_annotation_properties_are_complete_merge_keys():
+    annotations = build_annotation_rows(make_annotations())['annotations']
+
+    assert all(set(annotation['properties']) == set(ANNOTATION_PROPERTY_MAPPING.values()) for annotation in annotations)
+    assert annotations[1]['properties']['goEvidenceCode'] == ''
+    assert annotations[1]['properties']['qualifier'] == ''
+
+
+def test_aggregated_processes_keep_types_and_skip_missing_values():
+    data = make_annotations()
+    data.loc[1, 'TAXON ID'] = None  # The column becomes float with a gap
+    apoptosis, lipoprotein = aggregate_biological_processes(data)
+
+    assert apoptosis['symbol'] == 'APP, APP, MAPT'
+    assert apoptosis['taxonId'] == '9606, 9606'
+    assert apoptosis['goEvidenceCode'] == 'IDA, IDA, IMP'
+    assert lipoprotein['taxonId'] == 9606 and isinstance(lipoprotein['taxonId'], int)
+    assert lipoprotein['goEvidenceCode'] is None and lipoprotein['reference'] == 'PMID:2'
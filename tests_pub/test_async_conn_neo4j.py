@@ -0,0 +1,86 @@
+import os
+import sys
+import asyncio
+from types import SimpleNamespace
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils import async_conn_neo4j
+from src_pub.utils.async_conn_neo4j import AsyncNeo4jConnection
+
+
+class StandInResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def data(self):
+        return [{'id': row} for row in self.rows]
+
+    async def consume(self):
+        counters = SimpleNamespace(nodes_created=len(self.rows), nodes_deleted=0, relationships_created=0,
+                                   relationships_deleted=0, properties_set=2 * len(self.rows))
+        return SimpleNamespace(counters=counters)
+
+
+class StandInAsyncDriver:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.written = []
+        self.closed = False
+
+    async def verify_connectivity(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    def session(self, **kwargs):
+        return StandInAsyncSession(self)
+
+
+class StandInAsyncSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, rows=(), **parameters):
+        self.driver.in_flight += 1
+        self.driver.max_in_flight = max(self.driver.max_in_flight, self.driver.in_flight)
+        await asyncio.sleep(0.001)
+        self.driver.in_flight -= 1
+        self.driver.written.extend(rows)
+        return StandInResult(rows)
+
+    async def execute_read(self, work):
+        return await work(self)
+
+    async def execute_write(self, work):
+        return await work(self)
+
+
+def test_write_batches_bounds_the_batches_in_flight(monkeypatch):
+    driver = StandInAsyncDriver()
+    monkeypatch.setattr(async_conn_neo4j.AsyncGraphDatabase, 'driver', lambda *args, **kwargs: driver)
+
+    async def run():
+        async with AsyncNeo4jConnection('bolt://db:7687', 'neo4j', 'secret') as conn:
+            totals = await conn.write_batches('UNWIND $rows AS row CREATE (n {id: row})', range(1050),
+                                              batch_size=100, max_in_flight=3)
+            records = await conn.read('RETURN 1', rows=[7])
+        return totals, records
+
+    totals, records = asyncio.run(run())
+    assert totals['rows'] == 1050 and totals['batches'] == 11
+    assert totals['nodes_created'] == 1050 and totals['properties_set'] == 2100
+    assert sorted(driver.written[:-1]) == list(range(1050))
+    assert 1 < driver.max_in_flight <= 3
+    assert records == [{'id': 7}]
+    assert driver.closed
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import threading
+import pytest
+from types import SimpleNamespace
+from neo4j.exceptions import TransientError
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.batch_writer import BatchWriter
+
+
+class StandInTransaction:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, rows=(), **parameters):
+        with self.driver.lock:
+            self.driver.in_flight += 1
+            self.driver.max_in_flight = max(self.driver.max_in_flight, self.driver.in_flight)
+        time.sleep(0.002)
+        with self.driver.lock:
+            self.driver.in_flight -= 1
+            self.driver.batches.append(list(rows))
+        counters = SimpleNamespace(nodes_created=len(rows), relationships_created=0, properties_set=len(rows))
+        return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters))
+
+
+class StandInDriver:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batches = []
+
+    def session(self, **kwargs):
+        return StandInSession(self)
+
+
+class StandInSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work, *args):
+        with self.driver.lock:
+            if self.driver.failures:
+                self.driver.failures -= 1
+                raise TransientError("deadlock detected")
+        return work(StandInTransaction(self.driver), *args)
+
+
+def test_rows_are_written_in_batches_with_bounded_concurrency():
+    driver = StandInDriver()
+    with BatchWriter(driver, 'UNWIND $rows AS row CREATE (n {id: row.id})', batch_size=10, max_in_flight=3) as writer:
+        writer.write({'id': index} for index in range(95))
+
+    assert writer.totals['rows'] == 95 and writer.totals['batches'] == 10
+    assert writer.totals['nodes_created'] == 95
+    assert sorted(len(batch) for batch in driver.batches) == [5] + [10] * 9
+    assert sorted(row['id'] for batch in driver.batches for row in batch) == list(range(95))
+    assert 1 < driver.max_in_flight <= 3
+
+
+def test_transient_errors_are_retried_with_backoff():
+    driver = StandInDriver(failures=2)
+    writer = BatchWriter(driver, work=lambda tx, rows: tx.run('CREATE (n)', rows=rows).consume().counters.nodes_created,
+                         batch_size=4, backoff_base=0)
+    totals = writer.write(range(8)).close()
+    assert totals['retries'] == 2 and totals['batches'] == 2 and totals['written'] == 8
+
+    driver = StandInDriver(failures=5)
+    writer = BatchWriter(driver, 'CREATE (n)', batch_size=4, max_retries=2, backoff_base=0)
+    with pytest.raises(TransientError):
+        writer.write(range(4)).close()
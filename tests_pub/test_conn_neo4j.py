@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils import conn_neo4j
+from src_pub.utils.conn_neo4j import Neo4jConnection, get_driver, close_all_drivers
+
+
+class RecordingDriver:
+    def __init__(self, uri, auth, **config):
+        self.uri = uri
+        self.auth = auth
+        self.config = config
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_shared_driver_is_created_once_per_uri_and_credentials(monkeypatch):
+    created = []
+
+    def driver(uri, auth, **config):
+        created.append(RecordingDriver(uri, auth, **config))
+        return created[-1]
+
+    monkeypatch.setattr(conn_neo4j.GraphDatabase, 'driver', driver)
+    close_all_drivers()
+
+    drivers = []
+    threads = [
+        threading.Thread(target=lambda: drivers.append(get_driver('bolt://db:7687', 'neo4j', 'secret')))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1 and all(found is created[0] for found in drivers)
+    assert created[0].config['fetch_size'] == conn_neo4j.DRIVER_CONFIG['fetch_size']
+
+    with Neo4jConnection('bolt://db:7687', 'neo4j', 'secret') as conn:
+        assert conn.driver is created[0]
+    assert not created[0].closed
+    assert get_driver('bolt://db:7687', 'reader', 'secret') is not created[0]
+    assert get_driver('bolt://db:7687', 'neo4j', 'wrong') is not created[0]
+    assert created[-1].auth.credentials == 'wrong'
+
+    close_all_drivers()
+    assert all(driver.closed for driver in created)
+    assert get_driver('bolt://db:7687', 'neo4j', 'secret') is created[-1] and len(created) == 4
+    close_all_drivers()
+
+
+def test_private_connection_closes_its_driver(monkeypatch):
+    monkeypatch.setattr(conn_neo4j.GraphDatabase, 'driver', RecordingDriver)
+
+    with Neo4jConnection('bolt://db:7687', 'neo4j', 'secret', shared=False) as conn:
+        driver = conn.driver
+    assert driver.closed
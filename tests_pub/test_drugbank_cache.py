@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+pytest.importorskip('pyarrow')
+
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml
+from src_pub.db_entry import drugbank_cache
+from src_pub.db_entry.drugbank_cache import cache_path_for, load_or_build_drug_cache
+from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+def test_cached_records_equal_the_parsed_records(tmp_path):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=15)
+    parser = DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False)
+    cache_dir = str(tmp_path / 'cache')
+
+    parsed = parser.parse_drugbank_xml(cache_dir=cache_dir)
+    assert os.path.exists(cache_path_for(xml_path, cache_dir))
+    assert parsed == parser.parse_drugbank_xml()
+    assert parser.parse_drugbank_xml(cache_dir=cache_dir) == parsed
+
+
+def test_cache_is_rebuilt_when_the_release_or_the_fields_change(tmp_path, monkeypatch):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=5)
+    cache_dir = str(tmp_path / 'cache')
+    parses = []
+
+    def parse():
+        parses.append(1)
+        return [{'DrugBank ID': f"DB{len(parses):05d}", 'GO Classifiers': []}]
+
+    assert load_or_build_drug_cache(xml_path, cache_dir, parse) == [{'DrugBank ID': 'DB00001', 'GO Classifiers': []}]
+    assert load_or_build_drug_cache(xml_path, cache_dir, parse)[0]['DrugBank ID'] == 'DB00001'
+    assert len(parses) == 1
+
+    # A new release of the same size, with a different modification time
+    write_drugbank_xml(xml_path, drug_count=5, seed=1)
+    os.utime(xml_path, ns=(os.stat(xml_path).st_atime_ns, os.stat(xml_path).st_mtime_ns + 10**9))
+    assert load_or_build_drug_cache(xml_path, cache_dir, parse)[0]['DrugBank ID'] == 'DB00002'
+
+    monkeypatch.setattr(drugbank_cache, 'DRUG_FIELD_SPEC', {**drugbank_cache.DRUG_FIELD_SPEC, 'CAS Number': {'path': 'db:cas-number'}})
+    assert load_or_build_drug_cache(xml_path, cache_dir, parse)[0]['DrugBank ID'] == 'DB00003'
+    assert len(os.listdir(cache_dir)) == 3
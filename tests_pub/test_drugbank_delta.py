@@ -0,0 +1,104 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml
+from src_pub.db_entry import add_drugbank2neo4j
+from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+class DrugStoreSession:
+    """
+    Keeps Drug nodes in a dict and answers the queries of the delta pipeline.
+    """
+    def __init__(self, drugs):
+        self.drugs = drugs
+        self.upserted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work, *args):
+        return work(self, *args)
+
+    def run(self, query, **parameters):
+        if 'RETURN d.drugbankId AS drugbankId' in query:
+            return [{'drugbankId': drugbank_id, 'contentHash': node['contentHash'],
+                     'removed': node.get('removedFromRelease', False)} for drugbank_id, node in self.drugs.items()]
+        if 'removedFromRelease = true' in query:
+            for drugbank_id in parameters['drugbankIds']:
+                self.drugs[drugbank_id]['removedFromRelease'] = True
+            return SimpleNamespace(single=lambda: {'flagged': len(parameters['drugbankIds'])})
+        for row in parameters['rows']:
+            self.upserted.append(row['drugbankId'])
+            node = self.drugs.setdefault(row['drugbankId'], {'uuid': row['uuid']})
+            node.update(row['properties'])
+            node.pop('removedFromRelease', None)
+        counters = SimpleNamespace(nodes_created=0, properties_set=0)
+        return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters, result_available_after=0,
+                                                               result_consumed_after=0))
+
+
+class StandInConnection:
+    session = None
+
+    def __init__(self, uri, user, password, **kwargs):
+        self.driver = SimpleNamespace(session=lambda **config: StandInConnection.session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def ensure_schema(self):
+        pass
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(add_drugbank2neo4j, 'Neo4jConnection', StandInConnection)
+    StandInConnection.session = DrugStoreSession({})
+    return StandInConnection.session
+
+
+def test_delta_ingest_stores_top_level_drugs_and_detects_changes(tmp_path, store):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=40, proteins_per_drug=0)
+    parser = DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False)
+
+    stats = parser.run_delta_pipeline(batch_size=16)
+    assert stats['new'] == 40 and stats['duplicates'] == 0
+    assert sorted(store.drugs) == [f"DB{index:05d}" for index in range(1, 41)]
+    # Drugs also listed in the pathways of earlier drugs keep their full record
+    assert all(node['description'] and node['class'] for node in store.drugs.values())
+
+    store.upserted.clear()
+    assert parser.run_delta_pipeline(batch_size=16)['unchanged'] == 40 and store.upserted == []
+
+    with open(xml_path, encoding='utf-8') as f:
+        xml = f.read()
+    with open(xml_path, 'w', encoding='utf-8') as f:
+        f.write(xml.replace('APRD00006</drugbank-id><name>Synthetic drug 7</name><description>',
+                            'APRD00006</drugbank-id><name>Synthetic drug 7</name><description>Revised. '))
+    stats = parser.run_delta_pipeline(batch_size=16)
+    assert (stats['changed'], stats['unchanged']) == (1, 39) and store.upserted == ['DB00007']
+    assert store.drugs['DB00007']['description'].startswith('Revised. ')
+
+
+def test_drugs_missing_from_the_release_are_flagged(tmp_path, store):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=5, proteins_per_drug=0)
+    store.drugs['DB09999'] = {'contentHash': 'old'}
+    stats = DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False).run_delta_pipeline(flag_removed=True)
+
+    assert stats['removed'] == 1 and store.drugs['DB09999']['removedFromRelease'] is True
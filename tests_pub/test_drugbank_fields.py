@@ -0,0 +1,31 @@
+import os
+import sys
+from lxml import etree
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.bench_extract_drug_info import legacy_extract_drug_info, load_drug_elements
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml
+from src_pub.db_entry.drugbank_fields import DRUG_FIELD_SPEC, DrugFieldExtractor
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+def test_field_extractor_matches_the_legacy_extraction(tmp_path):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=25, go_per_polypeptide=3)
+    extract = DrugFieldExtractor(DRUG_FIELD_SPEC, NAMESPACE)
+
+    drugs = load_drug_elements(xml_path, max_drugs=25)
+    assert len(drugs) == 25
+    for drug in drugs:
+        assert extract(drug) == legacy_extract_drug_info(drug)
+
+
+def test_field_extractor_matches_the_legacy_extraction_of_sparse_drugs():
+    sparse = etree.fromstring(
+        '<drug xmlns="http://www.drugbank.ca"><drugbank-id primary="true">DB99999</drugbank-id>'
+        '<name>Sparse</name><description/><affected-organisms/></drug>'
+    )
+    assert DrugFieldExtractor(DRUG_FIELD_SPEC, NAMESPACE)(sparse) == legacy_extract_drug_info(sparse)
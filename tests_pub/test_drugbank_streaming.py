@@ -0,0 +1,173 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.bench_ingest import StandInSession
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml
+from src_pub.db_entry import add_drugbank2neo4j
+from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+class RecordingSession(StandInSession):
+    """
+    Records the DrugBank IDs of every written batch; fails on batch number `fail_on`.
+    """
+    def __init__(self, fail_on=None):
+        super().__init__()
+        self.batches = []
+        self.fail_on = fail_on
+
+    def execute_write(self, transaction_function, *args, **kwargs):
+        if self.fail_on is not None and len(self.batches) + 1 == self.fail_on:
+            raise RuntimeError("Neo4j went away")
+        self.batches.append([drug['DrugBank ID'] for drug in args[0]])
+        return super().execute_write(transaction_function, *args, **kwargs)
+
+
+class StandInConnection:
+    current_session = None
+
+    def __init__(self, uri, user, password, **kwargs):
+        self.driver = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def ensure_schema(self):
+        pass
+
+    def session(self, **kwargs):
+        return StandInConnection.current_session
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=30, proteins_per_drug=0)
+    monkeypatch.setattr(add_drugbank2neo4j, 'Neo4jConnection', StandInConnection)
+    return DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False)
+
+
+def wait_for_parser_thread():
+    for thread in threading.enumerate():
+        if thread.name == 'drugbank-xml-parser':
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+
+def test_streamed_drugs_are_written_in_file_order(pipeline):
+    StandInConnection.current_session = RecordingSession()
+    pipeline.run_streaming_pipeline(queue_size=2, batch_size=7)
+
+    expected = [drug['DrugBank ID'] for drug in pipeline.parse_drugbank_xml()]
+    assert [drugbank_id for batch in StandInConnection.current_session.batches for drugbank_id in batch] == expected
+    assert all(len(batch) == 7 for batch in StandInConnection.current_session.batches[:-1])
+
+
+def test_writer_failure_stops_the_parser_early(pipeline, monkeypatch):
+    produced = []
+    total = len(pipeline.parse_drugbank_xml())
+    iter_drugs = pipeline._iter_drugs
+
+    def counting_iter_drugs(*args, **kwargs):
+        for drug in iter_drugs(*args, **kwargs):
+            produced.append(drug)
+            yield drug
+
+    monkeypatch.setattr(pipeline, '_iter_drugs', counting_iter_drugs)
+    StandInConnection.current_session = RecordingSession(fail_on=2)
+    with pytest.raises(RuntimeError, match="Neo4j went away"):
+        pipeline.run_streaming_pipeline(queue_size=2, batch_size=3)
+
+    wait_for_parser_thread()
+    assert StandInConnection.current_session.batches == [[drug['DrugBank ID'] for drug in produced[:3]]]
+    # The parser stops once the bounded queue is full instead of reading the whole file
+    assert len(produced) <= 3 + 3 + 2 + 1 < total
+
+
+def test_parser_errors_reach_the_caller(pipeline, monkeypatch):
+    drugs = pipeline.parse_drugbank_xml()[:4]
+
+    def failing_iter_drugs(*args, **kwargs):
+        yield from drugs
+        raise ValueError("truncated XML")
+
+    monkeypatch.setattr(pipeline, '_iter_drugs', failing_iter_drugs)
+    StandInConnection.current_session = RecordingSession()
+    with pytest.raises(ValueError, match="truncated XML"):
+        pipeline.run_streaming_pipeline(queue_size=2, batch_size=3)
+
+    wait_for_parser_thread()
+    assert sum(len(batch) for batch in StandInConnection.current_session.batches) == 4
+
+
+@pytest.mark.parametrize('drug_count, expected_sizes', [(10, [4, 4, 2]), (8, [4, 4]), (3, [3]), (0, [])])
+def test_drugs_are_written_in_batches_of_at_most_batch_size(pipeline, drug_count, expected_sizes):
+    drugs = pipeline.parse_drugbank_xml()[:drug_count]
+    session = RecordingSession()
+    totals = pipeline.write_drugs_in_batches(session, iter(drugs), batch_size=4)
+
+    assert [len(batch) for batch in session.batches] == expected_sizes
+    assert [drugbank_id for batch in session.batches for drugbank_id in batch] == [drug['DrugBank ID'] for drug in drugs]
+    assert totals['batches'] == len(expected_sizes) and totals['drugs'] == totals['nodes_created'] == drug_count
+
+
+def test_batch_size_must_be_positive(pipeline):
+    with pytest.raises(ValueError):
+        pipeline.write_drugs_in_batches(RecordingSession(), [], batch_size=0)
+
+
+class LazyFuture:
+    def __init__(self, executor, function, args):
+        self.executor = executor
+        self.function = function
+        self.args = args
+
+    def result(self):
+        self.executor.outstanding -= 1
+        return self.function(*self.args)
+
+
+class LazyExecutor:
+    """
+    Runs submitted shards in the calling process and tracks how many results are held at once.
+    """
+    def __init__(self, max_workers):
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, function, *args):
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        return LazyFuture(self, function, args)
+
+
+def test_parallel_parse_keeps_a_bounded_window_of_shards(pipeline, monkeypatch):
+    executors = []
+    def make_executor(max_workers):
+        executors.append(LazyExecutor(max_workers))
+        return executors[-1]
+
+    monkeypatch.setattr(add_drugbank2neo4j, 'ProcessPoolExecutor', make_executor)
+    monkeypatch.setattr(add_drugbank2neo4j, 'MAX_SHARD_BYTES', 2048)
+
+    drugs = list(pipeline.iter_drugbank_xml_parallel(max_workers=2, shards_per_worker=1))
+
+    assert drugs == pipeline.parse_drugbank_xml()
+    assert executors[0].max_outstanding == 3
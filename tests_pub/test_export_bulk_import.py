@@ -0,0 +1,113 @@
+import os
+import sys
+import csv
+import pandas as pd
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml
+from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+from src_pub.db_entry.export_bulk_import import write_bulk_import_files, build_drug_rows, build_import_command, ARRAY_DELIMITER
+
+
+def make_drug(drugbank_id, go_processes):
+    return {
+        'DrugBank ID': drugbank_id,
+        'Name': f'Drug {drugbank_id}',
+        'Description': 'A description, with a comma and a "quote"',
+        'GO Classifiers': [{'Category': 'process', 'Description': '; '.join(go_processes)}] if go_processes else [],
+        'Indication': 'Indication text',
+    }
+
+
+def make_annotations():
+    return pd.DataFrame([
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P05067', 'SYMBOL': 'APP', 'GO TERM': 'GO:0006915',
+         'GO NAME': 'apoptotic process', 'GO EVIDENCE CODE': 'IDA', 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P10636', 'SYMBOL': 'MAPT', 'GO TERM': 'GO:0006915',
+         'GO NAME': 'apoptotic process', 'GO EVIDENCE CODE': 'IMP', 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+        {'GENE PRODUCT DB': 'UniProtKB', 'GENE PRODUCT ID': 'P02649', 'SYMBOL': 'APOE', 'GO TERM': 'GO:0042157',
+         'GO NAME': 'lipoprotein metabolic process', 'GO EVIDENCE CODE': None, 'TAXON ID': 9606, 'GO ASPECT': 'P'},
+    ])
+
+
+def read_pair(header_path, data_path):
+    with open(header_path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+    with open(data_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    return header, rows
+
+
+def test_bulk_import_files_are_well_formed_and_consistent(tmp_path):
+    drugs = [
+        make_drug('DB00001', ['Apoptotic process', 'unknown process']),
+        make_drug('DB00002', ['lipoprotein metabolic process', 'neuron death']),
+        make_drug('DB00003', []),
+        make_drug('DB00001', ['apoptotic process']),  # Duplicate, the first occurrence wins
+    ]
+    files = write_bulk_import_files(drugs, make_annotations(), str(tmp_path), go_name_to_id={'neuron death': 'GO:0070997'})
+
+    ids_by_label = {}
+    for label, header_path, data_path in files['nodes']:
+        header, rows = read_pair(header_path, data_path)
+        assert header[0] == 'uuid:ID' and header[-1] == ':LABEL'
+        assert all(len(row) == len(header) for row in rows)
+        assert all(row[-1] == label for row in rows)
+        ids_by_label[label] = [row[0] for row in rows]
+
+    all_ids = [node_id for ids in ids_by_label.values() for node_id in ids]
+    assert len(all_ids) == len(set(all_ids))
+    assert len(ids_by_label['Drug']) == 3
+    assert len(ids_by_label['BiologicalProcess']) == 2
+    assert len(ids_by_label['Pathology']) == 1
+
+    expected_ends = {'AFFECTS': ('Drug', 'BiologicalProcess'), 'RELATED_TO': ('BiologicalProcess', 'Pathology')}
+    for rel_type, header_path, data_path in files['relationships']:
+        header, rows = read_pair(header_path, data_path)
+        assert header == [':START_ID', ':END_ID', ':TYPE']
+        start_label, end_label = expected_ends[rel_type]
+        for start, end, row_type in rows:
+            assert row_type == rel_type
+            assert start in ids_by_label[start_label]
+            assert end in ids_by_label[end_label]
+
+    assert files['counts'] == {'drugs': 3, 'biological_processes': 2, 'pathologies': 1, 'affects': 2, 'related_to': 2}
+
+
+def test_annotations_are_aggregated_per_go_term(tmp_path):
+    files = write_bulk_import_files([], make_annotations(), str(tmp_path))
+    label, header_path, data_path = files['nodes'][1]
+    header, rows = read_pair(header_path, data_path)
+    process = dict(zip(header, rows[0]))
+
+    assert label == 'BiologicalProcess'
+    assert process['goTerm'] == 'GO:0006915'
+    assert process['label'] == 'apoptotic process'
+    assert process['symbol'] == 'APP, MAPT'
+    assert process['goEvidenceCode'] == 'IDA, IMP'
+
+
+def test_drug_arrays_use_the_array_delimiter(tmp_path):
+    drugs = [make_drug('DB00001', ['apoptotic process', 'lipoprotein metabolic process'])]
+    files = write_bulk_import_files(drugs, make_annotations(), str(tmp_path))
+    label, header_path, data_path = files['nodes'][0]
+    header, rows = read_pair(header_path, data_path)
+    drug = dict(zip(header, rows[0]))
+
+    assert drug['affectedGoProcess:string[]'] == ARRAY_DELIMITER.join(['apoptotic process', 'lipoprotein metabolic process'])
+    assert drug['affectedGoProcessId:string[]'] == ARRAY_DELIMITER.join(['GO:0006915', 'GO:0042157'])
+    assert drug['description'] == 'A description, with a comma and a "quote"'
+    assert f'--array-delimiter="{ARRAY_DELIMITER}"' in build_import_command(files)
+    assert '--multiline-fields=true' in build_import_command(files)
+
+
+def test_drug_rows_keep_the_full_record_of_drugs_listed_in_pathways(tmp_path):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=30, proteins_per_drug=0)
+    parser = DrugBank2Neo4j(xml_path, {'db': 'http://www.drugbank.ca'}, configure_logging=False)
+    rows = build_drug_rows(parser.parse_drugbank_xml())
+
+    assert [row['drugbankId'] for row in rows] == [f"DB{index:05d}" for index in range(1, 31)]
+    assert all(row['description'] and row['class'] for row in rows)
@@ -0,0 +1,81 @@
+import os
+import sys
+import gzip
+import pandas as pd
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.synthetic_fixtures import write_arukucl_tsv
+from src_pub.dataset_prep.go_annotation_reader import (
+    iter_annotation_chunks, write_annotation_chunks, detect_annotation_format, ARUKUCL_COLUMNS,
+)
+
+GAF = (
+    "!gaf-version: 2.2\n"
+    "!generated-by: GOC\n"
+    "UniProtKB\tA0A024RBG1\tNUDT4B\tenables\tGO:0003723\tGO_REF:0000043\tIEA\tUniProtKB-KW:KW-0694\tF\t"
+    "Diphosphoinositol polyphosphate phosphohydrolase NUDT4B\tNUDT4B\tprotein\ttaxon:9606\t20230306\tUniProt\t\t\n"
+    "UniProtKB\tP05067\tAPP\tinvolved_in\tGO:0006915\tPMID:1\tIDA\t\tP\t"
+    "Amyloid-beta precursor protein\tAPP\tprotein\ttaxon:9606|taxon:10090\t20230306\tARUK-UCL\t\t\n"
+)
+
+
+@pytest.mark.parametrize('use_pyarrow', [True, False])
+def test_chunked_tsv_matches_a_full_read(tmp_path, use_pyarrow):
+    tsv_path = write_arukucl_tsv(str(tmp_path / 'annotations.tsv'), annotation_count=3000)
+    chunks = list(iter_annotation_chunks(tsv_path, aspects=['P'], chunksize=500, use_pyarrow=use_pyarrow))
+    streamed = pd.concat(chunks, ignore_index=True)
+    expected = pd.read_csv(tsv_path, sep='\t', dtype=str)
+    expected = expected[expected['GO ASPECT'] == 'P'].reset_index(drop=True)
+
+    assert list(streamed.columns) == ARUKUCL_COLUMNS
+    assert isinstance(chunks[0]['GO ASPECT'].dtype, pd.CategoricalDtype)
+    assert streamed['GENE PRODUCT ID'].tolist() == expected['GENE PRODUCT ID'].tolist()
+    assert streamed['REFERENCE'].tolist() == expected['REFERENCE'].tolist()
+
+
+@pytest.mark.parametrize('use_pyarrow', [True, False])
+def test_gzipped_gaf_is_mapped_to_the_arukucl_layout(tmp_path, use_pyarrow):
+    gaf_path = str(tmp_path / 'goa_human.gaf.gz')
+    with gzip.open(gaf_path, 'wt', encoding='utf-8') as f:
+        f.write(GAF)
+
+    assert detect_annotation_format(gaf_path) == 'gaf'
+    chunks = list(iter_annotation_chunks(gaf_path, aspects=['P'], go_names={'GO:0006915': 'apoptotic process'},
+                                         use_pyarrow=use_pyarrow))
+    annotation = pd.concat(chunks).astype(object).iloc[0]
+
+    assert len(chunks) == 1 and len(chunks[0]) == 1
+    assert annotation['GENE PRODUCT ID'] == 'P05067'
+    assert annotation['GO TERM'] == 'GO:0006915'
+    assert annotation['GO NAME'] == 'apoptotic process'
+    assert annotation['TAXON ID'] == '9606'
+    assert annotation['GO EVIDENCE CODE'] == 'IDA'
+
+
+def test_predicates_and_filtered_artifact(tmp_path):
+    tsv_path = write_arukucl_tsv(str(tmp_path / 'annotations.tsv'), annotation_count=2000)
+    artifact_path = str(tmp_path / 'out' / 'bioprocess.tsv')
+    chunks = iter_annotation_chunks(tsv_path, aspects=['P'], evidence_codes=['IDA', 'IMP'], taxa=[9606], chunksize=300)
+    streamed = pd.concat(list(write_annotation_chunks(chunks, artifact_path)), ignore_index=True)
+    expected = pd.read_csv(tsv_path, sep='\t', dtype=str)
+    expected = expected[(expected['GO ASPECT'] == 'P') & expected['GO EVIDENCE CODE'].isin(['IDA', 'IMP'])]
+
+    assert len(streamed) == len(expected) > 0
+    assert pd.read_csv(artifact_path, sep='\t', dtype=str)['REFERENCE'].tolist() == expected['REFERENCE'].tolist()
+
+
+def test_missing_columns_are_skipped_unless_requested(tmp_path):
+    tsv_path = write_arukucl_tsv(str(tmp_path / 'annotations.tsv'), annotation_count=200)
+    trimmed_path = str(tmp_path / 'trimmed.tsv')
+    pd.read_csv(tsv_path, sep='\t', dtype=str).drop(columns=['ECO ID', 'ANNOTATION EXTENSION']).to_csv(
+        trimmed_path, sep='\t', index=False)
+
+    streamed = pd.concat(iter_annotation_chunks(trimmed_path, aspects=['P']), ignore_index=True)
+    assert list(streamed.columns) == [col for col in ARUKUCL_COLUMNS if col not in ('ECO ID', 'ANNOTATION EXTENSION')]
+
+    with pytest.raises(ValueError, match='ECO ID'):
+        list(iter_annotation_chunks(trimmed_path, columns=['GO TERM', 'ECO ID']))
@@ -0,0 +1,56 @@
+import os
+import sys
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.gene_ontology_data.go_lookup_cache import GoLookupCache
+
+
+def test_each_distinct_name_is_resolved_once_including_misses(tmp_path):
+    calls = []
+
+    def resolve(name):
+        calls.append(name)
+        return {'signal transduction': 'GO:0007165'}.get(name.lower())
+
+    path = str(tmp_path / 'cache' / 'lookups.sqlite')
+    names = ['signal transduction', 'Signal  Transduction', 'no such process', 'signal transduction']
+    with GoLookupCache(path, 'releases/2024-01-17') as cache:
+        assert cache.resolve_all(names, resolve, max_workers=4) == {
+            'signal transduction': 'GO:0007165', 'no such process': None}
+    assert sorted(calls) == ['no such process', 'signal transduction']
+
+    with GoLookupCache(path, 'releases/2024-01-17') as cache:
+        assert cache.resolve_all(names, resolve) == {'signal transduction': 'GO:0007165', 'no such process': None}
+        assert cache.stats == {'hits': 1, 'negative_hits': 1, 'misses': 0, 'failed': 0}
+    assert len(calls) == 2
+
+
+def test_releases_and_expired_negative_results_are_looked_up_again(tmp_path):
+    path = str(tmp_path / 'lookups.sqlite')
+    with GoLookupCache(path, 'releases/2024-01-17') as cache:
+        cache.put_many({'apoptotic process': 'GO:0006915', 'no such process': None})
+
+    with GoLookupCache(path, 'releases/2024-06-17') as cache:
+        assert cache.get_many(['apoptotic process']) == {}
+
+    with GoLookupCache(path, 'releases/2024-01-17', negative_ttl=0) as cache:
+        assert cache.get_many(['Apoptotic process', 'no such process']) == {'apoptotic process': 'GO:0006915'}
+
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    def resolve(name):
+        if name == 'unreachable process':
+            raise ConnectionError("QuickGO is down")
+        return None
+
+    path = str(tmp_path / 'lookups.sqlite')
+    with GoLookupCache(path, 'quickgo') as cache:
+        assert cache.resolve_all(['unreachable process', 'no such process'], resolve) == {'no such process': None}
+        assert cache.resolve_all(['flaky process'], resolve_many=lambda names: {}) == {}
+        assert cache.stats['failed'] == 2
+
+    with GoLookupCache(path, 'quickgo') as cache:
+        assert cache.get_many(['unreachable process', 'flaky process', 'no such process']) == {'no such process': None}
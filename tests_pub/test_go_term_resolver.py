@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.gene_ontology_data.go_term_resolver import GoTermResolver, load_or_build_index
+
+GO_BASIC_OBO = """format-version: 1.2
+data-version: releases/2024-01-17
+ontology: go
+
+[Term]
+id: GO:0012501
+name: programmed cell death
+namespace: biological_process
+alt_id: GO:0016244
+synonym: "PCD" EXACT []
+synonym: "RCD" RELATED []
+synonym: "caspase-independent \\"cell death\\"" NARROW [GOC:mtg]
+
+[Term]
+id: GO:0006915
+name: apoptotic process
+namespace: biological_process
+synonym: "apoptosis" NARROW []
+
+[Term]
+id: GO:0005515
+name: protein binding
+namespace: molecular_function
+
+[Term]
+id: GO:0006917
+name: obsolete induction of apoptosis
+namespace: biological_process
+is_obsolete: true
+replaced_by: GO:0006915
+
+[Typedef]
+id: part_of
+name: part of
+"""
+
+
+def write_obo(tmp_path):
+    path = tmp_path / 'go-basic.obo'
+    path.write_text(GO_BASIC_OBO)
+    return str(path)
+
+
+def test_names_synonyms_and_obsolete_terms_resolve_offline(tmp_path):
+    misses = []
+    resolver = GoTermResolver.from_file(write_obo(tmp_path), fallback=lambda name: misses.append(name) or 'GO:remote')
+
+    assert resolver.release == 'releases/2024-01-17'
+    assert resolver.resolve('Programmed  Cell Death') == 'GO:0012501'
+    assert resolver.resolve_local('PCD') == ('GO:0012501', 'EXACT')
+    assert resolver.resolve_local('caspase-independent "cell death"') == ('GO:0012501', 'NARROW')
+    assert resolver.resolve_local('induction of apoptosis') == ('GO:0006915', 'obsolete')
+    assert resolver.resolve_id('GO:0016244') == 'GO:0012501' and resolver.resolve_id('GO:0006917') == 'GO:0006915'
+    assert resolver.resolve('part of') == 'GO:remote' and misses == ['part of']
+    assert resolver.stats == {'local': 1, 'fallback': 1, 'unresolved': 0}
+
+    strict = GoTermResolver(resolver.index, kinds=('name', 'EXACT'), namespace='biological_process')
+    assert strict.resolve('RCD') is None and strict.resolve('protein binding') is None
+
+
+def test_index_is_reused_until_the_ontology_changes(tmp_path):
+    obo_path = write_obo(tmp_path)
+    index = load_or_build_index(obo_path)
+    assert os.path.exists(f"{obo_path}.index.json")
+
+    with open(f"{obo_path}.index.json") as handle:
+        stored = json.load(handle)
+    stored['names']['cached marker'] = [['GO:0000000', 'name']]
+    with open(f"{obo_path}.index.json", 'w') as handle:
+        json.dump(stored, handle)
+    assert 'cached marker' in load_or_build_index(obo_path)['names']
+
+    with open(obo_path, 'a') as obo:
+        obo.write('\n[Term]\nid: GO:0008150\nname: biological_process\nnamespace: biological_process\n')
+    rebuilt = load_or_build_index(obo_path)
+    assert 'cached marker' not in rebuilt['names'] and 'biological_process' in rebuilt['names']
+    assert rebuilt['terms'].keys() - index['terms'].keys() == {'GO:0008150'}
+
+
+def test_go_json_gives_the_same_index_as_obo(tmp_path):
+    iri = 'http://purl.obolibrary.org/obo/GO_{}'.format
+    document = {'graphs': [{'meta': {'version': 'http://purl.obolibrary.org/obo/go/releases/2024-01-17/go.json'}, 'nodes': [
+        {'id': iri('0006915'), 'lbl': 'apoptotic process', 'type': 'CLASS', 'meta': {
+            'synonyms': [{'pred': 'hasNarrowSynonym', 'val': 'apoptosis'}],
+            'basicPropertyValues': [{'pred': 'http://www.geneontology.org/formats/oboInOwl#hasOBONamespace',
+                                     'val': 'biological_process'}]}},
+        {'id': iri('0006917'), 'lbl': 'obsolete induction of apoptosis', 'type': 'CLASS', 'meta': {
+            'deprecated': True,
+            'basicPropertyValues': [{'pred': 'http://purl.obolibrary.org/obo/IAO_0100001', 'val': iri('0006915')}]}},
+    ]}]}
+    path = tmp_path / 'go.json'
+    path.write_text(json.dumps(document))
+    resolver = GoTermResolver.from_file(str(path))
+
+    assert resolver.resolve_local('apoptosis') == ('GO:0006915', 'NARROW')
+    assert resolver.resolve_id('GO:0006917') == 'GO:0006915'
+    assert resolver.resolve_local('induction of apoptosis') == ('GO:0006915', 'obsolete')
+    assert resolver.resolve('unknown process') is None and resolver.stats['unresolved'] == 1
+
+
+def test_names_shared_across_namespaces_keep_every_term(tmp_path):
+    path = tmp_path / 'shared.obo'
+    path.write_text(
+        "format-version: 1.2\ndata-version: releases/2024-01-17\n\n"
+        "[Term]\nid: GO:0000001\nname: first function\nnamespace: molecular_function\n"
+        "synonym: \"shared thing\" RELATED []\n\n"
+        "[Term]\nid: GO:0000002\nname: second process\nnamespace: biological_process\n"
+        "synonym: \"shared thing\" RELATED []\n"
+        "synonym: \"first function\" EXACT []\n"
+    )
+    index = load_or_build_index(str(path))
+
+    assert index['names']['shared thing'] == [['GO:0000001', 'RELATED'], ['GO:0000002', 'RELATED']]
+    assert index['names']['first function'] == [['GO:0000001', 'name'], ['GO:0000002', 'EXACT']]
+    processes = GoTermResolver(index, namespace='biological_process')
+    assert processes.resolve_local('shared thing') == ('GO:0000002', 'RELATED')
+    assert processes.resolve_local('first function') == ('GO:0000002', 'EXACT')
+    assert GoTermResolver(index).resolve_local('shared thing') == ('GO:0000001', 'RELATED')
@@ -0,0 +1,125 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.graph_backend import GraphBackend, InMemoryGraph
+
+
+class Neo4jExportSession:
+    """
+    Answers the load queries of InMemoryGraph and records the flushed batches.
+    """
+    def __init__(self, writes):
+        self.writes = writes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, rows=None, **parameters):
+        if query.startswith('MATCH (n)'):
+            return [
+                {'id': '4:1', 'labels': ['Drug'], 'properties': {'drugbankId': 'DB00001', 'affectedGoProcessId': ['GO:1']}},
+                {'id': '4:2', 'labels': ['BiologicalProcess'], 'properties': {'goTerm': 'GO:1'}},
+                {'id': '4:3', 'labels': ['BiologicalProcess'], 'properties': {'goTerm': 'GO:2'}},
+            ]
+        if query.startswith('MATCH (a)-[r]->(b)'):
+            return [{'start': '4:1', 'type': 'AFFECTS', 'end': '4:2', 'properties': {}}]
+        self.writes.append((query, rows))
+        counters = SimpleNamespace(nodes_created=0, relationships_created=len(rows), properties_set=0)
+        return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters))
+
+    def execute_write(self, work, *args):
+        return work(self, *args)
+
+
+class Neo4jExportDriver:
+    def __init__(self):
+        self.writes = []
+
+    def session(self, **kwargs):
+        return Neo4jExportSession(self.writes)
+
+
+def test_in_memory_graph_merges_links_and_counts():
+    graph = InMemoryGraph()
+    assert graph.merge_nodes('Drug', [{'drugbankId': 'DB00001', 'name': 'a'}, {'drugbankId': 'DB00002'}]) == 2
+    assert graph.merge_nodes('Drug', [{'drugbankId': 'DB00001', 'name': 'b'}]) == 0
+    graph.merge_nodes('BiologicalProcess', [{'goTerm': 'GO:1'}, {'goTerm': 'GO:2'}])
+    graph.merge_nodes('Pathology', [{'pathologyName': 'Alzheimer'}])
+
+    pairs = [('DB00001', 'GO:1'), ('DB00001', 'GO:2'), ('DB00002', 'GO:1'), ('DB00001', 'GO:1'), ('DB00003', 'GO:1')]
+    assert graph.link('Drug', 'BiologicalProcess', 'AFFECTS', pairs) == 3
+    graph.link('BiologicalProcess', 'Pathology', 'RELATED_TO', [('GO:1', 'Alzheimer')])
+
+    assert [node['goTerm'] for node in graph.neighbors('Drug', 'DB00001', 'AFFECTS')] == ['GO:1', 'GO:2']
+    assert [node['drugbankId'] for node in graph.neighbors('BiologicalProcess', 'GO:1', direction='in')] == ['DB00001', 'DB00002']
+    assert [node.get('pathologyName') for node in graph.neighbors('BiologicalProcess', 'GO:1', direction='both',
+                                                                  neighbor_label='Pathology')] == ['Alzheimer']
+    assert graph.get_node('Drug', 'DB00001')['name'] == 'b' and graph.get_node('Drug', 'DB00001')['uuid']
+    assert graph.update_properties('Drug', [{'drugbankId': 'DB00002', 'rating_0': 0.4}, {'drugbankId': 'DB09999'}]) == 1
+    assert graph.label_counts() == {'BiologicalProcess': 2, 'Drug': 2, 'Pathology': 1}
+    assert graph.relationship_counts() == {'AFFECTS': 3, 'RELATED_TO': 1}
+
+
+def test_changes_are_flushed_back_to_neo4j():
+    driver = Neo4jExportDriver()
+    graph = InMemoryGraph.load_from_neo4j(driver, labels=['Drug', 'BiologicalProcess'])
+    assert graph.relationship_counts() == {'AFFECTS': 1}
+
+    assert graph.link('Drug', 'BiologicalProcess', 'AFFECTS', [('DB00001', 'GO:1'), ('DB00001', 'GO:2')]) == 1
+    flushed = graph.flush_to_neo4j(driver)
+    assert flushed == {'nodes': 0, 'relationships': 1}
+    query, rows = driver.writes[-1]
+    assert 'MERGE (a)-[r:`AFFECTS`]->(b)' in query
+    assert rows == [{'start': 'DB00001', 'end': 'GO:2', 'properties': {}}]
+    assert graph.flush_to_neo4j(driver) == {'nodes': 0, 'relationships': 0}
+
+
+def test_backends_must_implement_every_operation():
+    class PartialBackend(GraphBackend):
+        def merge_nodes(self, label, rows):
+            return 0
+
+    with pytest.raises(TypeError):
+        GraphBackend()
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+class MultiLabelSession(Neo4jExportSession):
+    def run(self, query, rows=None, **parameters):
+        if query.startswith('MATCH (n)'):
+            return [
+                {'id': '4:1', 'labels': ['GeneProduct', 'Protein'],
+                 'properties': {'geneProductId': 'GP1', 'uniprotId': 'P05067'}},
+                {'id': '4:2', 'labels': ['BiologicalProcess'], 'properties': {'goTerm': 'GO:1'}},
+            ]
+        if query.startswith('MATCH (a)-[r]->(b)'):
+            return []
+        return super().run(query, rows, **parameters)
+
+
+class MultiLabelDriver(Neo4jExportDriver):
+    def session(self, **kwargs):
+        return MultiLabelSession(self.writes)
+
+
+def test_nodes_with_several_keyed_labels_use_one_key_label():
+    driver = MultiLabelDriver()
+    graph = InMemoryGraph.load_from_neo4j(driver, labels=['Protein', 'GeneProduct', 'BiologicalProcess'])
+    graph.update_properties('GeneProduct', [{'geneProductId': 'GP1', 'symbol': 'APP'}])
+    graph.link('GeneProduct', 'BiologicalProcess', 'INVOLVED_IN', [('GP1', 'GO:1')])
+    graph.flush_to_neo4j(driver)
+
+    (node_query, node_rows), (link_query, link_rows) = driver.writes
+    assert 'MERGE (n:`Protein` {uniprotId: row.uniprotId})' in node_query and node_rows[0]['symbol'] == 'APP'
+    assert 'MATCH (a:`Protein` {uniprotId: row.start})' in link_query and link_rows[0]['start'] == 'P05067'
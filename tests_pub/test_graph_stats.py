@@ -0,0 +1,78 @@
+import os
+import re
+import sys
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.graph_stats import GraphStatistics, count_relationships
+
+LABELS = {'Drug': 3, 'BiologicalProcess': 2}
+REL_TYPES = {'AFFECTS': 4}
+
+
+class CountStoreSession:
+    def __init__(self, queries):
+        self.queries = queries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **parameters):
+        self.queries.append(query)
+        if query.startswith('CALL db.labels()'):
+            return [{'label': label} for label in LABELS]
+        if query.startswith('CALL db.relationshipTypes()'):
+            return [{'relationshipType': rel_type} for rel_type in REL_TYPES]
+        return self
+
+    def single(self):
+        query = self.queries[-1]
+        label = re.match(r'MATCH \(n:`(\w+)`\)', query)
+        rel_type = re.search(r'\[r:`(\w+)`\]', query)
+        if label:
+            return {'count': LABELS[label.group(1)]}
+        if rel_type:
+            return {'count': REL_TYPES[rel_type.group(1)]}
+        if query.startswith('MATCH (n)'):
+            return {'count': sum(LABELS.values())}
+        return {'count': sum(REL_TYPES.values())}
+
+
+class CountStoreDriver:
+    def __init__(self):
+        self.queries = []
+
+    def session(self):
+        return CountStoreSession(self.queries)
+
+
+def test_counts_are_cached_until_the_ttl_expires():
+    driver = CountStoreDriver()
+    now = [0.0]
+    stats = GraphStatistics(driver, ttl=10, clock=lambda: now[0])
+
+    assert stats.node_count() == 5 and stats.node_count('Drug') == 3 and stats.node_count('Protein') == 0
+    assert stats.relationship_count() == 4 and stats.relationship_count('AFFECTS') == 4
+    reads = len(driver.queries)
+    assert all('WHERE' not in query for query in driver.queries)
+
+    now[0] = 9.0
+    stats.snapshot()
+    assert len(driver.queries) == reads
+    now[0] = 10.0
+    stats.snapshot()
+    assert len(driver.queries) == 2 * reads
+
+
+def test_relationship_counts_stay_on_the_count_store():
+    session = CountStoreSession([])
+    assert count_relationships(session, 'AFFECTS', start_label='Drug') == 4
+    assert session.queries[-1] == 'MATCH (:`Drug`)-[r:`AFFECTS`]->() RETURN count(r) AS count'
+    with pytest.raises(ValueError):
+        count_relationships(session, 'AFFECTS', start_label='Drug', end_label='BiologicalProcess')
@@ -0,0 +1,56 @@
+import os
+import sys
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.neo4j_schema import schema_statements, diff_schema, UNIQUENESS_CONSTRAINTS, RANGE_INDEXES, FULLTEXT_INDEXES
+
+
+def live_schema_from_declaration():
+    constraints = [
+        {'name': f'{name}_custom', 'type': 'UNIQUENESS', 'labelsOrTypes': [label], 'properties': [prop]}
+        for name, label, prop in UNIQUENESS_CONSTRAINTS
+    ]
+    indexes = [
+        {'name': f'{name}_custom', 'type': 'RANGE', 'labelsOrTypes': [label], 'properties': [prop],
+         'state': 'ONLINE', 'owningConstraint': f'{name}_custom'}
+        for name, label, prop in UNIQUENESS_CONSTRAINTS
+    ]
+    indexes += [
+        {'name': name, 'type': 'RANGE', 'labelsOrTypes': [label], 'properties': [prop], 'state': 'ONLINE', 'owningConstraint': None}
+        for name, label, prop in RANGE_INDEXES
+    ]
+    indexes += [
+        {'name': name, 'type': 'FULLTEXT', 'labelsOrTypes': [label], 'properties': props, 'state': 'ONLINE', 'owningConstraint': None}
+        for name, label, props in FULLTEXT_INDEXES
+    ]
+    indexes.append({'name': 'index_343aff4e', 'type': 'LOOKUP', 'labelsOrTypes': None, 'properties': None,
+                    'state': 'ONLINE', 'owningConstraint': None})
+    return {'constraints': constraints, 'indexes': indexes}
+
+
+def test_schema_statements_are_idempotent():
+    statements = schema_statements()
+
+    assert len(statements) == len(UNIQUENESS_CONSTRAINTS) + len(RANGE_INDEXES) + len(FULLTEXT_INDEXES)
+    assert all('IF NOT EXISTS' in statement for statement in statements)
+    assert "CREATE CONSTRAINT drug_drugbank_id IF NOT EXISTS FOR (n:Drug) REQUIRE n.drugbankId IS UNIQUE" in statements
+
+
+def test_equivalent_schema_under_other_names_is_complete():
+    assert diff_schema(live_schema_from_declaration()) == {'missing': [], 'unexpected': [], 'not_online': []}
+
+
+def test_diff_reports_missing_unexpected_and_populating():
+    live = live_schema_from_declaration()
+    live['constraints'] = [c for c in live['constraints'] if c['name'] != 'drug_drugbank_id_custom']
+    live['indexes'][-3]['state'] = 'POPULATING'
+    live['indexes'].append({'name': 'drug_cas', 'type': 'RANGE', 'labelsOrTypes': ['Drug'], 'properties': ['casNumber'],
+                            'state': 'ONLINE', 'owningConstraint': None})
+
+    diff = diff_schema(live)
+    assert diff['missing'] == ['drug_drugbank_id']
+    assert diff['unexpected'] == ['drug_cas']
+    assert diff['not_online'] == [RANGE_INDEXES[-1][0]]
@@ -0,0 +1,97 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.query_instrumentation import InstrumentedDriver, QueryStats, fingerprint
+
+
+class StandInResult:
+    def __init__(self, query, rows):
+        self.query = query
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def single(self, strict=False):
+        return self.rows[0] if self.rows else None
+
+    def consume(self):
+        counters = SimpleNamespace(nodes_created=1 if 'CREATE' in self.query else 0)
+        profile = {'dbHits': 3, 'children': [{'dbHits': 4, 'children': []}]} if self.query.startswith('PROFILE') else None
+        return SimpleNamespace(result_available_after=2, result_consumed_after=5, counters=counters, profile=profile)
+
+
+class StandInSession:
+    def __init__(self, queries):
+        self.queries = queries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        self.queries.append(query)
+        return StandInResult(query, [{'n': 1}, {'n': 2}])
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+
+class StandInDriver:
+    def __init__(self):
+        self.queries = []
+
+    def session(self, **kwargs):
+        return StandInSession(self.queries)
+
+
+def test_fingerprint_ignores_literals_and_layout():
+    assert fingerprint("MATCH (d:Drug {drugbankId: 'DB00001'})\n   RETURN d LIMIT 10") == \
+        fingerprint('MATCH (d:Drug {drugbankId: "DB00002"}) RETURN d LIMIT 5') == \
+        'MATCH (d:Drug {drugbankId: ?}) RETURN d LIMIT ?'
+    assert fingerprint('MATCH (n) WHERE n.id = $id1 RETURN n') == 'MATCH (n) WHERE n.id = $id1 RETURN n'
+
+
+def test_statements_are_aggregated_by_fingerprint():
+    stats = QueryStats(slow_threshold_ms=0)
+    driver = InstrumentedDriver(StandInDriver(), stats, profile_sample_rate=1.0)
+
+    with driver.session() as session:
+        for drug in ('DB00001', 'DB00002'):
+            list(session.run(f"MATCH (d:Drug {{drugbankId: '{drug}'}}) RETURN d"))
+        session.execute_write(lambda tx: tx.run("CREATE (n:Test)").consume())
+        session.run("CREATE CONSTRAINT test IF NOT EXISTS FOR (n:Test) REQUIRE n.id IS UNIQUE")
+
+    match = stats.stats["MATCH (d:Drug {drugbankId: ?}) RETURN d"]
+    assert match['calls'] == 2 and match['rows'] == 4
+    assert match['available_after_ms'] == 4 and match['consumed_after_ms'] == 10
+    assert match['profiled'] == 2 and match['db_hits'] == 14
+    assert stats.stats["CREATE (n:Test)"]['nodes_created'] == 1
+    constraint = stats.stats["CREATE CONSTRAINT test IF NOT EXISTS FOR (n:Test) REQUIRE n.id IS UNIQUE"]
+    assert constraint['calls'] == 1 and constraint['profiled'] == 0
+    assert driver.driver.queries[-1].startswith('CREATE CONSTRAINT')
+    assert 'MATCH (d:Drug {drugbankId: ?}) RETURN d' in stats.summary_table()
+
+
+def test_open_result_is_recorded_when_the_next_statement_runs(monkeypatch):
+    clock = iter([0.0, 0.010, 0.020, 5.0])
+    monkeypatch.setattr('src_pub.utils.query_instrumentation.time.perf_counter', lambda: next(clock))
+    stats = QueryStats(slow_threshold_ms=0)
+    driver = InstrumentedDriver(StandInDriver(), stats, profile_sample_rate=0)
+
+    with driver.session() as session:
+        first = session.run("MATCH (d:Drug) RETURN d")
+        session.run("CREATE (n:Test)")
+        assert [record['n'] for record in first] == [1, 2]
+
+    match = stats.stats["MATCH (d:Drug) RETURN d"]
+    assert match['calls'] == 1 and match['total_ms'] == 10
+    create = stats.stats["CREATE (n:Test)"]
+    assert create['calls'] == 1 and create['nodes_created'] == 1
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.gene_ontology_data.quickgo_client import TokenBucket, parse_retry_after, search_go_term_ids
+
+STUB_TERMS = {'apoptotic process': 'GO:0006915', 'signal transduction': 'GO:0007165'}
+BROKEN_NAME = 'broken process'
+
+
+class QuickGoStubHandler(BaseHTTPRequestHandler):
+    """
+    Answers like the QuickGO search endpoint; the first request of every name is throttled,
+    the later requests of BROKEN_NAME fail.
+    """
+    def do_GET(self):
+        server = self.server
+        name = parse_qs(urlsplit(self.path).query)['query'][0]
+        with server.lock:
+            server.requests.append(name)
+            throttled = server.requests.count(name) == 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(0.01)
+        if throttled:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            body = b''
+        elif name == BROKEN_NAME:
+            self.send_response(400)
+            body = b''
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            results = [{'id': STUB_TERMS[name], 'name': name}] if name in STUB_TERMS else []
+            body = json.dumps({'numberOfHits': len(results), 'results': results}).encode()
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def quickgo_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), QuickGoStubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.in_flight = server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_retry_after_and_token_bucket():
+    assert parse_retry_after('3') == 3.0 and parse_retry_after('soon') is None and parse_retry_after(None) is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:10 GMT', now=1445412480) == 10.0
+
+    async def take(count):
+        bucket = TokenBucket(rate=100, capacity=2)
+        started = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # Two tokens of burst, the other four at 100 per second
+    assert asyncio.run(take(6)) >= 0.035
+
+
+def test_names_are_searched_within_limits_and_retried_after_throttling(quickgo_stub):
+    pytest.importorskip('httpx')
+    url = f"http://127.0.0.1:{quickgo_stub.server_port}/QuickGO/services/ontology/go/search"
+    names = ['apoptotic process', 'signal transduction', 'no such process', BROKEN_NAME, 'apoptotic process']
+
+    go_ids = search_go_term_ids(names, search_url=url, rate=200, burst=5, concurrency=2, timeout=5, backoff_base=0.01)
+
+    assert go_ids == {'apoptotic process': 'GO:0006915', 'signal transduction': 'GO:0007165', 'no such process': None}
+    assert sorted(quickgo_stub.requests) == sorted(2 * ['apoptotic process', 'signal transduction', 'no such process', BROKEN_NAME])
+    assert quickgo_stub.max_in_flight <= 2
@@ -0,0 +1,55 @@
+import os
+import sys
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.utils.DANGER_reset_db import drop_all_indexes_and_constraints
+
+
+class SchemaResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def data(self):
+        return self.rows
+
+
+class SchemaSession:
+    """
+    Answers SHOW INDEXES / SHOW CONSTRAINTS and applies DROP statements to its schema.
+    """
+    def __init__(self, indexes, constraints):
+        self.indexes = indexes
+        self.constraints = constraints
+
+    def run(self, query, **parameters):
+        if query == "SHOW INDEXES":
+            return SchemaResult(list(self.indexes))
+        if query == "SHOW CONSTRAINTS":
+            return SchemaResult(list(self.constraints))
+        if query.startswith("DROP CONSTRAINT "):
+            name = query.split()[-1]
+            self.constraints = [c for c in self.constraints if c['name'] != name]
+            self.indexes = [i for i in self.indexes if i.get('owningConstraint') != name]
+        elif query.startswith("DROP INDEX "):
+            name = query.split()[-1]
+            self.indexes = [i for i in self.indexes if i['name'] != name]
+        return SchemaResult([])
+
+
+def test_token_lookup_indexes_survive_the_reset():
+    session = SchemaSession(
+        indexes=[
+            {'name': 'index_343aff4e', 'type': 'LOOKUP', 'owningConstraint': None},
+            {'name': 'index_f7700477', 'type': 'LOOKUP', 'owningConstraint': None},
+            {'name': 'drug_drugbank_id', 'type': 'RANGE', 'owningConstraint': 'drug_drugbank_id'},
+            {'name': 'drug_name', 'type': 'RANGE', 'owningConstraint': None},
+        ],
+        constraints=[{'name': 'drug_drugbank_id', 'type': 'UNIQUENESS'}],
+    )
+    drop_all_indexes_and_constraints(session)
+
+    assert [index['name'] for index in session.indexes] == ['index_343aff4e', 'index_f7700477']
+    assert session.constraints == []
@@ -0,0 +1,37 @@
+import os
+import sys
+import pytest
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src_pub.explore_db.search_drugs import escape_lucene, search_drugs, DRUG_TEXT_FIELDS
+
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, query, **parameters):
+        self.calls.append((query, parameters))
+        return self
+
+    def data(self):
+        return []
+
+
+def test_escape_lucene_quotes_special_characters():
+    assert escape_lucene('5-HT(2A) receptor: agonist?') == r'5\-HT\(2A\) receptor\: agonist\?'
+
+
+def test_search_is_scoped_to_indexed_fields():
+    session = RecordingSession()
+    search_drugs(session, 'amyloid AND tau', fields=['indication', 'mechanismOfAction'], limit=5)
+    query, parameters = session.calls[0]
+
+    assert parameters['search'] == 'indication:(amyloid AND tau) OR mechanismOfAction:(amyloid AND tau)'
+    assert parameters['limit'] == 5 and 'LIMIT $limit' in query
+    assert 'reason_rating_0' in DRUG_TEXT_FIELDS
+    with pytest.raises(ValueError):
+        search_drugs(session, 'tau', fields=['casNumber'])
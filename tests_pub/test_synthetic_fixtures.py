@@ -0,0 +1,44 @@
+import os
+import sys
+import pandas as pd
+
+# Add the project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks_pub.synthetic_fixtures import write_drugbank_xml, write_arukucl_tsv, ARUKUCL_COLUMNS
+from src_pub.db_entry.add_drugbank2neo4j import DrugBank2Neo4j
+
+NAMESPACE = {'db': 'http://www.drugbank.ca'}
+
+
+def test_synthetic_drugbank_xml_parses_like_drugbank(tmp_path):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=20, go_per_polypeptide=3)
+    parser = DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False)
+    drugs = parser.parse_drugbank_xml()
+
+    top_level = [drug for drug in drugs if drug['Description']]
+    assert [drug['DrugBank ID'] for drug in top_level] == [f"DB{index:05d}" for index in range(1, 21)]
+    assert all(drug['GO Classifiers'] and drug['Class'] for drug in top_level)
+    assert parser.parse_drugbank_xml_parallel(max_workers=2) == drugs
+
+
+def test_synthetic_arukucl_tsv_has_the_arukucl_columns(tmp_path):
+    tsv_path = write_arukucl_tsv(str(tmp_path / 'annotations.tsv'), annotation_count=50, process_only=True)
+    data = pd.read_csv(tsv_path, sep='\t')
+
+    assert list(data.columns) == ARUKUCL_COLUMNS
+    assert len(data) == 50
+    assert set(data['GO ASPECT']) == {'P'}
+
+
+def test_protein_interactions_are_extracted_in_the_same_pass(tmp_path):
+    xml_path = write_drugbank_xml(str(tmp_path / 'drugbank.xml'), drug_count=10, proteins_per_drug=4)
+    parser = DrugBank2Neo4j(xml_path, NAMESPACE, configure_logging=False)
+    entities = list(parser.iter_drugbank_xml(with_proteins=True))
+
+    assert [drug for drug, _ in entities] == parser.parse_drugbank_xml()
+    interactions = [interaction for drug, found in entities if drug['Description'] for interaction in found]
+    assert {interaction['Kind'] for interaction in interactions} == {'target', 'enzyme', 'carrier', 'transporter'}
+    assert all(interaction['Protein']['UniProt ID'].startswith('Q') for interaction in interactions)
+    assert list(parser.iter_drugbank_xml_parallel(max_workers=2, with_proteins=True)) == entities